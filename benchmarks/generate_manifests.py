@@ -0,0 +1,339 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+"""Generate a synthetic manifest tree for the benchmarks
+- bare git repositories (one per asset, and one per manifest repository), looked up over "file://"
+- super, board, app, middleware and dependency manifests (conforming to the schema_*.xsd files),
+  served by the stub HTTP server (see: stub_server.py) at their "raw" URIs
+
+The manifests reference "https://github.com/<namespace>/..." URIs, as required by the schemas;
+run_benchmarks.py redirects them to the local stand-ins (see: url_rewrite.py).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+from lxml import etree
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import validate_category
+
+# namespace of the generated repositories (the category checks are strict for "Infineon/..." manifests)
+NAMESPACE = "Infineon"
+
+# URI prefix of the generated repositories and manifest files
+URI_PREFIX = "https://github.com/"
+
+# branch of the manifest repositories
+MANIFEST_BRANCH = "v2.X"
+
+# name of the super-manifest repository and file
+SUPER_MANIFEST_REPO = "mtb-super-manifest"
+SUPER_MANIFEST_FILE = "mtb-super-manifest-fv2.xml"
+
+# name of the file which describes the generated tree
+INFO_FILE = "bench.json"
+
+# fixed author/committer, so that the commit hashes do not depend on the time of the generation
+COMMIT_TIME = 1700000000
+
+
+def git(*args, cwd=None, stdin=None):
+    return subprocess.run(['git'] + list(args), cwd=cwd, input=stdin, capture_output=True,
+                          text=True, check=True).stdout
+
+
+def seed_stream(versions):
+    """:return a "git fast-import" stream: 2 commits per version on the "main" branch,
+    the second one tagged "release-v<N>.0.0" (the first one is not advertised by "git ls-remote")
+    """
+    lines = []
+    for mark in range(1, 2 * versions + 1):
+        message = "commit {}\n".format(mark)
+        lines += ["commit refs/heads/main",
+                  "mark :{}".format(mark),
+                  "committer Bench <bench@example.com> {} +0000".format(COMMIT_TIME + mark),
+                  "data {}".format(len(message)), message]
+        if mark > 1:
+            lines.append("from :{}".format(mark - 1))
+        lines.append("")
+    for version in range(1, versions + 1):
+        lines += ["reset refs/tags/release-v{}.0.0".format(version), "from :{}".format(2 * version), ""]
+    return "\n".join(lines) + "\n"
+
+
+def create_seed(path, versions):
+    """Create the seed repository, cloned by every asset repository
+    :return list of (hidden commit hash, tag) per version
+    """
+    git('init', '--quiet', '--bare', path)
+    git('fast-import', '--quiet', cwd=path, stdin=seed_stream(versions))
+    git('branch', '--quiet', MANIFEST_BRANCH, 'main', cwd=path)
+    hashes = git('rev-list', '--reverse', 'main', cwd=path).split()
+    return [(hashes[2 * i], "release-v{}.0.0".format(i + 1)) for i in range(versions)]
+
+
+def write_manifest(root, path):
+    """Write a manifest file, formatted as "xmllint --format" (see: validate_format.py)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(etree.tostring(root, pretty_print=True, encoding="UTF-8", xml_declaration=False))
+
+
+def sub(parent, tag, text=None, attributes=None):
+    element = etree.SubElement(parent, tag, attributes or {})
+    if text is not None:
+        element.text = text
+    return element
+
+
+def pick_category(manifest_type, index):
+    """:return a pre-defined category (without character references) of the manifest type"""
+    names = [x for x in validate_category.LEGAL_CATEGORY_NAMES[manifest_type] if x and "&" not in x]
+    return names[index % len(names)]
+
+
+class TreeGenerator(object):
+    """Generator of the repositories and manifest files"""
+
+    def __init__(self, work_dir, versions, hidden_every):
+        """
+        :param work_dir: output directory ("git/" repositories, "http/" files served by the stub server)
+        :param versions: number of <version> blocks per asset
+        :param hidden_every: every Nth version references a commit which is not advertised (0: none)
+        """
+        self.work_dir = os.path.abspath(work_dir)
+        self.git_dir = os.path.join(self.work_dir, "git")
+        self.http_dir = os.path.join(self.work_dir, "http")
+        self.versions = versions
+        self.hidden_every = hidden_every
+        self.seed = os.path.join(self.work_dir, "seed.git")
+        self.references = create_seed(self.seed, versions)
+        self.entries = 0
+        self.repos = 0
+
+    def create_repo(self, name):
+        """Create the bare repository of an asset (or of a manifest repository)
+        :return the URI of the repository
+        """
+        git('clone', '--quiet', '--bare', self.seed, os.path.join(self.git_dir, NAMESPACE, name + ".git"))
+        self.repos += 1
+        return URI_PREFIX + NAMESPACE + "/" + name
+
+    def commits(self):
+        """:return the <commit> references of the versions of an asset"""
+        commits = []
+        for index, (hidden, tag) in enumerate(self.references):
+            if self.hidden_every and (index + 1) % self.hidden_every == 0:
+                commits.append(hidden)
+            else:
+                commits.append(tag)
+        # the latest version tracks a branch
+        commits[-1] = "main"
+        return commits
+
+    def add_versions(self, element):
+        versions = sub(element, "versions")
+        for num, commit in enumerate(self.commits()):
+            version = sub(versions, "version", attributes={"flow_version": "2.0"})
+            sub(version, "num", "{}.0.0".format(num + 1))
+            sub(version, "commit", commit)
+            self.entries += 1
+
+    def manifest_uri(self, repo, file_name):
+        return "{}{}/{}/raw/{}/{}".format(URI_PREFIX, NAMESPACE, repo, MANIFEST_BRANCH, file_name)
+
+    def write_raw(self, uri, root):
+        write_manifest(root, os.path.join(self.http_dir, uri[len(URI_PREFIX):]))
+
+    def board_manifest(self, index, assets):
+        repo = "mtb-bsp-manifest-{:03d}".format(index)
+        self.create_repo(repo)
+        root = etree.Element("boards")
+        for n in range(assets):
+            asset_id = "BENCH-BSP-{:03d}-{:04d}".format(index, n)
+            board = sub(root, "board")
+            sub(board, "id", asset_id)
+            sub(board, "board_uri", self.create_repo(asset_id))
+            sub(board, "category", pick_category("board", n))
+            self.add_versions(board)
+            chips = sub(board, "chips")
+            sub(chips, "mcu", "BENCH{:04d}".format(n))
+            sub(board, "name", asset_id)
+        uri = self.manifest_uri(repo, repo + ".xml")
+        self.write_raw(uri, root)
+        return uri
+
+    def app_manifest(self, index, assets):
+        repo = "mtb-ce-manifest-{:03d}".format(index)
+        self.create_repo(repo)
+        root = etree.Element("apps", version="2.0")
+        for n in range(assets):
+            asset_id = "bench-ce-{:03d}-{:04d}".format(index, n)
+            app = sub(root, "app")
+            sub(app, "name", asset_id)
+            sub(app, "id", asset_id)
+            sub(app, "uri", self.create_repo(asset_id))
+            self.add_versions(app)
+            sub(app, "category", pick_category("app", n))
+        uri = self.manifest_uri(repo, repo + ".xml")
+        self.write_raw(uri, root)
+        return uri
+
+    def middleware_manifest(self, index, assets, dependees):
+        """:return (URI of the middleware manifest, URI of its dependency manifest)"""
+        repo = "mtb-mw-manifest-{:03d}".format(index)
+        self.create_repo(repo)
+        root = etree.Element("middleware", version="2.0")
+        ids = []
+        for n in range(assets):
+            asset_id = "bench-mw-{:03d}-{:04d}".format(index, n)
+            ids.append(asset_id)
+            middleware = sub(root, "middleware")
+            sub(middleware, "name", asset_id)
+            sub(middleware, "id", asset_id)
+            sub(middleware, "uri", self.create_repo(asset_id))
+            sub(middleware, "category", pick_category("middleware", n))
+            self.add_versions(middleware)
+        uri = self.manifest_uri(repo, repo + ".xml")
+        self.write_raw(uri, root)
+
+        # each middleware depends on the next ones, in all its versions
+        root = etree.Element("dependencies", version="2.0")
+        commits = self.commits()
+        for n, asset_id in enumerate(ids):
+            depender = sub(root, "depender")
+            sub(depender, "id", asset_id)
+            versions = sub(depender, "versions")
+            for commit in commits:
+                version = sub(versions, "version")
+                sub(version, "commit", commit)
+                self.entries += 1
+                dependees_element = sub(version, "dependees")
+                for d in range(1, min(dependees, len(ids) - 1) + 1):
+                    dependee = sub(dependees_element, "dependee")
+                    sub(dependee, "id", ids[(n + d) % len(ids)])
+                    sub(dependee, "commit", commits[(n + d) % len(commits)])
+                    self.entries += 1
+        dependency_uri = self.manifest_uri(repo, repo.replace("-manifest-", "-dependencies-") + ".xml")
+        self.write_raw(dependency_uri, root)
+        return uri, dependency_uri
+
+
+def generate(work_dir, boards=1, apps=1, middleware=1, assets=20, versions=5, dependees=3, hidden_every=4):
+    """Generate the synthetic manifest tree
+    :param work_dir: output directory (emptied)
+    :param boards: number of board manifests
+    :param apps: number of app manifests
+    :param middleware: number of middleware manifests (each one with a dependency manifest)
+    :param assets: number of assets per manifest
+    :param versions: number of <version> blocks per asset
+    :param dependees: number of <dependee> elements per depender version
+    :param hidden_every: every Nth version references a commit which is not advertised (0: none)
+    :return description of the tree (see: INFO_FILE)
+    """
+    if os.path.exists(work_dir):
+        shutil.rmtree(work_dir)
+    os.makedirs(work_dir)
+    generator = TreeGenerator(work_dir, versions, hidden_every)
+
+    generator.create_repo(SUPER_MANIFEST_REPO)
+    root = etree.Element("super-manifest", version="2.0")
+    if apps:
+        app_list = sub(root, "app-manifest-list")
+        for index in range(apps):
+            sub(sub(app_list, "app-manifest"), "uri", generator.app_manifest(index, assets))
+    if boards:
+        board_list = sub(root, "board-manifest-list")
+        for index in range(boards):
+            sub(sub(board_list, "board-manifest"), "uri", generator.board_manifest(index, assets))
+    if middleware:
+        middleware_list = sub(root, "middleware-manifest-list")
+        for index in range(middleware):
+            uri, dependency_uri = generator.middleware_manifest(index, assets, dependees)
+            sub(sub(middleware_list, "middleware-manifest", attributes={"dependency-url": dependency_uri}), "uri", uri)
+    super_uri = generator.manifest_uri(SUPER_MANIFEST_REPO, SUPER_MANIFEST_FILE)
+    generator.write_raw(super_uri, root)
+    shutil.rmtree(generator.seed)
+
+    info = {
+        "super_manifest": super_uri,
+        "manifests": 1 + apps + boards + 2 * middleware,
+        "repos": generator.repos,
+        "entries": generator.entries,
+        "parameters": {"boards": boards, "apps": apps, "middleware": middleware, "assets": assets,
+                       "versions": versions, "dependees": dependees, "hidden_every": hidden_every},
+    }
+    with open(os.path.join(work_dir, INFO_FILE), 'w') as f:
+        json.dump(info, f, indent=2)
+        f.write('\n')
+    return info
+
+
+def add_generator_arguments(argParser):
+    """Add the command-line options of the generator
+    :param argParser: argparse.ArgumentParser
+    """
+    argParser.add_argument("--boards", type=int, default=1, help="Number of board manifests (default: 1)")
+    argParser.add_argument("--apps", type=int, default=1, help="Number of app manifests (default: 1)")
+    argParser.add_argument("--middleware", type=int, default=1,
+                           help="Number of middleware manifests, each with a dependency manifest (default: 1)")
+    argParser.add_argument("--assets", type=int, default=20, help="Number of assets per manifest (default: 20)")
+    argParser.add_argument("--versions", type=int, default=5, help="Number of versions per asset (default: 5)")
+    argParser.add_argument("--dependees", type=int, default=3,
+                           help="Number of dependees per depender version (default: 3)")
+    argParser.add_argument("--hidden-every", type=int, default=4,
+                           help="Every Nth version references a commit which is not advertised by "
+                                "'git ls-remote' (default: 4, 0: none)")
+
+
+def generator_parameters(args):
+    """:return the generate() keyword arguments of the parsed command-line arguments"""
+    return {"boards": args.boards, "apps": args.apps, "middleware": args.middleware, "assets": args.assets,
+            "versions": args.versions, "dependees": args.dependees, "hidden_every": args.hidden_every}
+
+
+def main():
+    argParser = argparse.ArgumentParser(description="Generate a synthetic manifest tree for the benchmarks")
+    argParser.add_argument("work_dir", help="Output directory (emptied)")
+    add_generator_arguments(argParser)
+    args = argParser.parse_args()
+
+    info = generate(args.work_dir, **generator_parameters(args))
+    print("[INFO] generated {} manifest files, {} repositories, {} entries in {}".format(
+        info["manifests"], info["repos"], info["entries"], args.work_dir))
+
+
+if __name__ == '__main__':
+    main()
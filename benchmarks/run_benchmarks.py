@@ -0,0 +1,243 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+"""Offline benchmarks of the single-process driver (mtb_manifest_checker.py)
+1. generate a synthetic manifest tree (see: generate_manifests.py),
+2. serve its raw manifest files with a stub HTTP server (see: stub_server.py), and redirect the
+   "https://github.com/" git repositories to local bare repositories ("file://", see: url_rewrite.py),
+3. run the driver on the tree: "cold" (empty caches and mirrors), then "warm" (caches of the cold run),
+4. report the time of each stage, the throughput (entries per second), and the regressions
+   against a baseline (see: --baseline, --save-baseline).
+No network access is needed.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+import generate_manifests
+from stub_server import StubServer
+
+# the driver under test
+DRIVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mtb_manifest_checker.py")
+
+# stages of the run report (see: metrics.py), in the order of the checks
+STAGES = ["syntax", "format", "schema", "category", "assets"]
+
+# scenarios: "cold" runs with empty caches and mirrors, "warm" runs with the caches of the cold run
+SCENARIOS = ["cold", "warm"]
+
+# arguments of the checker, unless specified after '--': the local stand-ins are not rate-limited
+DEFAULT_DRIVER_ARGS = ["--rate", "0"]
+
+DEFAULT_WORK_DIR = "out/bench"
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_TIME = 0.05
+
+
+def write_rewrite_rules(path, base_url, tree_dir):
+    """Write the URL rewrite rules of the driver (see: url_rewrite.py): the raw manifest files
+    ("https://github.com/<namespace>/<repo>/raw/") are redirected to the stub HTTP server,
+    and the other "https://github.com/" URIs (the git repositories) to the local bare repositories
+    """
+    namespace = generate_manifests.NAMESPACE
+    with open(path, 'w') as f:
+        for repo in sorted(os.listdir(os.path.join(tree_dir, "http", namespace))):
+            f.write('[url "{}{}/{}/raw/"]\n'.format(base_url, namespace, repo))
+            f.write('\tinsteadOf = {}{}/{}/raw/\n'.format(generate_manifests.URI_PREFIX, namespace, repo))
+        f.write('[url "{}/"]\n'.format(os.path.join(tree_dir, "git")))
+        f.write('\tinsteadOf = {}\n'.format(generate_manifests.URI_PREFIX))
+
+
+def driver_environment(rewrite_file):
+    """:return the environment of the driver, with the URL rewrite rules of the benchmarks"""
+    env = dict(os.environ)
+    env.pop("URL_INSTEADOF", None)
+    env["URL_REWRITE_FILE"] = rewrite_file
+    env["GIT_TERMINAL_PROMPT"] = "0"
+    return env
+
+
+def run_driver(run_dir, super_uri, driver_args, env):
+    """Run the driver on the generated tree
+    :return the run report (see: metrics.py), with the "wall_time" of the whole run
+    """
+    os.makedirs(run_dir, exist_ok=True)
+    report_path = os.path.join(run_dir, "report.json")
+    log_path = os.path.join(run_dir, "log.txt")
+    cmdline = [sys.executable, DRIVER, "--report", report_path] + driver_args + [super_uri]
+    start = time.perf_counter()
+    with open(log_path, 'w') as log:
+        rc = subprocess.call(cmdline, cwd=run_dir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    wall_time = time.perf_counter() - start
+    if rc != 0:
+        print("FATAL ERROR: the checker failed (exit status {}), see: {}".format(rc, log_path))
+        sys.exit(1)
+    with open(report_path, 'r') as f:
+        report = json.load(f)
+    report["wall_time"] = wall_time
+    return report
+
+
+def summarize(reports, entries):
+    """:return the median times of the runs of a scenario"""
+    wall_time = statistics.median(r["wall_time"] for r in reports)
+    stages = {name: statistics.median(r["stages"].get(name, {}).get("wall", 0.0) for r in reports)
+              for name in STAGES}
+    operations = {name: stats["count"] for name, stats in reports[-1]["operations"].items()}
+    return {
+        "wall_time": wall_time,
+        "entries_per_second": entries / wall_time,
+        "stages": stages,
+        "operations": operations,
+    }
+
+
+def find_regressions(results, baseline, threshold, min_time):
+    """Compare the times of the scenarios with the baseline
+    :return list of messages, one per regression
+    """
+    regressions = []
+    for scenario, result in results["scenarios"].items():
+        reference = baseline.get("scenarios", {}).get(scenario)
+        if reference is None:
+            continue
+        times = [("wall_time", result["wall_time"], reference["wall_time"])]
+        times += [("stage " + name, result["stages"][name], reference["stages"].get(name, 0.0)) for name in STAGES]
+        for metric, value, reference_value in times:
+            if reference_value >= min_time and value > reference_value * (1 + threshold):
+                regressions.append("{} {}: {:.3f} s (baseline: {:.3f} s, {:+.0%})".format(
+                    scenario, metric, value, reference_value, value / reference_value - 1))
+    return regressions
+
+
+def print_results(results):
+    print("\n########## benchmarks ##########")
+    print("{} manifest files, {} repositories, {} entries".format(
+        results["tree"]["manifests"], results["tree"]["repos"], results["tree"]["entries"]))
+    print("scenario    wall (s)   entries/s  " + " ".join("{:>9}".format(name) for name in STAGES))
+    for scenario, result in results["scenarios"].items():
+        print("{:<8} {:>11.3f} {:>11.1f}  ".format(scenario, result["wall_time"], result["entries_per_second"])
+              + " ".join("{:>9.3f}".format(result["stages"][name]) for name in STAGES))
+    print("####################")
+
+
+def main():
+    argParser = argparse.ArgumentParser(
+        description="Offline benchmarks of mtb_manifest_checker.py on a synthetic manifest tree; "
+                    "the arguments after '--' are passed to the checker (e.g. -- --processes 4)")
+    argParser.add_argument("--work-dir", default=DEFAULT_WORK_DIR,
+                           help="Directory of the generated tree and of the runs (default: {})".format(DEFAULT_WORK_DIR))
+    argParser.add_argument("--reuse", action="store_true",
+                           help="Reuse the tree generated by a previous invocation (with the same parameters)")
+    argParser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                           help="Number of runs per scenario; the median is reported (default: {})".format(DEFAULT_REPEAT))
+    argParser.add_argument("--output", help="Path of the JSON results (default: <work dir>/results.json)")
+    argParser.add_argument("--baseline", help="JSON results of a previous invocation; the regressions are flagged")
+    argParser.add_argument("--save-baseline", metavar="PATH", help="Save the JSON results as a baseline")
+    argParser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                           help="Relative slowdown flagged as a regression (default: {})".format(DEFAULT_THRESHOLD))
+    argParser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                           help="Times shorter than this (in the baseline) are not compared (default: {} s)"
+                           .format(DEFAULT_MIN_TIME))
+    generate_manifests.add_generator_arguments(argParser)
+    argParser.add_argument("driver_args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = argParser.parse_args()
+    driver_args = args.driver_args[1:] if args.driver_args[:1] == ["--"] else args.driver_args
+    driver_args = driver_args or DEFAULT_DRIVER_ARGS
+
+    # generate the tree
+    work_dir = os.path.abspath(args.work_dir)
+    tree_dir = os.path.join(work_dir, "tree")
+    parameters = generate_manifests.generator_parameters(args)
+    info = None
+    info_path = os.path.join(tree_dir, generate_manifests.INFO_FILE)
+    if args.reuse and os.path.exists(info_path):
+        with open(info_path, 'r') as f:
+            info = json.load(f)
+        if info["parameters"] != parameters:
+            info = None
+    if info is None:
+        print("[INFO] generating the manifest tree in {}".format(tree_dir))
+        info = generate_manifests.generate(tree_dir, **parameters)
+
+    # run the scenarios
+    reports = {scenario: [] for scenario in SCENARIOS}
+    with StubServer(os.path.join(tree_dir, "http")) as server:
+        rewrite_file = os.path.join(work_dir, "url-rewrite.cfg")
+        write_rewrite_rules(rewrite_file, server.base_url, tree_dir)
+        env = driver_environment(rewrite_file)
+        for repeat in range(args.repeat):
+            run_dir = os.path.join(work_dir, "run")
+            if os.path.exists(run_dir):
+                shutil.rmtree(run_dir)
+            for scenario in SCENARIOS:
+                print("[INFO] run {}/{}: {}".format(repeat + 1, args.repeat, scenario))
+                reports[scenario].append(run_driver(run_dir, info["super_manifest"], driver_args, env))
+
+    results = {
+        "tree": info,
+        "driver_args": driver_args,
+        "scenarios": {scenario: summarize(reports[scenario], info["entries"]) for scenario in SCENARIOS},
+    }
+    print_results(results)
+
+    output = args.output or os.path.join(work_dir, "results.json")
+    for path in filter(None, [output, args.save_baseline]):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+    print("[INFO] results: {}".format(output))
+
+    # flag the regressions
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        if baseline.get("tree", {}).get("parameters") != info["parameters"] or baseline.get("driver_args") != driver_args:
+            print("[INFO] the baseline was measured with other parameters")
+        regressions = find_regressions(results, baseline, args.threshold, args.min_time)
+        for regression in regressions:
+            print("REGRESSION: {}".format(regression))
+        if regressions:
+            print("\nFATAL ERROR: {} regression(s) against the baseline {}".format(len(regressions), args.baseline))
+            sys.exit(1)
+        print("\nSUCCESS: no regression against the baseline {}".format(args.baseline))
+
+
+if __name__ == '__main__':
+    main()
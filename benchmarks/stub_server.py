@@ -0,0 +1,153 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+"""Stub HTTP server of the benchmarks: serves the "raw" manifest files of a generated tree
+(see: generate_manifests.py) from a local directory, with the HEAD, GET and conditional GET
+requests of the checker, and without logging each request.
+The server records the requests it answers (see: StubServer.requests), and can throttle the lookups
+of the checker: every Nth HEAD request is answered "429 Too Many Requests" with a "Retry-After" header
+(see: --throttle-every, --retry-after).
+"""
+
+import argparse
+import functools
+import http.server
+import threading
+import time
+
+# "Retry-After" delay (seconds) of the throttled requests
+DEFAULT_RETRY_AFTER = 1
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    """Request handler which serves the files of a directory, without logging the requests"""
+
+    def do_HEAD(self):
+        if self.server.throttle():
+            self.send_response(429)
+            self.send_header("Retry-After", str(self.server.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super().do_HEAD()
+
+    def log_request(self, code='-', size='-'):
+        self.server.record(self.command, self.path, int(code))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubHTTPServer(http.server.ThreadingHTTPServer):
+    """HTTP server which records the requests, and throttles every Nth HEAD request"""
+
+    daemon_threads = True
+
+    def __init__(self, address, handler, throttle_every=0, retry_after=DEFAULT_RETRY_AFTER):
+        super().__init__(address, handler)
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self._requests = []  # see: answered()
+        self._head_count = 0
+        self._lock = threading.Lock()
+
+    def throttle(self):
+        """:return True if the current HEAD request is throttled"""
+        if not self.throttle_every:
+            return False
+        with self._lock:
+            self._head_count += 1
+            return self._head_count % self.throttle_every == 0
+
+    def record(self, method, path, status_code):
+        with self._lock:
+            self._requests.append((time.monotonic(), method, path, status_code))
+
+    def answered(self):
+        """:return list of (time.monotonic(), method, path, status code) of the answered requests"""
+        with self._lock:
+            return list(self._requests)
+
+
+class StubServer(object):
+    """HTTP server of a directory, running in a background thread"""
+
+    def __init__(self, directory, host="127.0.0.1", port=0, throttle_every=0, retry_after=DEFAULT_RETRY_AFTER):
+        """
+        :param directory: directory of the served files
+        :param host: listening address
+        :param port: listening port, 0 for any free port
+        :param throttle_every: every Nth HEAD request is answered 429, 0 if none
+        :param retry_after: "Retry-After" delay (seconds) of the throttled requests
+        """
+        handler = functools.partial(QuietHandler, directory=directory)
+        self.server = StubHTTPServer((host, port), handler, throttle_every, retry_after)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return "http://{}:{}/".format(host, port)
+
+    @property
+    def requests(self):
+        """:return list of (time.monotonic(), method, path, status code) of the answered requests"""
+        return self.server.answered()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    argParser = argparse.ArgumentParser(description="Serve the raw manifest files of a generated tree")
+    argParser.add_argument("directory", help="Directory of the served files (the 'http' directory of a generated tree)")
+    argParser.add_argument("--port", type=int, default=8000, help="Listening port (default: 8000)")
+    argParser.add_argument("--throttle-every", type=int, default=0, metavar="N",
+                           help="Answer every Nth HEAD request with 429 Too Many Requests (default: 0, none)")
+    argParser.add_argument("--retry-after", type=int, default=DEFAULT_RETRY_AFTER, metavar="SECONDS",
+                           help="Retry-After delay of the throttled requests (default: {})".format(DEFAULT_RETRY_AFTER))
+    args = argParser.parse_args()
+
+    with StubServer(args.directory, port=args.port, throttle_every=args.throttle_every,
+                    retry_after=args.retry_after) as server:
+        print("[INFO] serving {} at {}".format(args.directory, server.base_url))
+        try:
+            server.thread.join()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+"""Offline check of the throttling of the lookups (see: request_scheduler.py)
+1. generate a synthetic manifest tree (see: generate_manifests.py),
+2. serve its raw manifest files with a stub HTTP server which answers every Nth HEAD request
+   "429 Too Many Requests" with a "Retry-After" header (see: stub_server.py, --throttle-every),
+3. run the driver on the tree with a request rate (--rate) and concurrent lookups (--jobs),
+4. check, from the requests received by the stub server, that:
+    - the HEAD requests stay within the token bucket of the RequestScheduler (rate: --rate, burst: --jobs),
+    - a throttled URL is not requested again before its "Retry-After" delay,
+    - the driver reports each throttled request,
+   and check the delays of throttle_delay() and retry_delay() (the latter is too long to be
+   exercised by the stub server).
+The exit status is 1 if a check fails. No network access is needed.
+"""
+
+import argparse
+import email.utils
+import os
+import re
+import shutil
+import sys
+import time
+
+import generate_manifests
+import run_benchmarks
+from requests.structures import CaseInsensitiveDict
+from stub_server import DEFAULT_RETRY_AFTER, StubServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from request_scheduler import MAX_RETRY_DELAY, retry_delay, throttle_delay
+
+DEFAULT_WORK_DIR = "out/throttle"
+DEFAULT_RATE = 10
+DEFAULT_JOBS = 4
+DEFAULT_THROTTLE_EVERY = 5
+
+# the arrival of a request at the stub server may be delayed, so that two requests sent at the pace
+# of the token bucket arrive closer to each other: one more token than the burst is tolerated
+BURST_TOLERANCE = 1
+
+
+def check_rate(times, rate, burst):
+    """Check that requests stay within a token bucket
+    :param times: arrival times of the requests (seconds, ascending)
+    :param rate: refill rate of the bucket (tokens per second)
+    :param burst: capacity of the bucket
+    :return list of error messages
+    """
+    errors = []
+    capacity = burst + BURST_TOLERANCE
+    tokens = float(capacity)
+    previous = times[0] if times else 0
+    for index, arrival in enumerate(times):
+        tokens = min(capacity, tokens + (arrival - previous) * rate)
+        previous = arrival
+        if tokens < 1 - 1e-6:
+            errors.append("request {} at {:.3f} s exceeds the rate of {} per second (burst: {})".format(
+                index + 1, arrival - times[0], rate, burst))
+        tokens -= 1
+    return errors
+
+
+def check_retry_after(requests, retry_after):
+    """Check that the throttled URLs are requested again after their "Retry-After" delay only
+    :param requests: (time, method, path, status code) of the HEAD requests, in order of arrival
+    :param retry_after: "Retry-After" delay (seconds)
+    :return list of error messages
+    """
+    errors = []
+    for index, (arrival, method, path, status_code) in enumerate(requests):
+        if status_code != 429:
+            continue
+        retry = next((x for x in requests[index + 1:] if x[2] == path), None)
+        if retry is None:
+            errors.append("{} was not requested again after 429".format(path))
+        elif retry[0] - arrival < retry_after:
+            errors.append("{} was requested again {:.3f} s after 429 (Retry-After: {} s)".format(
+                path, retry[0] - arrival, retry_after))
+    return errors
+
+
+def check_delays():
+    """Check the delays computed by throttle_delay() and retry_delay()
+    :return list of error messages
+    """
+    errors = []
+    retry_date = email.utils.formatdate(time.time() + 120, usegmt=True)
+    cases = [
+        ({"Retry-After": "30"}, 30, 30),
+        ({"retry-after": "0"}, 1, 1),
+        ({"Retry-After": retry_date}, 118, 120),
+        ({"Retry-After": str(10 * MAX_RETRY_DELAY)}, MAX_RETRY_DELAY, MAX_RETRY_DELAY),
+        ({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 60)}, 58, 60),
+        ({"RateLimit-Reset": "45"}, 45, 45),
+        ({}, None, None),
+    ]
+    for headers, low, high in cases:
+        delay = throttle_delay(CaseInsensitiveDict(headers))
+        if (delay is None) != (low is None) or (delay is not None and not low <= delay <= high):
+            errors.append("throttle_delay({}) is {} (expected: {}..{})".format(headers, delay, low, high))
+    for retry in range(1, 6):
+        delay = retry_delay(retry)
+        if not retry * 60 <= delay <= retry * 90:
+            errors.append("retry_delay({}) is {} (expected: {}..{})".format(retry, delay, retry * 60, retry * 90))
+    return errors
+
+
+def main():
+    argParser = argparse.ArgumentParser(
+        description="Check the throttling of the lookups of mtb_manifest_checker.py against a stub HTTP server "
+                    "which answers 429 Too Many Requests")
+    argParser.add_argument("--work-dir", default=DEFAULT_WORK_DIR,
+                           help="Directory of the generated tree and of the run (default: {})".format(DEFAULT_WORK_DIR))
+    argParser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                           help="Request rate of the checker (default: {} per second)".format(DEFAULT_RATE))
+    argParser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                           help="Concurrent lookups of the checker, i.e. the burst (default: {})".format(DEFAULT_JOBS))
+    argParser.add_argument("--throttle-every", type=int, default=DEFAULT_THROTTLE_EVERY, metavar="N",
+                           help="Answer every Nth HEAD request with 429 (default: {})".format(DEFAULT_THROTTLE_EVERY))
+    argParser.add_argument("--retry-after", type=int, default=DEFAULT_RETRY_AFTER, metavar="SECONDS",
+                           help="Retry-After delay of the throttled requests (default: {})".format(DEFAULT_RETRY_AFTER))
+    generate_manifests.add_generator_arguments(argParser)
+    # a lookup per manifest file: many small manifest files
+    argParser.set_defaults(boards=8, apps=8, middleware=8, assets=2, versions=2, dependees=1)
+    args = argParser.parse_args()
+
+    work_dir = os.path.abspath(args.work_dir)
+    tree_dir = os.path.join(work_dir, "tree")
+    run_dir = os.path.join(work_dir, "run")
+    print("[INFO] generating the manifest tree in {}".format(tree_dir))
+    info = generate_manifests.generate(tree_dir, **generate_manifests.generator_parameters(args))
+    if os.path.exists(run_dir):
+        shutil.rmtree(run_dir)
+
+    driver_args = ["--rate", str(args.rate), "--jobs", str(args.jobs)]
+    with StubServer(os.path.join(tree_dir, "http"), throttle_every=args.throttle_every,
+                    retry_after=args.retry_after) as server:
+        rewrite_file = os.path.join(work_dir, "url-rewrite.cfg")
+        run_benchmarks.write_rewrite_rules(rewrite_file, server.base_url, tree_dir)
+        env = run_benchmarks.driver_environment(rewrite_file)
+        print("[INFO] run: {}".format(" ".join(driver_args)))
+        report = run_benchmarks.run_driver(run_dir, info["super_manifest"], driver_args, env)
+        requests = [x for x in server.requests if x[1] == "HEAD"]
+
+    throttled = sum(1 for x in requests if x[3] == 429)
+    print("[INFO] {} HEAD requests in {:.3f} s, {} throttled".format(len(requests), report["wall_time"], throttled))
+
+    errors = []
+    if not throttled:
+        errors.append("no request was throttled: increase the size of the tree, or decrease --throttle-every")
+    errors += check_rate([x[0] for x in requests], args.rate, args.jobs)
+    errors += check_retry_after(requests, args.retry_after)
+    with open(os.path.join(run_dir, "log.txt"), 'r') as f:
+        summary = re.search(r"throttled (\d+) time\(s\)", f.read())
+    if summary is None or int(summary.group(1)) != throttled:
+        errors.append("the checker reports {} throttled request(s), the stub server {}".format(
+            summary.group(1) if summary else 0, throttled))
+    errors += check_delays()
+
+    for error in errors:
+        print("FATAL ERROR: {}".format(error))
+    if errors:
+        sys.exit(1)
+    print("\nSUCCESS: the requests stay within the rate limit, and the throttled requests are retried after their delay")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import time
+import traceback
+
+from url_rewrite import URL_INSTEADOF_VARIABLE, URL_REWRITE_FILE_VARIABLE
+
+# The validation daemon ("mtb_manifest_checker.py serve") keeps the compiled schemas, the lookup caches
+# (HTTP, "git ls-remote", "bare repo"), the HTTP connections and the persistent cache in memory, and runs
+# the validation jobs of its clients ("checker_daemon.py <arguments of mtb_manifest_checker.py>") over a
+# Unix socket. The client only uses the standard library, and runs the job in-process when no daemon is running.
+
+# Unix socket of the daemon (see: --socket)
+SOCKET_VARIABLE = "MTB_CHECKER_SOCKET"
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), "mtb-manifest-checker-{}.sock".format(os.getuid()))
+
+# The lookup caches of the daemon are cleared after this delay (seconds, see: --max-age);
+# the persistent cache keeps its own time-to-live
+DEFAULT_MAX_AGE = 60 * 60
+
+# Schemas compiled when the daemon starts
+MANIFEST_TYPES = ("super", "board", "app", "middleware", "dependency")
+
+# Environment variables of a job, forwarded by the client
+JOB_VARIABLES = (URL_INSTEADOF_VARIABLE, URL_REWRITE_FILE_VARIABLE)
+
+# Protocol: one JSON request per connection, answered by one JSON response (each one on a single line)
+# - {"command": "check", "argv": [...], "cwd": path, "env": {...}}
+#   => {"status": exit status, "output": log output, "failures": [...], "elapsed": seconds, "daemon": pid}
+# - {"command": "status"} => {"pid", "uptime", "jobs", "cache_age", "caches": {name: size accounting}}
+# - {"command": "stop"} => {"stopped": true}
+
+
+def default_socket():
+    """:return the path of the Unix socket of the daemon"""
+    return os.environ.get(SOCKET_VARIABLE) or DEFAULT_SOCKET
+
+
+def run_job(argv, cwd=None, env=None):
+    """Run mtb_manifest_checker.py in this process, capturing its output
+    :param argv: command-line arguments of mtb_manifest_checker.py
+    :param cwd: working directory of the job (default: the current one)
+    :param env: environment variables of the job (see: JOB_VARIABLES), None to keep the current ones
+    :return result of the job (see: the "check" command)
+    """
+    import mtb_manifest_checker
+    import validate_assets
+    from metrics import METRICS
+
+    start = time.perf_counter()
+    if cwd:
+        os.chdir(cwd)
+    if env is not None:
+        for name in JOB_VARIABLES:
+            if env.get(name) is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = env[name]
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            validate_assets.reset_run()
+            METRICS.reset()
+            mtb_manifest_checker.main(argv)
+            status = 0
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            if isinstance(e.code, str):
+                print(e.code)
+        except Exception:
+            traceback.print_exc()
+            status = 1
+    return {"status": status, "output": output.getvalue(), "failures": validate_assets.FAILURES,
+            "elapsed": round(time.perf_counter() - start, 3), "daemon": os.getpid()}
+
+
+class Daemon(socketserver.UnixStreamServer):
+    # Unix socket server of the validation jobs; the jobs run one at a time,
+    # since the state of a run (e.g. ASSET_CACHE, working directory) is global
+
+    def __init__(self, socket_path, max_age=DEFAULT_MAX_AGE):
+        self.socket_path = socket_path
+        self.max_age = max_age
+        self.started = time.monotonic()
+        self.cache_started = self.started
+        self.jobs = 0
+        self.stopped = False
+        # only the owner of the daemon can connect to it
+        umask = os.umask(0o077)
+        try:
+            super().__init__(socket_path, DaemonHandler)
+        finally:
+            os.umask(umask)
+
+    def check(self, message):
+        import validate_assets
+
+        if "--refresh" in message.get("argv", []) or time.monotonic() - self.cache_started > self.max_age:
+            validate_assets.clear_lookup_caches()
+            self.cache_started = time.monotonic()
+        self.jobs += 1
+        return run_job(message.get("argv", []), message.get("cwd"), message.get("env"))
+
+    def status(self):
+        import validate_assets
+        import validate_schema
+
+        return {"pid": os.getpid(), "uptime": round(time.monotonic() - self.started, 3), "jobs": self.jobs,
+                "cache_age": round(time.monotonic() - self.cache_started, 3),
+                "caches": {"HTTP_CACHE": validate_assets.HTTP_CACHE.stats(),
+                           "LS_REMOTE_CACHE": validate_assets.LS_REMOTE_CACHE.stats(),
+                           "BARE_REPO_CACHE": validate_assets.BARE_REPO_CACHE.stats(),
+                           "NEGATIVE_CACHE": validate_assets.NEGATIVE_CACHE.stats(),
+                           "SCHEMA_POOL": {"entries": len(validate_schema.SCHEMA_POOL)}}}
+
+    def serve(self):
+        while not self.stopped:
+            self.handle_request()
+        self.server_close()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    # handler of a connection to the daemon (see: Daemon)
+
+    def handle(self):
+        try:
+            message = json.loads(self.rfile.readline())
+            command = message.get("command")
+            if command == "check":
+                response = self.server.check(message)
+            elif command == "status":
+                response = self.server.status()
+            elif command == "stop":
+                self.server.stopped = True
+                response = {"stopped": True}
+            else:
+                response = {"error": "unknown command: {}".format(command)}
+        except ValueError as e:
+            response = {"error": "invalid request: {}".format(e)}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+def send(socket_path, message):
+    """Send a request to the daemon
+    :param socket_path: Unix socket of the daemon
+    :param message: request (see: the protocol above)
+    :return the response, or None if no daemon is running
+    """
+    try:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        connection.close()
+        return None
+    with connection, connection.makefile("rwb") as stream:
+        stream.write(json.dumps(message).encode() + b"\n")
+        stream.flush()
+        line = stream.readline()
+    return json.loads(line) if line else None
+
+
+def serve(socket_path, max_age=DEFAULT_MAX_AGE):
+    """Run the validation daemon, until it receives the "stop" command
+    :param socket_path: Unix socket of the daemon
+    :param max_age: lifetime (seconds) of the lookup caches
+    :return True on success, False if the socket is in use
+    """
+    import validate_schema
+
+    if os.path.exists(socket_path):
+        if send(socket_path, {"command": "status"}) is not None:
+            print("FATAL ERROR: a validation daemon is already running at {}".format(socket_path))
+            return False
+        # stale socket of a daemon which did not stop cleanly
+        os.remove(socket_path)
+    # compile the schemas ahead of the first job
+    for manifest_type in MANIFEST_TYPES:
+        validate_schema.SCHEMA_POOL.get(manifest_type)
+    daemon = Daemon(socket_path, max_age)
+    print("[INFO] validation daemon {} listening at {}".format(os.getpid(), socket_path))
+    sys.stdout.flush()
+    try:
+        daemon.serve()
+    except KeyboardInterrupt:
+        daemon.server_close()
+    print("[INFO] validation daemon stopped after {} job(s)".format(daemon.jobs))
+    return True
+
+
+def serve_main(argv):
+    """Command line of "mtb_manifest_checker.py serve"
+    :param argv: command-line arguments (after "serve")
+    """
+    argParser = argparse.ArgumentParser(prog="mtb_manifest_checker.py serve",
+                                        description="Run the validation daemon of mtb_manifest_checker.py")
+    argParser.add_argument("--socket", default=default_socket(),
+                           help="Unix socket of the daemon (default: the {} variable, or {})"
+                           .format(SOCKET_VARIABLE, DEFAULT_SOCKET))
+    argParser.add_argument("--max-age", type=int, default=DEFAULT_MAX_AGE, metavar="SECONDS",
+                           help="Lifetime of the in-memory lookup caches (default: {} seconds)".format(DEFAULT_MAX_AGE))
+    args = argParser.parse_args(argv)
+    if not serve(args.socket, args.max_age):
+        sys.exit(1)
+
+
+def main():
+    argParser = argparse.ArgumentParser(
+        description="Validate manifest files with the validation daemon (see: mtb_manifest_checker.py serve), "
+                    "or in this process if no daemon is running; the other arguments are those of "
+                    "mtb_manifest_checker.py")
+    argParser.add_argument("--socket", default=default_socket(),
+                           help="Unix socket of the daemon (default: the {} variable, or {})"
+                           .format(SOCKET_VARIABLE, DEFAULT_SOCKET))
+    argParser.add_argument("--json", action="store_true",
+                           help="Print the result of the job as JSON (exit status, output, failures, elapsed time)")
+    argParser.add_argument("--status", action="store_true", help="Print the status of the daemon")
+    argParser.add_argument("--stop", action="store_true", help="Stop the daemon")
+    args, argv = argParser.parse_known_args()
+
+    if args.status or args.stop:
+        response = send(args.socket, {"command": "stop" if args.stop else "status"})
+        if response is None:
+            print("FATAL ERROR: no validation daemon at {}".format(args.socket))
+            sys.exit(1)
+        print(json.dumps(response, indent=2))
+        return
+
+    env = {name: os.environ.get(name) for name in JOB_VARIABLES}
+    result = send(args.socket, {"command": "check", "argv": argv, "cwd": os.getcwd(), "env": env})
+    if result is None:
+        print("[INFO] no validation daemon at {}: validating in this process".format(args.socket), file=sys.stderr)
+        if not args.json:
+            import mtb_manifest_checker
+            mtb_manifest_checker.main(argv)
+            return
+        result = run_job(argv)
+    elif "error" in result:
+        print("FATAL ERROR: {}".format(result["error"]))
+        sys.exit(1)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        sys.stdout.write(result["output"])
+    sys.exit(result["status"])
+
+
+if __name__ == '__main__':
+    main()
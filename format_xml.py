@@ -30,52 +30,72 @@
 
 # keep blank lines in the generated XML file
 
+import os
+import shutil
 import sys
+import tempfile
 
-if len(sys.argv) < 3:
-    print('FATAL ERROR: must have at least 2 arg!', file=sys.stderr)
-    exit(1)
 
-file1 = sys.argv[1]
-file2 = sys.argv[2]
+# number of blank lines which may be appended once the original file is exhausted
+MAX_TRAILING_LINES = 1000
 
-output = []
 
-with open(file1, 'r') as file:
-    lines1 = file.readlines()
+def merge_lines(lines1, lines2):
+    """Re-insert the blank lines of the original file into the formatted file
+    :param lines1: lines of the original XML file
+    :param lines2: lines of the formatted XML file
+    :return (generator) lines of the merged file
+    """
+    lines1 = iter(lines1)
+    lines2 = iter(lines2)
+    line1 = next(lines1, "")
+    line2 = next(lines2, "")
+    trailing_lines = 0
+    while trailing_lines < MAX_TRAILING_LINES:
+        if not line1 and not line2:
+            # done
+            break
+        if not line1:
+            trailing_lines += 1
+        if not line1.rstrip() and not line2.rstrip():
+            # both have blank lines
+            yield "\n"
+            line1 = next(lines1, "")
+            line2 = next(lines2, "")
+        elif not line1.rstrip():
+            # detected blank line
+            yield "\n"
+            line1 = next(lines1, "")
+        else:
+            # use formatted line
+            yield line2
+            line1 = next(lines1, "")
+            line2 = next(lines2, "")
 
-with open(file2, 'r') as file:
-    lines2 = file.readlines()
 
-idx1 = 0
-idx2 = 0
-max_lines = len(lines1) + 1000
-for i in range(max_lines):
-    line1 = ""
-    if idx1 < len(lines1):
-        line1 = lines1[idx1]
-    line2 = ""
-    if idx2 < len(lines2):
-        line2 = lines2[idx2]
-    if not line1 and not line2:
-        # done
-        break
-    if not line1.rstrip() and not line2.rstrip():
-        # both have blank lines
-        output.append("\n")
-        idx1 += 1
-        idx2 += 1
-    elif not line1.rstrip():
-        # detected blank line
-        output.append("\n")
-        idx1 += 1
-    else:
-        # use formatted line
-        output.append(line2)
-        idx1 += 1
-        idx2 += 1
+def format_xml(file1, file2):
+    """Re-insert the blank lines of the original file into the formatted file
+    Both files are read lazily, and the merged lines are written to a temporary file
+    which then replaces the formatted file: the memory usage does not depend on the file size.
+    :param file1: path to the original XML file
+    :param file2: path to the formatted XML file (updated in place)
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(file2) + ".", dir=os.path.dirname(file2) or ".")
+    try:
+        with open(file1, 'r') as lines1, open(file2, 'r') as lines2, \
+                os.fdopen(fd, 'w', newline='') as file:
+            # override os.linesep; do not generate '\r'
+            file.writelines(merge_lines(lines1, lines2))
+        shutil.copymode(file2, tmp_path)
+        os.replace(tmp_path, file2)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
-with open(file2, 'w', newline='') as file:
-    # override os.linesep; do not generate '\r'
-    for x in output:
-        file.write(x)
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print('FATAL ERROR: must have at least 2 arg!', file=sys.stderr)
+        exit(1)
+
+    format_xml(sys.argv[1], sys.argv[2])
@@ -0,0 +1,125 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+import re
+
+from lxml import etree
+
+# first line of a manifest file => manifest type
+MANIFEST_TYPE_BY_FIRST_LINE = {
+    '<apps>': "app",
+    '<apps version="2.0">': "app",
+    '<boards>': "board",
+    '<dependencies>': "dependency",
+    '<dependencies version="2.0">': "dependency",
+    '<middleware>': "middleware",
+    '<middleware version="2.0">': "middleware",
+    '<super-manifest>': "super",
+    '<super-manifest version="2.0">': "super",
+}
+RE_SUPER_MANIFEST_SDK_LIST = re.compile(r'^<super-manifest version="2\.0" sdk_list_url=".*">$')
+
+# Compile regular expressions for the XML declaration, and its (optional) encoding
+RE_XML_DECLARATION = re.compile(r'^\s*<\?xml\s.*?\?>', re.DOTALL)
+RE_XML_ENCODING = re.compile(r'\sencoding\s*=\s*["\']([^"\']*)["\']')
+
+
+def manifest_type_of(first_line):
+    """Detect the type of a manifest file from its first line
+    :param first_line: first line of the manifest file
+    :return the manifest type (app, board, dependency, middleware, super), or "" if unknown
+    """
+    line = first_line.rstrip('\n').replace('\r', '')
+    if RE_SUPER_MANIFEST_SDK_LIST.match(line):
+        return "super"
+    return MANIFEST_TYPE_BY_FIRST_LINE.get(line, "")
+
+
+def detect_manifest_type(xml_path):
+    """Detect the type of a manifest file from its first line
+    :param xml_path: path to the manifest file
+    :return the manifest type (app, board, dependency, middleware, super), or "" if unknown
+    """
+    with open(xml_path, 'r', newline='') as xml_manifest:
+        return manifest_type_of(xml_manifest.readline())
+
+
+class ManifestFile(object):
+    # class which reads and parses a manifest file once, and shares the result
+    # with all the checks (encoding, schema, category, assets, format)
+
+    # remove_blank_text is needed to correctly indent sections (as "xmllint --format")
+    # strip_cdata is needed to preserve CDATA sections in the BSP manifest
+    parser_options = dict(remove_blank_text=True, strip_cdata=False)
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as xml_manifest:
+            self.data = xml_manifest.read()
+        self._tree = None
+        self._syntax_error = None
+
+    def __str__(self):
+        return self.path
+
+    @property
+    def text(self):
+        return self.data.decode('utf-8', 'replace')
+
+    @property
+    def manifest_type(self):
+        return manifest_type_of(self.data.split(b'\n', 1)[0].decode('utf-8', 'replace'))
+
+    @property
+    def xml_encoding(self):
+        # encoding of the XML declaration: "" if there is no declaration,
+        # None if the declaration has no encoding
+        declaration = RE_XML_DECLARATION.match(self.text)
+        if not declaration:
+            return ""
+        encoding = RE_XML_ENCODING.search(declaration.group(0))
+        return encoding.group(1) if encoding else None
+
+    @property
+    def tree(self):
+        # the parsed ElementTree; raises etree.XMLSyntaxError if the file is not well-formed
+        if self._tree is None and self._syntax_error is None:
+            try:
+                root = etree.fromstring(self.data, parser=etree.XMLParser(**self.parser_options))
+                self._tree = root.getroottree()
+            except etree.XMLSyntaxError as ex:
+                self._syntax_error = ex
+        if self._syntax_error is not None:
+            raise self._syntax_error
+        return self._tree
+
+    @property
+    def root(self):
+        return self.tree.getroot()
@@ -0,0 +1,126 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+# Estimated overhead (bytes) of an entry of the OrderedDict (hash table slot and linked-list node)
+ENTRY_OVERHEAD = 100
+
+
+def entry_size(key, value):
+    """Estimate the memory footprint of a cache entry
+    :param key: key of the entry
+    :param value: value of the entry; its sizeof() method is used, if any
+    :return size in bytes
+    """
+    sizeof = getattr(value, 'sizeof', None)
+    return ENTRY_OVERHEAD + sys.getsizeof(key) + (sizeof() if sizeof is not None else sys.getsizeof(value))
+
+
+class LruCache(object):
+    """In-memory key/value cache bounded by an (estimated) memory budget
+    The least-recently-used entries are evicted when the cache exceeds its budget;
+    a value larger than the whole budget is not cached. The cache is thread-safe.
+    """
+
+    def __init__(self, max_size=None):
+        """Create an empty cache
+        :param max_size: memory budget (bytes), None if unlimited
+        """
+        self.max_size = max_size
+        self.size = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key => (value, size)
+
+    def get(self, key, default=None):
+        """Look up an entry, and mark it as the most recently used
+        :return the value, or default if the key is not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = self._entries[key][0]
+            self._entries.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value):
+        size = entry_size(key, value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            if self.max_size is not None and size > self.max_size:
+                self.evictions += 1
+                return
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.max_size is not None and self.size > self.max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def resize(self, max_size):
+        """Change the memory budget, evicting the least-recently-used entries if needed
+        :param max_size: memory budget (bytes), None if unlimited
+        """
+        with self._lock:
+            self.max_size = max_size
+            while max_size is not None and self.size > max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def stats(self):
+        """:return the size accounting of the cache: entries, size and budget (bytes), evictions"""
+        with self._lock:
+            return {"entries": len(self._entries), "size": self.size, "max_size": self.max_size,
+                    "evictions": self.evictions}
@@ -0,0 +1,219 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# upper bounds (seconds) of the buckets of the latency histograms; the last bucket is unbounded
+LATENCY_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300]
+
+
+class Metrics(object):
+    """Instrumentation of a validation run: time per stage and manifest, count and latency
+    of the network operations, hit/miss counts and memory footprint of the caches
+    The counters are thread-safe; the counters of a worker process are merged with merge().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bounded_caches = {}  # cache => in-memory cache of this process, with a stats() method (see: LruCache)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.manifests = {}   # manifest => {stage: [wall time, CPU time]}
+            self.operations = {}  # operation => [count, total, min, max, histogram]
+            self.caches = {}      # cache => [hits, misses]
+            self.memory = {}      # process id => {cache: size accounting} of the other processes
+
+    def register_cache(self, name, cache):
+        """Report the size accounting of an in-memory cache of this process
+        :param name: name of the cache (e.g. "HTTP_CACHE")
+        :param cache: cache with a stats() method (see: LruCache)
+        """
+        self.bounded_caches[name] = cache
+
+    def _memory(self):
+        # size accounting of the caches of all the processes, by process id
+        memory = dict(self.memory)
+        memory[str(os.getpid())] = {name: cache.stats() for name, cache in self.bounded_caches.items()}
+        return memory
+
+    @contextmanager
+    def stage(self, manifest, name):
+        """Measure the wall and CPU time of a stage of a manifest"""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            self.add_stage(manifest, name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def add_stage(self, manifest, name, wall, cpu):
+        with self._lock:
+            times = self.manifests.setdefault(manifest, {}).setdefault(name, [0.0, 0.0])
+            times[0] += wall
+            times[1] += cpu
+
+    @contextmanager
+    def operation(self, name):
+        """Measure the latency of a (network) operation"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_operation(name, time.perf_counter() - start)
+
+    def add_operation(self, name, latency):
+        with self._lock:
+            stats = self.operations.get(name)
+            if stats is None:
+                stats = self.operations[name] = [0, 0.0, latency, latency, [0] * (len(LATENCY_BUCKETS) + 1)]
+            stats[0] += 1
+            stats[1] += latency
+            stats[2] = min(stats[2], latency)
+            stats[3] = max(stats[3], latency)
+            stats[4][next((i for i, b in enumerate(LATENCY_BUCKETS) if latency <= b), len(LATENCY_BUCKETS))] += 1
+
+    def cache(self, name, hit):
+        """Count a lookup of a cache
+        :param name: name of the cache (e.g. "HTTP_CACHE")
+        :param hit: True if the lookup found an entry
+        """
+        with self._lock:
+            self.caches.setdefault(name, [0, 0])[0 if hit else 1] += 1
+
+    def snapshot(self):
+        """:return the counters (JSON serializable), see: merge()"""
+        with self._lock:
+            return json.loads(json.dumps({
+                "manifests": self.manifests, "operations": self.operations, "caches": self.caches,
+                "memory": self._memory()}))
+
+    def merge(self, snapshot):
+        """Add the counters of another process
+        :param snapshot: result of snapshot()
+        """
+        for manifest, stages in snapshot["manifests"].items():
+            for name, (wall, cpu) in stages.items():
+                self.add_stage(manifest, name, wall, cpu)
+        with self._lock:
+            for name, (count, total, low, high, histogram) in snapshot["operations"].items():
+                stats = self.operations.get(name)
+                if stats is None:
+                    self.operations[name] = [count, total, low, high, list(histogram)]
+                else:
+                    stats[0] += count
+                    stats[1] += total
+                    stats[2] = min(stats[2], low)
+                    stats[3] = max(stats[3], high)
+                    stats[4] = [a + b for a, b in zip(stats[4], histogram)]
+            for name, (hits, misses) in snapshot["caches"].items():
+                counts = self.caches.setdefault(name, [0, 0])
+                counts[0] += hits
+                counts[1] += misses
+            # a worker process reports the current state of its caches: the latest snapshot wins
+            for pid, caches in snapshot["memory"].items():
+                if pid != str(os.getpid()):
+                    self.memory[pid] = caches
+
+    def report(self):
+        """:return the run report (JSON serializable)"""
+        with self._lock:
+            stages = {}
+            for times in self.manifests.values():
+                for name, (wall, cpu) in times.items():
+                    total = stages.setdefault(name, {"wall": 0.0, "cpu": 0.0})
+                    total["wall"] += wall
+                    total["cpu"] += cpu
+            report = {
+                "manifests": {m: {name: {"wall": wall, "cpu": cpu} for name, (wall, cpu) in times.items()}
+                              for m, times in self.manifests.items()},
+                "stages": stages,
+                "operations": {name: {
+                    "count": count, "total": total, "mean": total / count, "min": low, "max": high,
+                    "histogram": {("<={}".format(b) if i < len(LATENCY_BUCKETS) else ">{}".format(LATENCY_BUCKETS[-1])): n
+                                  for i, (b, n) in enumerate(zip(LATENCY_BUCKETS + [None], histogram))},
+                } for name, (count, total, low, high, histogram) in self.operations.items()},
+                "caches": {name: {"hits": hits, "misses": misses,
+                                  "hit_rate": hits / (hits + misses) if hits + misses else None}
+                           for name, (hits, misses) in self.caches.items()},
+                "memory": {},
+            }
+            for caches in self._memory().values():
+                for name, stats in caches.items():
+                    total = report["memory"].setdefault(name, {"entries": 0, "size": 0, "max_size": 0, "evictions": 0})
+                    for key in ("entries", "size", "evictions"):
+                        total[key] += stats[key]
+                    if stats["max_size"] is None or total["max_size"] is None:
+                        total["max_size"] = None
+                    else:
+                        total["max_size"] += stats["max_size"]
+        # the throttled requests wait for their retry time (see: RequestScheduler.wait())
+        report["retry_sleep_time"] = report["operations"].get("retry-sleep", {}).get("total", 0.0)
+        return report
+
+    def write_report(self, path):
+        """Write the run report to a JSON file"""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', newline='') as f:
+            json.dump(self.report(), f, indent=2)
+            f.write('\n')
+
+    def print_profile(self):
+        """Print a summary of the run report"""
+        report = self.report()
+        print("\n########## profile ##########")
+        print("stage           wall (s)    CPU (s)")
+        for name, times in report["stages"].items():
+            print("{:<12} {:>11.3f} {:>10.3f}".format(name, times["wall"], times["cpu"]))
+        print("operation       count   total (s)   mean (s)    max (s)")
+        for name, stats in sorted(report["operations"].items()):
+            print("{:<12} {:>8} {:>11.3f} {:>10.3f} {:>10.3f}".format(
+                name, stats["count"], stats["total"], stats["mean"], stats["max"]))
+        print("cache                hits    misses   hit rate")
+        for name, stats in sorted(report["caches"].items()):
+            hit_rate = "-" if stats["hit_rate"] is None else "{:.1%}".format(stats["hit_rate"])
+            print("{:<18} {:>6} {:>9} {:>10}".format(name, stats["hits"], stats["misses"], hit_rate))
+        print("cache memory      entries  size (KiB)  budget (KiB)  evictions")
+        for name, stats in sorted(report["memory"].items()):
+            budget = "-" if stats["max_size"] is None else "{:.0f}".format(stats["max_size"] / 1024)
+            print("{:<16} {:>8} {:>11.0f} {:>13} {:>10}".format(
+                name, stats["entries"], stats["size"] / 1024, budget, stats["evictions"]))
+        print("time spent in retry sleeps: {:.3f} s".format(report["retry_sleep_time"]))
+        print("####################")
+
+
+# the instrumentation of this process
+METRICS = Metrics()
@@ -0,0 +1,291 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+import hashlib
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from metrics import METRICS
+
+try:
+    import fcntl
+except ImportError:
+    # not available on Windows: the mirrors are not shared between concurrent processes
+    fcntl = None
+
+# Name of the file (in a mirror) which records its last use, for the LRU eviction
+LAST_USED_FILE_NAME = "last-used"
+
+
+def remove_tree(path):
+    """Delete a directory tree, including read-only files (e.g. git objects)
+    :param path: directory to delete
+    """
+    if os.path.isdir(path):
+        # ensure "o+w" so that this can be deleted
+        for root, dirs, files in os.walk(path):
+            for d in dirs:
+                mode=os.stat(os.path.join(root, d)).st_mode
+                os.chmod(os.path.join(root, d), (mode | stat.S_IWUSR))
+            for f in files:
+                mode=os.stat(os.path.join(root, f)).st_mode
+                os.chmod(os.path.join(root, f), (mode | stat.S_IWUSR))
+        shutil.rmtree(path)
+
+
+def tree_size(path):
+    """:return the size (bytes) of the files in a directory tree"""
+    size = 0
+    for root, dirs, files in os.walk(path):
+        for f in files:
+            try:
+                size += os.lstat(os.path.join(root, f)).st_size
+            except OSError:
+                pass
+    return size
+
+
+class MirrorStore(object):
+    """Long-lived store of bare mirrors of git repositories, keyed by repository URL
+    A mirror is cloned once and then updated incrementally ("git fetch", at most once per run);
+    the objects are looked up in batches ("git cat-file --batch-check"), and the
+    least-recently-used mirrors are evicted when the store exceeds its size cap.
+    """
+
+    def __init__(self, store_dir, max_size=None, blobless=False, log=print):
+        """Open (or create) the store
+        :param store_dir: directory of the mirrors
+        :param max_size: size cap of the store (bytes), None if unlimited
+        :param blobless: clone the mirrors without the file contents ("--filter=blob:none")
+        :param log: print() function for the git commands
+        """
+        os.makedirs(store_dir, exist_ok=True)
+        self.store_dir = os.path.abspath(store_dir)
+        self.max_size = max_size
+        self.blobless = blobless
+        self.log = log
+        self._lock = threading.Lock()
+        self._repo_locks = {}   # URL => threading.Lock
+        self._updated = set()   # paths of the mirrors cloned or fetched by this process
+        self._pending = {}      # URL => object names to look up with the next batch
+        self._objects = {}      # URL => {object name: object type, None if missing}
+
+    def mirror_path(self, url):
+        """:return the path of the mirror of a repository URL"""
+        name = os.path.basename(url.rstrip('/'))
+        if name.endswith('.git'):
+            name = name[:-len('.git')]
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.store_dir, "{}-{}.git".format(name, digest))
+
+    def expect(self, url, names):
+        """Register the object names which are looked up together with the next lookup() of a repository
+        :param url: git repository URL
+        :param names: object names (e.g. commit hashes)
+        """
+        with self._lock:
+            self._pending.setdefault(url, set()).update(names)
+
+    def lookup(self, url, name):
+        """Look up an object in the mirror of a repository
+        The mirror is cloned or updated first; the pending object names of the repository
+        (see: expect()) are looked up in the same batch.
+        :param url: git repository URL
+        :param name: object name (commit hash, tag, branch)
+        :return the object type (e.g. "commit"), or None if the object does not exist
+        :raise subprocess.CalledProcessError, OSError: the mirror cannot be cloned or updated
+        """
+        with self._repo_lock(url):
+            objects = self._objects.setdefault(url, {})
+            if name in objects:
+                return objects[name]
+            with self._lock:
+                names = self._pending.pop(url, set())
+            names.add(name)
+            names = sorted(n for n in names if n not in objects)
+            mirror = self.update(url)
+            objects.update(self._batch_check(mirror, names))
+        return objects[name]
+
+    def update(self, url):
+        """Clone the mirror of a repository, or fetch its updates (once per process)
+        :param url: git repository URL
+        :return the path of the mirror
+        """
+        mirror = self.mirror_path(url)
+        if mirror in self._updated:
+            return mirror
+        cloned = False
+        with self._file_lock(mirror):
+            if os.path.isdir(mirror):
+                try:
+                    with METRICS.operation("mirror-fetch"):
+                        self._git('fetch', '--prune', '--no-progress', 'origin', cwd=mirror)
+                except subprocess.CalledProcessError as e:
+                    # e.g. a damaged mirror: clone it again
+                    self.log("[INFO] cannot update the mirror '{}' ({}), cloning it again".format(mirror, e))
+                    remove_tree(mirror)
+            if not os.path.isdir(mirror):
+                self._clone(url, mirror)
+                cloned = True
+            self._touch(mirror)
+        with self._lock:
+            self._updated.add(mirror)
+        if cloned:
+            self.evict()
+        return mirror
+
+    def clear(self):
+        """Forget the lookups and the updates of the mirrors: the next lookup of a repository fetches its updates"""
+        with self._lock:
+            self._updated.clear()
+            self._pending.clear()
+            self._objects.clear()
+
+    def evict(self):
+        """Remove the least-recently-used mirrors until the store fits its size cap
+        The mirrors used by this process, and the mirrors locked by other processes, are kept.
+        """
+        if self.max_size is None:
+            return
+        mirrors = []
+        for entry in os.listdir(self.store_dir):
+            path = os.path.join(self.store_dir, entry)
+            if entry.endswith('.git') and os.path.isdir(path):
+                mirrors.append((self._last_used(path), tree_size(path), path))
+        total = sum(size for last_used, size, path in mirrors)
+        for last_used, size, path in sorted(mirrors):
+            if total <= self.max_size:
+                break
+            if path in self._updated:
+                continue
+            with self._file_lock(path, blocking=False) as locked:
+                if not locked:
+                    continue
+                self.log("[INFO] evicting the mirror '{}' ({} bytes)".format(path, size))
+                remove_tree(path)
+                # removed while it is held: see _file_lock()
+                try:
+                    os.remove(path + ".lock")
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+    def _clone(self, url, mirror):
+        """Clone a mirror to a temporary directory, then move it to its final path"""
+        tmp_dir = tempfile.mkdtemp(prefix=".clone.", dir=self.store_dir)
+        try:
+            cmdline = ['clone', '--no-progress', '--mirror']
+            if self.blobless:
+                cmdline.append('--filter=blob:none')
+            with METRICS.operation("mirror-clone"):
+                self._git(*cmdline, url, cwd=tmp_dir)
+            clone = os.path.join(tmp_dir, os.listdir(tmp_dir)[0])
+            os.rename(clone, mirror)
+        finally:
+            remove_tree(tmp_dir)
+
+    def _batch_check(self, mirror, names):
+        """Look up object names with a single "git cat-file --batch-check" command
+        :return {object name: object type, None if missing}
+        """
+        # an object name never contains white spaces, and would break the line-oriented protocol
+        results = {n: None for n in names if n.split() != [n]}
+        names = [n for n in names if n not in results]
+        if names:
+            self.log("++ git cat-file --batch-check ({} objects)".format(len(names)))
+            output = subprocess.run(['git', 'cat-file', '--batch-check'], cwd=mirror, input="\n".join(names) + "\n",
+                                    capture_output=True, text=True, check=True).stdout
+            for name, line in zip(names, output.splitlines()):
+                # "<hash> <type> <size>", or "<name> missing", or "<name> ambiguous"
+                fields = line.split()
+                results[name] = fields[1] if len(fields) == 3 else None
+        return results
+
+    def _git(self, *args, cwd=None):
+        """Execute a git command
+        :raise subprocess.CalledProcessError: the command failed
+        """
+        self.log("++ git " + " ".join(args))
+        subprocess.check_output(['git'] + list(args), cwd=cwd)
+
+    def _repo_lock(self, url):
+        """:return the lock which serializes the lookups of a repository within this process"""
+        with self._lock:
+            return self._repo_locks.setdefault(url, threading.Lock())
+
+    @contextmanager
+    def _file_lock(self, mirror, blocking=True):
+        """Serialize the updates of a mirror between processes
+        The lock file of an evicted mirror is removed (see: evict()): a process which waited for
+        the removed lock file locks the new one instead.
+        :return (context) True if the lock is held
+        """
+        if fcntl is None:
+            yield True
+            return
+        lock_path = mirror + ".lock"
+        while True:
+            lock_file = open(lock_path, "w")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                lock_file.close()
+                yield False
+                return
+            try:
+                current = os.path.samestat(os.fstat(lock_file.fileno()), os.stat(lock_path))
+            except FileNotFoundError:
+                current = False
+            if current:
+                break
+            lock_file.close()
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    @staticmethod
+    def _touch(mirror):
+        with open(os.path.join(mirror, LAST_USED_FILE_NAME), "w") as f:
+            f.write("{}\n".format(time.time()))
+
+    @staticmethod
+    def _last_used(mirror):
+        try:
+            return os.path.getmtime(os.path.join(mirror, LAST_USED_FILE_NAME))
+        except OSError:
+            return os.path.getmtime(mirror)
@@ -0,0 +1,961 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+import argparse
+import difflib
+import glob
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+try:
+    import requests
+    from lxml import etree
+except ImportError as ex:
+    raise ImportError(
+"""
+**** please run: ****
+  pip install -r requirements.txt
+    - 'requirements.txt' is located in the same folder as mtb_manifest_checker.py
+********
+"""
+)
+
+import checker_daemon
+import url_rewrite
+import validate_assets
+import validate_category
+import validate_format
+import validate_json
+import validate_schema
+from manifest_file import ManifestFile
+from metrics import METRICS
+
+# default super-manifest
+URI_SUPER_MANIFEST = "https://github.com/Infineon/mtb-super-manifest/raw/v2.X/mtb-super-manifest-fv2.xml"
+
+# local path of a downloaded manifest file: its URI, without this prefix
+URI_LOCAL_PREFIX = "https://github.com/"
+
+# partial result of a shard (see: --shard, write_shard_result(), merge_main())
+SHARD_RESULT_FILE = "out/shard-{}-of-{}.json"
+SHARD_RESULT_VERSION = 1
+
+# elements expected in the super-manifest file
+SUPER_MANIFEST_ELEMENTS = [
+    "super-manifest",
+    "app-manifest-list", "app-manifest",
+    "board-manifest-list", "board-manifest",
+    "middleware-manifest-list", "middleware-manifest",
+    "uri",
+]
+
+# "ordering characters" of the manifest files; need to process 'dependency' manifests last
+ORDER_SUPER = "1,"
+ORDER_MANIFEST = "2,"
+ORDER_CAPABILITY = "3,"
+ORDER_DEPENDENCY = "4,"
+
+# directory (in the --cache-dir directory) of the downloaded manifest files, for the conditional requests
+DOWNLOAD_CACHE_DIR = "downloads"
+
+# size of the chunks of the streamed downloads
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def local_path(uri):
+    """Local path of a (downloaded) manifest file
+    :param uri: URI of the manifest file
+    :return the path, relative to the current directory
+    """
+    if uri.startswith(URI_LOCAL_PREFIX):
+        return uri[len(URI_LOCAL_PREFIX):]
+    return uri
+
+
+def download(uri, path, on_data=None):
+    """Download a manifest file
+    The download is conditional (If-None-Match/If-Modified-Since) when the file has been downloaded
+    by a previous run: its contents are then copied from the download cache (see: --cache-dir).
+    :param uri: URI of the manifest file
+    :param path: local path of the manifest file
+    :param on_data: function called with each chunk of the contents, while they are downloaded (optional)
+    :return True on success, False otherwise
+    """
+    log = validate_assets.log
+    uri = validate_assets.rewrite_url(uri)
+    log("+ download {} {}".format(uri, path))
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # a local mirror of the files (see: --url-rewrite)
+    mirror_file = url_rewrite.local_path(uri)
+    if mirror_file is not None:
+        try:
+            with open(mirror_file, 'rb') as mirror_f, open(path, 'wb') as f:
+                for chunk in iter(lambda: mirror_f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                    f.write(chunk)
+                    if on_data is not None:
+                        on_data(chunk)
+        except OSError as e:
+            log("FATAL ERROR: cannot download '{}': {}".format(uri, e))
+            return False
+        return True
+
+    # look up the download cache
+    cache = validate_assets.PERSISTENT_CACHE
+    cached = cache.get("download", uri) if cache is not None else None
+    headers = {}
+    if cached is not None:
+        cached_file = os.path.join(cache.cache_dir, DOWNLOAD_CACHE_DIR, cached["file"])
+        if not os.path.exists(cached_file):
+            cached = None
+        elif cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        elif cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            try:
+                validate_assets.SCHEDULER.acquire(urlsplit(uri).netloc)
+                with METRICS.operation("download"), validate_assets.http_session().get(uri, headers=headers, allow_redirects=True, stream=True,
+                                                        timeout=validate_assets.HTTP_TIMEOUT) as response:
+                    if response.status_code == 304 and cached is not None:
+                        log("[INFO] not modified, using the download cache: {}".format(uri))
+                        with open(cached_file, 'rb') as cached_f:
+                            chunks = iter(lambda: cached_f.read(DOWNLOAD_CHUNK_SIZE), b'')
+                            for chunk in chunks:
+                                f.write(chunk)
+                                if on_data is not None:
+                                    on_data(chunk)
+                    elif not response.ok:
+                        log("FATAL ERROR: cannot download '{}': [{}]".format(uri, response.status_code))
+                        return False
+                    else:
+                        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                            if on_data is not None:
+                                on_data(chunk)
+                        cached = {
+                            "etag": response.headers.get("ETag"),
+                            "last_modified": response.headers.get("Last-Modified"),
+                            "file": hashlib.sha1(uri.encode('utf-8')).hexdigest(),
+                        } if cache is not None else None
+            except (requests.RequestException, OSError) as e:
+                log("FATAL ERROR: cannot download '{}': {}".format(uri, e))
+                return False
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    # update the download cache
+    if response.status_code != 304 and cached is not None and (cached["etag"] or cached["last_modified"]):
+        cached_file = os.path.join(cache.cache_dir, DOWNLOAD_CACHE_DIR, cached["file"])
+        try:
+            os.makedirs(os.path.dirname(cached_file), exist_ok=True)
+            shutil.copyfile(path, cached_file + ".tmp")
+            os.replace(cached_file + ".tmp", cached_file)
+            cache.put("download", uri, cached)
+        except OSError as e:
+            log("[INFO] cannot update the download cache '{}': {}".format(cached_file, e))
+    return True
+
+
+class ManifestFetcher(object):
+    """Download the manifest files concurrently (see: --jobs)
+    The validation of the downloaded files overlaps with the remaining downloads;
+    the log output of a download is printed when its result is used.
+    """
+
+    def __init__(self, jobs):
+        self._executor = ThreadPoolExecutor(max_workers=max(jobs, 1))
+        self._futures = {}
+
+    def fetch(self, uri):
+        """Start the download of a manifest file (once)
+        :param uri: URI of the manifest file
+        """
+        if uri not in self._futures:
+            self._futures[uri] = self._executor.submit(validate_assets.run_captured, download, uri, local_path(uri))
+
+    def result(self, uri):
+        """Wait for the download of a manifest file
+        :param uri: URI of the manifest file
+        :return True on success, False otherwise
+        """
+        ok, log_output = self.wait(uri)
+        print(log_output, end='')
+        return ok
+
+    def wait(self, uri):
+        """Wait for the download of a manifest file
+        :param uri: URI of the manifest file
+        :return (True on success, False otherwise; log output of the download)
+        """
+        return self._futures.pop(uri).result()
+
+    def __contains__(self, uri):
+        return uri in self._futures
+
+    def shutdown(self):
+        self._executor.shutdown(cancel_futures=True)
+
+
+def discover_manifests(uri_super_manifest, fetcher):
+    """Download the super-manifest file and list all the manifest files that it references
+    The super-manifest file is parsed while it is downloaded; the download of each manifest file
+    is started as soon as its URI is found.
+    :param uri_super_manifest: URI of the super-manifest file
+    :param fetcher: ManifestFetcher of the manifest files
+    :return list of "ordering characters" + URI of the manifest files, or None on failure
+    """
+    print("[INFO] processing 'mtb-super-manifest' at: {}".format(uri_super_manifest))
+    path = local_path(uri_super_manifest)
+    if os.path.exists(path):
+        os.remove(path)
+
+    failed = False
+    manifest_uris = [ORDER_SUPER + uri_super_manifest]
+
+    def found(order, uri, element, name):
+        nonlocal failed
+        uri = "".join((uri or "").split())
+        if not uri:
+            print("FATAL ERROR: empty {} at line {}".format(name, element.sourceline))
+            print("  in super-manifest file: {}".format(uri_super_manifest))
+            print("")
+            failed = True
+            return
+        manifest_uris.append(order + uri)
+        fetcher.fetch(uri)
+
+    def process_events(parser):
+        nonlocal failed
+        for event, element in parser.read_events():
+            if event == "start":
+                if element.tag not in SUPER_MANIFEST_ELEMENTS:
+                    print("FATAL ERROR: unexpected data:")
+                    print("    [{}] => [{}]".format(element.tag, element.text))
+                    print("  in super-manifest file: {}".format(uri_super_manifest))
+                    print("")
+                    failed = True
+                elif element.tag == "board-manifest":
+                    # optional "dependency-url" and "capability-url"
+                    if element.get("dependency-url") is not None:
+                        found(ORDER_DEPENDENCY, element.get("dependency-url"), element, "'dependency-url'")
+                    if element.get("capability-url") is not None:
+                        found(ORDER_CAPABILITY, element.get("capability-url"), element, "'capability-url'")
+                elif element.tag == "middleware-manifest":
+                    if element.get("dependency-url") is not None:
+                        found(ORDER_CAPABILITY, element.get("dependency-url"), element, "'dependency-url'")
+            elif element.tag == "uri":
+                found(ORDER_MANIFEST, element.text, element, "<uri>")
+
+    parser = etree.XMLPullParser(events=("start", "end"))
+    try:
+        def on_data(chunk):
+            parser.feed(chunk)
+            process_events(parser)
+        if not download(uri_super_manifest, path, on_data=on_data):
+            return None
+        parser.close()
+        process_events(parser)
+    except etree.XMLSyntaxError as e:
+        print("FATAL ERROR: cannot parse the super-manifest file: {}".format(e))
+        return None
+
+    if failed:
+        return None
+    return manifest_uris
+
+
+class Checker(object):
+    # class which runs the tests on the manifest files
+
+    def __init__(self, args):
+        self.args = args
+        self.failed = False
+        # False in the worker processes: the main process merges and saves their ASSET_CACHE entries
+        self.save_asset_cache = True
+
+    def enabled(self, flag):
+        return not self.args.flags or flag
+
+    def fail(self, manifest_file, error, line=None):
+        """Mark the run as failed, and record the failure for the summary (see: --keep-going)"""
+        self.failed = True
+        validate_assets.FAILURES.append({"manifest": manifest_file, "line": line, "asset": None, "ref": None,
+                                         "error": error})
+
+    def test_syntax(self, manifest):
+        print("\n\n########## test syntax ##########")
+        manifest_file = manifest.path
+        print("+ syntax {}".format(manifest_file))
+        try:
+            manifest.tree
+            print("")
+            print("Manifest: {}".format(manifest_file))
+            print("passed syntax validation")
+            print("")
+        except etree.XMLSyntaxError as e:
+            for entry in e.error_log:
+                print("{}:{}: parser error : {}".format(manifest_file, entry.line, entry.message))
+            print("FATAL ERROR: '{}' failed syntax validation!".format(manifest_file))
+            self.fail(manifest_file, "failed syntax validation", e.error_log[0].line if e.error_log else None)
+        print("####################")
+
+    def test_format(self, manifest):
+        print("\n\n########## test format ##########")
+        manifest_file = manifest.path
+        x = manifest_file
+        y = os.path.join("out", os.path.basename(x))
+        print("+ validate_format {} {}".format(x, y))
+        if os.path.exists(y):
+            os.remove(y)
+        os.makedirs("out", exist_ok=True)
+
+        ## format the file in memory, and compare it with the original file
+        if not validate_format.validate_format(manifest, y):
+            self.fail(manifest_file, "failed format validation")
+            print("")
+            print("Manifest: {}".format(manifest_file))
+            print("failed format validation")
+            print("")
+        else:
+            print("")
+            print("Manifest: {}".format(manifest_file))
+            print("passed format validation")
+            print("")
+        print("####################")
+
+    def detect_type(self, manifest):
+        print("+ detect_type {}".format(manifest.path))
+        manifest_type = manifest.manifest_type
+        if not manifest_type:
+            print("\nFATAL ERROR: cannot determine 'manifest type' of '{}'".format(manifest.path))
+        return manifest_type
+
+    def test_schema(self, manifest):
+        print("\n\n########## test schema ##########")
+        manifest_file = manifest.path
+        manifest_type = self.detect_type(manifest)
+        if manifest_type:
+            print("+ validate_schema {} {}".format(manifest_type, manifest_file))
+            try:
+                # the schemas are compiled once per run (see: validate_schema.SCHEMA_POOL)
+                with METRICS.stage(manifest_file, "schema"):
+                    validate_schema.XmlValidator(manifest_type).validate_manifest(manifest)
+                rc = 0
+            except SystemExit as e:
+                rc = e.code
+            except Exception as e:
+                print(e)
+                rc = 1
+            print("")
+            if rc != 0:
+                print("FATAL ERROR: '{}' failed schema validation!".format(manifest_file))
+                self.fail(manifest_file, "failed schema validation")
+            print("+ validate_category {} {}".format(manifest_type, manifest_file))
+            with METRICS.stage(manifest_file, "category"):
+                passed = validate_category.validate_category(manifest_type, manifest)
+            if not passed:
+                self.fail(manifest_file, "failed category validation")
+        else:
+            self.fail(manifest_file, "cannot determine 'manifest type'")
+        print("####################")
+
+    def test_assets(self, manifest):
+        print("\n\n########## test assets ##########")
+        manifest_file = manifest.path
+        manifest_type = self.detect_type(manifest)
+        if manifest_type == "dependency" and self.args.shard:
+            # checked against the asset index of all the shards (see: merge_main())
+            print("[INFO] shard {}/{}: the assets of '{}' are checked by the merge of the shards".format(
+                self.args.shard[0], self.args.shard[1], manifest_file))
+            print("####################")
+            return
+        if manifest_type:
+            x = manifest_file
+            y = os.path.join("out", os.path.basename(x))
+            if os.path.exists(y):
+                os.remove(y)
+            os.makedirs("out", exist_ok=True)
+            print("+ validate_assets {} {} {}".format(manifest_type, x, y))
+            first_failure = len(validate_assets.FAILURES)
+            try:
+                passed = validate_assets.validate_manifest_assets(manifest_type, manifest, y)
+            except Exception as e:
+                print("FATAL ERROR: exception is: {}".format(e))
+                passed = False
+            if self.save_asset_cache:
+                validate_assets.save_asset_cache()
+            print("")
+            if not passed:
+                print("FATAL ERROR: '{}' failed processing!".format(x))
+                self.failed = True
+                if len(validate_assets.FAILURES) == first_failure:
+                    self.fail(manifest_file, "failed asset validation")
+                print("")
+                print("Manifest: {}".format(manifest_file))
+                print("Failed asset validation")
+                print("")
+            else:
+                print("")
+                print("Manifest: {}".format(manifest_file))
+                print("passed asset validation")
+                print("")
+        else:
+            self.fail(manifest_file, "cannot determine 'manifest type'")
+        print("####################")
+
+    def test_syntax_json(self, json_file):
+        print("\n\n########## test syntax json ##########")
+        print("+ validate_json --syntax {}".format(json_file))
+        with open(json_file, 'r') as f:
+            passed = validate_json.syntax_json(f)
+        print("")
+        if passed:
+            print("")
+            print("JSON file: {}".format(json_file))
+            print("passed syntax validation")
+            print("")
+        else:
+            print("FATAL ERROR: '{}' failed syntax validation!".format(json_file))
+            self.fail(json_file, "failed syntax validation")
+        print("####################")
+
+    def test_format_json(self, json_file):
+        print("\n\n########## test format json ##########")
+        y = os.path.join("out", os.path.basename(json_file))
+        if os.path.exists(y):
+            os.remove(y)
+        os.makedirs("out", exist_ok=True)
+        print("+ validate_json --format {} {}".format(json_file, y))
+        try:
+            with open(json_file, 'r') as f:
+                validate_json.format_json(f, y)
+            with open(json_file, 'rb') as f1, open(y, 'rb') as f2:
+                passed = f1.read() == f2.read()
+        except ValueError:
+            passed = False
+        print("")
+        if not passed:
+            ## diff the original and the generated file
+            print("FATAL ERROR: formatting error(s)...\n")
+            if os.path.exists(y):
+                with open(json_file, 'r') as f1, open(y, 'r') as f2:
+                    sys.stdout.writelines(difflib.unified_diff(f1.readlines(), f2.readlines(), json_file, y))
+            self.fail(json_file, "failed format validation")
+            print("")
+            print("JSON file: {}".format(json_file))
+            print("failed format validation")
+            print("")
+        else:
+            print("")
+            print("JSON file: {}".format(json_file))
+            print("passed format validation")
+            print("")
+        print("####################")
+
+    def check(self, manifest_file):
+        """Run the selected tests on a manifest (or JSON) file"""
+        args = self.args
+        if manifest_file.endswith(".json"):
+            if self.enabled(args.syntax):
+                with METRICS.stage(manifest_file, "syntax"):
+                    self.test_syntax_json(manifest_file)
+            if self.enabled(args.format):
+                with METRICS.stage(manifest_file, "format"):
+                    self.test_format_json(manifest_file)
+        else:
+            # the file is read and parsed once, for all the tests
+            manifest = ManifestFile(manifest_file)
+            if self.enabled(args.syntax):
+                with METRICS.stage(manifest_file, "syntax"):
+                    self.test_syntax(manifest)
+            if self.enabled(args.format):
+                with METRICS.stage(manifest_file, "format"):
+                    self.test_format(manifest)
+            if self.enabled(args.schema):
+                # timed by stage: "schema" and "category"
+                self.test_schema(manifest)
+            if self.enabled(args.assets):
+                with METRICS.stage(manifest_file, "assets"):
+                    self.test_assets(manifest)
+
+
+def lookup_options(args):
+    """Arguments of validate_assets.configure(), for the main process and the worker processes alike
+    :param args: parsed command-line arguments
+    :return keyword arguments of validate_assets.configure()
+    """
+    return dict(jobs=args.jobs, cache_dir=args.cache_dir, refresh_time=args.refresh_time,
+                mirror_dir=args.mirror_dir, mirror_max_size=args.mirror_max_size,
+                blobless=args.blobless, rate=args.rate, url_rewrite=args.url_rewrite,
+                revalidate_after=args.revalidate_after, since=args.since,
+                keep_going=args.keep_going, cache_memory=args.cache_memory, shard=args.shard)
+
+
+# Checker of a worker process (see: init_worker())
+WORKER_CHECKER = None
+
+
+def init_worker(args):
+    """Initialize a worker process (see: check_parallel())
+    :param args: parsed command-line arguments of the main process
+    """
+    global WORKER_CHECKER
+
+    validate_assets.configure(**lookup_options(args))
+    WORKER_CHECKER = Checker(args)
+    WORKER_CHECKER.save_asset_cache = False
+
+
+def check_in_worker(manifest_file, asset_index):
+    """Run the tests of a manifest file in a worker process
+    :param manifest_file: path of the manifest file
+    :param asset_index: ASSET_CACHE entries (id => git repo) of the manifests checked so far
+    :return (True if a test failed, log output, ASSET_CACHE entries added by the tests,
+             METRICS of the tests, failures of the tests)
+    """
+    validate_assets.ASSET_CACHE = dict(asset_index)
+    validate_assets.FAILURES = []
+    METRICS.reset()
+    WORKER_CHECKER.failed = False
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        WORKER_CHECKER.check(manifest_file)
+    added = {k: v for k, v in validate_assets.ASSET_CACHE.items() if asset_index.get(k) != v}
+    return WORKER_CHECKER.failed, output.getvalue(), added, METRICS.snapshot(), validate_assets.FAILURES
+
+
+def obtain(fetcher, uri):
+    """Wait for the download of a manifest file, or download it
+    :param fetcher: ManifestFetcher of the manifest files
+    :param uri: URI (or path) of the manifest file
+    :return (True on success, False otherwise; log output of the download)
+    """
+    if uri in fetcher:
+        return fetcher.wait(uri)
+    path = local_path(uri)
+    if os.path.exists(path):
+        return True, ""
+    return validate_assets.run_captured(download, uri, path)
+
+
+def check_serial(checker, fetcher, manifest_uris):
+    """Run the tests of the manifest files one by one, in order
+    :param checker: Checker
+    :param fetcher: ManifestFetcher of the manifest files
+    :param manifest_uris: list of "ordering characters" + URI of the manifest files
+    """
+    for x in sorted(manifest_uris):
+        y = x[len(ORDER_SUPER):]  # strip the ordering characters
+        print("\n\n### Process: {}".format(y))
+        z = local_path(y)
+        if y in fetcher:
+            if not fetcher.result(y):
+                checker.fail(y, "cannot download")
+                continue
+        elif not os.path.exists(z) and not download(y, z):
+            checker.fail(y, "cannot download")
+            continue
+        checker.check(z)
+
+
+def check_parallel(args, checker, fetcher, manifest_uris):
+    """Run the tests of the manifest files in a pool of worker processes (see: --processes)
+    The super, board, app and middleware manifests run at once; their ASSET_CACHE entries are
+    merged into a shared index, and each dependency manifest starts as soon as the assets that it
+    references are in the index (or when all the other manifests are done).
+    The log output of the manifests is printed in the same order as check_serial().
+    :param args: parsed command-line arguments
+    :param checker: Checker (its "failed" flag is updated)
+    :param fetcher: ManifestFetcher of the manifest files
+    :param manifest_uris: list of "ordering characters" + URI of the manifest files
+    """
+    asset_index = dict(validate_assets.ASSET_CACHE)
+    outputs = {}        # position => log output (once done)
+    failures = {}       # position => failures (see: --keep-going)
+    futures = {}        # future => position
+    waiting = []        # (position, path, asset ids) of the dependency manifests not started yet
+    independent = set() # futures of the other manifests
+
+    def merge(future):
+        failed, output, added, metrics, worker_failures = future.result()
+        METRICS.merge(metrics)
+        position = futures.pop(future)
+        failures[position] = worker_failures
+        independent.discard(future)
+        asset_index.update(added)
+        outputs[position] += output
+        if failed:
+            checker.failed = True
+
+    def start_ready(pool):
+        for item in list(waiting):
+            position, path, ids = item
+            if not independent or ids.issubset(asset_index):
+                waiting.remove(item)
+                futures[pool.submit(check_in_worker, path, asset_index)] = position
+
+    next_output = 0
+    def print_outputs(done):
+        nonlocal next_output
+        while next_output in done:
+            print(outputs.pop(next_output), end='')
+            validate_assets.FAILURES.extend(failures.pop(next_output, []))
+            next_output += 1
+
+    done = set()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.processes, mp_context=context,
+                             initializer=init_worker, initargs=(args,)) as pool:
+        for position, x in enumerate(sorted(manifest_uris)):
+            y = x[len(ORDER_SUPER):]  # strip the ordering characters
+            ok, log_output = obtain(fetcher, y)
+            outputs[position] = "\n\n### Process: {}\n".format(y) + log_output
+            if not ok:
+                checker.fail(y, "cannot download")
+                done.add(position)
+                continue
+            path = local_path(y)
+            manifest = ManifestFile(path) if not path.endswith(".json") else None
+            if manifest is not None and manifest.manifest_type == "dependency":
+                try:
+                    ids = validate_assets.dependency_ids(manifest.root)
+                except etree.XMLSyntaxError:
+                    ids = set()
+                waiting.append((position, path, ids))
+            else:
+                future = pool.submit(check_in_worker, path, asset_index)
+                futures[future] = position
+                independent.add(future)
+
+        start_ready(pool)
+        while futures:
+            completed, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in completed:
+                done.add(futures[future])
+                merge(future)
+            start_ready(pool)
+            print_outputs(done)
+    print_outputs(done)
+
+    validate_assets.ASSET_CACHE = asset_index
+    validate_assets.save_asset_cache()
+
+
+def shard_spec(text):
+    """Parse the --shard option
+    :param text: "K/N", 1 <= K <= N
+    :return (K, N)
+    """
+    match = re.match(r'^(\d+)/(\d+)$', text)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise argparse.ArgumentTypeError("expected K/N, with 1 <= K <= N: '{}'".format(text))
+    return int(match.group(1)), int(match.group(2))
+
+
+def dependency_manifests(manifest_uris):
+    """List the dependency manifests of a run
+    :param manifest_uris: list of "ordering characters" + URI of the manifest files
+    :return list of the URIs of the (downloaded) dependency manifests, in processing order
+    """
+    uris = []
+    for x in sorted(manifest_uris):
+        y = x[len(ORDER_SUPER):]  # strip the ordering characters
+        path = local_path(y)
+        if not y.endswith(".json") and os.path.exists(path) and \
+                validate_schema.detect_manifest_type(path) == "dependency":
+            uris.append(y)
+    return uris
+
+
+def write_shard_result(path, shard, failed, num_found, dependency_uris):
+    """Write the partial result of a shard, for merge_main()
+    :param path: path of the JSON result file
+    :param shard: (K, N)
+    :param failed: True if a test failed in the shard
+    :param num_found: number of manifest files processed
+    :param dependency_uris: URIs of the dependency manifests, checked by merge_main()
+    """
+    result = {"version": SHARD_RESULT_VERSION, "shard": list(shard), "failed": failed, "processed": num_found,
+              "failures": validate_assets.FAILURES, "asset_cache": validate_assets.ASSET_CACHE,
+              "dependency_manifests": dependency_uris}
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', newline='') as f:
+        json.dump(result, f, indent=2)
+        f.write('\n')
+    print("[INFO] shard {}/{}: partial result: {}".format(shard[0], shard[1], path))
+
+
+def load_shard_results(paths):
+    """Read the partial results of the shards, and check that they cover all the shards once
+    :param paths: paths of the JSON result files
+    :return list of the results, in shard order; None if they do not fit together
+    """
+    results = []
+    for path in paths:
+        try:
+            with open(path, 'r') as f:
+                result = json.load(f)
+        except (OSError, ValueError) as e:
+            print("FATAL ERROR: cannot read the shard result '{}': {}".format(path, e))
+            return None
+        if result.get("version") != SHARD_RESULT_VERSION:
+            print("FATAL ERROR: '{}' is not a shard result of this version of the checker".format(path))
+            return None
+        results.append(result)
+    results.sort(key=lambda x: x["shard"])
+    shard_count = results[0]["shard"][1]
+    shards = [x["shard"] for x in results]
+    expected = [[k, shard_count] for k in range(1, shard_count + 1)]
+    if shards != expected:
+        print("FATAL ERROR: the shard results do not cover each shard once")
+        print("INFO: expected shards [{}]".format(" ".join("{}/{}".format(*x) for x in expected)))
+        print("INFO: found shards [{}]".format(" ".join("{}/{}".format(*x) for x in shards)))
+        return None
+    return results
+
+
+def merge_main(argv):
+    """Command line of "mtb_manifest_checker.py merge": merge the partial results of the shards,
+    check the dependency manifests against the merged asset index, and print the final verdict
+    :param argv: command-line arguments (after "merge")
+    """
+    argParser = argparse.ArgumentParser(
+        prog="mtb_manifest_checker.py merge",
+        description="Merge the partial results of the shards (see: --shard K/N), and check the dependency manifests")
+    argParser.add_argument("-j", "--jobs", type=int, default=validate_assets.DEFAULT_JOBS,
+                           help="Number of git references resolved concurrently (default: {})"
+                           .format(validate_assets.DEFAULT_JOBS))
+    argParser.add_argument("--cache-dir", default=validate_assets.DEFAULT_CACHE_DIR,
+                           help="Directory of the persistent lookup cache (default: {})"
+                           .format(validate_assets.DEFAULT_CACHE_DIR))
+    argParser.add_argument("--refresh", action="store_true", help="ignore the lookups cached by previous runs")
+    validate_assets.add_lookup_arguments(argParser)
+    validate_assets.add_report_arguments(argParser)
+    argParser.add_argument("results", nargs="+", metavar="result_file",
+                           help="partial result of a shard (see: --shard-result)")
+    argParser.set_defaults(shard=None, flags=True)
+    args = argParser.parse_args(argv)
+    args.refresh_time = time.time() if args.refresh else 0
+
+    results = load_shard_results(args.results)
+    if results is None:
+        sys.exit(2)
+
+    validate_assets.configure(**lookup_options(args))
+
+    # the file-level tests run in every shard: their failures are listed once
+    checker = Checker(args)
+    failures = []
+    for result in results:
+        print("[INFO] shard {}/{}: {} manifest files, {}".format(
+            result["shard"][0], result["shard"][1], result["processed"], "failed" if result["failed"] else "passed"))
+        checker.failed = checker.failed or result["failed"]
+        validate_assets.ASSET_CACHE.update(result["asset_cache"])
+        for failure in result["failures"]:
+            if failure not in failures:
+                failures.append(failure)
+    validate_assets.FAILURES.extend(failures)
+
+    # the dependency manifests are checked against the asset index of all the shards
+    os.makedirs("out", exist_ok=True)
+    dependency_uris = []
+    for result in results:
+        dependency_uris += [x for x in result["dependency_manifests"] if x not in dependency_uris]
+    for y in dependency_uris:
+        print("\n\n### Process: {}".format(y))
+        z = local_path(y)
+        if not os.path.exists(z) and not download(y, z):
+            checker.fail(y, "cannot download")
+            continue
+        with METRICS.stage(z, "assets"):
+            checker.test_assets(ManifestFile(z))
+
+    validate_assets.report_throttling()
+    validate_assets.report_metrics(args.report, args.profile)
+    print("\n\n... merged {} shards, {} dependency manifest files".format(len(results), len(dependency_uris)))
+    validate_assets.print_failures()
+    if checker.failed:
+        print("\n\nFATAL ERROR: one or more tests failed!")
+        sys.exit(6)
+
+    print("\nSUCCESS: all tests passed!")
+    sys.exit(0)
+
+
+def parse_args(argv=None):
+    argParser = argparse.ArgumentParser(
+        description="Validate the ModusToolbox manifest files (in a single process); "
+                    "'mtb_manifest_checker.py serve --help' runs the validation daemon, "
+                    "'mtb_manifest_checker.py merge --help' merges the results of the shards")
+    argParser.add_argument("--syntax", action="store_true", help="run the Syntax Checker")
+    argParser.add_argument("--format", action="store_true", help="run the Format Checker")
+    argParser.add_argument("--schema", action="store_true", help="run the Schema Checker")
+    argParser.add_argument("--assets", action="store_true", help="run the Assets Checker")
+    argParser.add_argument("--rules", action="store_true", help="run the Rules Checker (not implemented)")
+    argParser.add_argument("--custom", action="store_true",
+                           help="custom super-manifest; keep the 'out/asset_cache.txt' file of a previous run")
+    argParser.add_argument("--refresh", action="store_true", help="ignore the lookups cached by previous runs")
+    argParser.add_argument("-p", "--processes", type=int, default=1,
+                           help="Number of manifest files checked concurrently, in worker processes (default: 1)")
+    argParser.add_argument("-j", "--jobs", type=int, default=validate_assets.DEFAULT_JOBS,
+                           help="Number of git references resolved concurrently (default: {})"
+                           .format(validate_assets.DEFAULT_JOBS))
+    argParser.add_argument("--cache-dir", default=validate_assets.DEFAULT_CACHE_DIR,
+                           help="Directory of the persistent lookup cache (default: {})"
+                           .format(validate_assets.DEFAULT_CACHE_DIR))
+    validate_assets.add_lookup_arguments(argParser)
+    validate_assets.add_report_arguments(argParser)
+    argParser.add_argument("--shard", type=shard_spec, metavar="K/N",
+                           help="Only look up the entries of the repositories of shard K of N (a hash of the "
+                                "repository URL), defer the dependency manifests, and write a partial result "
+                                "for 'mtb_manifest_checker.py merge'")
+    argParser.add_argument("--shard-result", metavar="PATH",
+                           help="Partial result of the shard (default: {})".format(SHARD_RESULT_FILE))
+    argParser.add_argument("manifests", nargs="*", metavar="uri_or_file",
+                           help="URI of the super-manifest file, or one or more manifest files")
+    args = argParser.parse_args(argv)
+    args.flags = args.syntax or args.format or args.schema or args.assets or args.rules
+    # recorded once: the worker processes ignore the same cache entries as the main process
+    args.refresh_time = time.time() if args.refresh else 0
+
+    # split the URI of the super-manifest and the manifest files
+    args.manifest_uri = ""
+    args.manifest_files = []
+    for arg in args.manifests:
+        if arg.startswith("https://") or arg.startswith("http://"):
+            if args.manifest_uri:
+                print("INFO: 'manifest uri' has already been specified [{}]".format(args.manifest_uri))
+                print("FATAL ERROR: unhandled argument {}".format(arg))
+                sys.exit(2)
+            args.manifest_uri = arg
+        else:
+            files = sorted(glob.glob(arg))
+            if not files:
+                print("FATAL ERROR: the specified 'manifest file' ({}) does not exist".format(arg))
+                sys.exit(3)
+            args.manifest_files += files
+
+    if args.manifest_uri and args.manifest_files:
+        print("FATAL ERROR: cannot specify both a 'manifest uri' and 'manifest files'!")
+        print("INFO: 'manifest uri' [{}]".format(args.manifest_uri))
+        print("INFO: 'manifest file(s)' [{}]".format(" ".join(args.manifest_files)))
+        sys.exit(2)
+    return args
+
+
+def main(argv=None):
+    """Run the checker
+    :param argv: command-line arguments (default: sys.argv[1:]); "serve ..." starts the validation daemon
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["serve"]:
+        checker_daemon.serve_main(argv[1:])
+        return
+    if argv[:1] == ["merge"]:
+        merge_main(argv[1:])
+        return
+    args = parse_args(argv)
+
+    validate_assets.configure(**lookup_options(args))
+
+    fetcher = ManifestFetcher(args.jobs)
+    if not args.manifest_files:
+        # Process the 'super-manifest' file and detect all manifest files (and json files)
+        manifest_uris = discover_manifests(args.manifest_uri or URI_SUPER_MANIFEST, fetcher)
+        if manifest_uris is None:
+            fetcher.shutdown()
+            print("FATAL ERROR: cannot continue, processing the super-manifest file failed!")
+            sys.exit(5)
+        ## when processing the "super-manifest" tree,
+        ## ensure that the 'out/asset_cache.txt' file (for the dependency manifests)
+        ## has been cleared (unless this is a "custom super-manifest")
+        if not args.custom and os.path.exists(validate_assets.ASSET_CACHE_FILE):
+            os.remove(validate_assets.ASSET_CACHE_FILE)
+    else:
+        # Process the specified manifest files
+        manifest_uris = []
+        for x in args.manifest_files:
+            manifest_type = validate_schema.detect_manifest_type(x)
+            if manifest_type == "super":
+                manifest_uris.append(ORDER_SUPER + x)
+            elif manifest_type == "dependency":
+                manifest_uris.append(ORDER_CAPABILITY + x)
+            else:
+                manifest_uris.append(ORDER_MANIFEST + x)
+    os.makedirs("out", exist_ok=True)
+    validate_assets.load_asset_cache()
+
+    # order the manifest files; need to process 'dependency' manifests last
+    checker = Checker(args)
+    num_found = len(manifest_uris)
+    if args.processes > 1:
+        check_parallel(args, checker, fetcher, manifest_uris)
+    else:
+        check_serial(checker, fetcher, manifest_uris)
+    fetcher.shutdown()
+
+    validate_assets.report_throttling()
+    validate_assets.report_metrics(args.report, args.profile)
+    if args.shard:
+        write_shard_result(args.shard_result or SHARD_RESULT_FILE.format(*args.shard), args.shard,
+                           checker.failed, num_found, dependency_manifests(manifest_uris))
+    if num_found > 1:
+        print("\n\n... processed {} manifest files".format(num_found))
+    if args.keep_going:
+        validate_assets.print_failures()
+    if checker.failed:
+        print("\n\nFATAL ERROR: one or more tests failed!")
+        sys.exit(6)
+
+    print("\nSUCCESS: all tests passed!")
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -41,64 +41,6 @@ top_dir=${0%/*}
 # default super-manifest
 uri_super_manifest=https://github.com/Infineon/mtb-super-manifest/raw/v2.X/mtb-super-manifest-fv2.xml
 
-legal_category_app=(
-"Audio"
-"Battery Charging"
-"Bluetooth&#174;"
-"Community Code Examples"
-"Connectivity"
-"Getting Started"
-"Graphics"
-"Industrial Communication"
-"Machine Learning"
-"Manufacturing"
-"Motor Control"
-"Peripherals"
-"Power Conversion"
-"Security"
-"Sensing"
-"Solutions"
-"USB-C Power Delivery"
-""
-"Wi-Fi"
-)
-
-legal_category_bsp=(
-"AIROC&#8482; Bluetooth&#174; BSPs"
-"AIROC&#8482; Connectivity BSPs"
-"CCG BSPs"
-"iMOTION&#8482; BSPs"
-"LITIX&#8482; BSPs"
-"MOTIX&#8482; BSPs"
-"PMG BSPs"
-"PSOC&#8482; 4 BSPs"
-"PSOC&#8482; 6 BSPs"
-"PSOC&#8482; Connect BSPs"
-"PSOC&#8482; Control BSPs"
-"PSOC&#8482; Edge BSPs"
-"PSOC&#8482; Wireless BSPs"
-"Reference Design BSPs"
-"TRAVEO&#8482; BSPs"
-"USB BSPs"
-"Wireless Charging BSPs"
-"XMC&#8482; BSPs"
-)
-
-legal_category_mw=(
-"Bluetooth&#174;"
-"Connectivity"
-"Core"
-"Ethernet"
-"Graphics"
-"Middleware"
-"Motor Control"
-"Peripheral"
-"Power Conversion"
-"Utilities"
-"Voice"
-"Wi-Fi"
-)
-
 g_manifest_type=""
 g_failed=0
 
@@ -109,6 +51,7 @@ f_assets=0
 f_rules=0
 f_flags=0
 f_custom=0
+f_refresh=0
 manifest_files=()
 manifest_uri=""
 # parse command line args
@@ -137,6 +80,9 @@ while (( $# > 0 )); do
     "--custom")
       f_custom=1
       ;;
+    "--refresh")
+      f_refresh=1
+      ;;
     "--"*)
       echo "FATAL ERROR: unknown argument $1"
       exit 2
@@ -177,18 +123,22 @@ if [[ -n ${manifest_uri} && ${#manifest_files[@]} -ne 0 ]]; then
 fi
 
 
+## the "requires_*" preflight checks are performed once per run
 function requires_xmllint()
 {
+  [[ -n ${xmllint_found:-} ]] && return 0
   found=$(which xmllint) || :
   if [[ -z ${found} ]]; then
     echo "FATAL ERROR: 'xmllint' is required!"
     echo " ... perhaps: sudo apt install libxml2-utils"
     exit 4
   fi
+  xmllint_found=${found}
 }
 
 function requires_python3()
 {
+  [[ -n ${python3_found:-} ]] && return 0
   PYTHON3=python3
   major_version=$(which python >/dev/null 2>&1 && python --version 2>&1 | tr -d '[a-zA-Z ]*' | cut -d '.' -f1)
   # use 'python' if it is version 3.x.x or above
@@ -201,12 +151,32 @@ function requires_python3()
     exit 4
   fi
 
-  printf "\n[info] using '%s' (%s) at [%s]\n\n" ${PYTHON3} $(${PYTHON3} --version 2>&1 | tr -d '[a-zA-Z ]*') $(which ${PYTHON3})
+  printf "\n[info] using '%s' (%s) at [%s]\n\n" ${PYTHON3} $(${PYTHON3} --version 2>&1 | tr -d '[a-zA-Z ]*') ${found}
+  python3_found=${found}
+}
+
+function rewrite_urls()
+{
+  # apply the URL rewrite rules (URL_INSTEADOF, URL_REWRITE_FILE) to URLs (see: url_rewrite.py);
+  # the rules are read once for all the URLs: g_urls holds the rewritten URLs, in the order of the arguments
+  g_urls=("$@")
+  if [[ -n ${URL_INSTEADOF:-}${URL_REWRITE_FILE:-} && $# -gt 0 ]]; then
+    requires_python3
+    g_urls=($(${PYTHON3} ${top_dir}/url_rewrite.py "$@"))
+  fi
+}
+
+function trace_url()
+{
+  [[ -n ${URL_INSTEADOF:-}${URL_REWRITE_FILE:-} ]] && printf "URL TRACE: $1\n"
+  return 0
 }
 
+python3_modules_found=" "
 function requires_python3_module()
 {
   module=$1
+  [[ ${python3_modules_found} = *" ${module} "* ]] && return 0
   set +e
   ${PYTHON3} -c "import ${module}" 2>/dev/null
   rc=$?
@@ -216,6 +186,7 @@ function requires_python3_module()
     echo " ... perhaps: pip install ${module}"
     exit 4
   fi
+  python3_modules_found+="${module} "
 }
 
 function read_xml()
@@ -258,65 +229,12 @@ function validate_category()
 {
   g_manifest_type=$1
   manifest_file=$2
-# echo -e "+ grep \"<category>.*</category>\" ${manifest_file}"
-#            grep  "<category>.*</category>"  ${manifest_file} || :
-  #
-  legal_values=()
-  case "${g_manifest_type}" in
-    "app")
-      legal_values=("${legal_category_app[@]}")
-      ;;
-    "board")
-      legal_values=("${legal_category_bsp[@]}")
-      ;;
-    "dependency")
-      # no "category" element to process
-      ;;
-    "middleware")
-      legal_values=("${legal_category_mw[@]}")
-      ;;
-    "super")
-      # no "category" element to process
-      ;;
-    *)
-      echo -e "\nFATAL ERROR: unknown manifest type: ${g_manifest_type}\n"
-      g_failed=1
-      ;;
-  esac
-  #
-  failed=0
-  is_partner=$(echo "${manifest_file}" | grep -v -i "^Infineon/" | wc -l)
-  msg_prefix="FATAL ERROR"
-  [[ ${is_partner} -ne 0 ]] && msg_prefix="Warning"
-  ## readarray is not available pre Bash-4
-  #readarray -t output < <(grep "<category>.*</category>" ${manifest_file})
-  output=()
-  while read line; do output+=("${line}"); done < <(grep "<category>.*</category>" ${manifest_file})
-  ##
-  for x in "${output[@]}"; do
-    for y in "${legal_values[@]}"; do
-      match=$(echo "${x}" | grep "^ *<category>${y}</category>$" | wc -l)
-      [[ ${match} -ne 0 ]] && break
-    done
-    if [[ ${match} -eq 0 ]]; then
-      echo -e "${msg_prefix}: unknown category: ${x}"
-      failed=1
-    fi
-  done
-  #
-  if [[ ${failed} -eq 0 ]]; then
-    echo "passed 'validate_category' check"
-  else
-    echo -e "\nnote: pre-defined categories (for \"${g_manifest_type}\" type manifest files) are:"
-    for y in "${legal_values[@]}"; do
-      echo "    ${y}"
-    done
-    if [[ ${is_partner} -eq 0 ]]; then
-      echo "FATAL ERROR: invalid catagories"
-      g_failed=1
-    fi
-  fi
-  echo ""
+  ## the pre-defined categories are listed in 'categories.json'
+  set +e
+  ${PYTHON3} -u ${top_dir}/validate_category.py ${g_manifest_type} ${manifest_file}
+  rc=$?
+  ${restore_errexit}
+  [[ ${rc} -ne 0 ]] && g_failed=1
 }
 
 function test_syntax()
@@ -344,44 +262,21 @@ function test_syntax()
 function test_format()
 {
   echo -e "\n\n########## test format ##########"
-  requires_xmllint
   requires_python3
-  echo "+ xmllint --format ${manifest_file} | 'post-process with custom format'"
+  requires_python3_module lxml
   x=${manifest_file}
   y=${x##*/}
   rm -rf   out/${y}
   mkdir -p out
   #
-  ## initial format the file
+  ## format the file (as "xmllint --format", with the exceptions of the manifest files),
+  ## and compare it with the original file; the formatted file is saved on failure
+  echo "+ ${PYTHON3} -u ${top_dir}/validate_format.py $x out/$y"
   set +e
-  xmllint --format $x > out/$y
+  ${PYTHON3} -u ${top_dir}/validate_format.py $x out/$y
   rc=$?
   ${restore_errexit}
-  #
-  ## handle optional XML Declaration
-  ## - delete the line in generated file, if XML declaration does not exist in original file
-  s='<?xml version='
-  [[ $(head -1 $x) != "$s"* ]] && sed -i -e "1d" out/$y
-  #
-  ## handle blank lines
-  ${PYTHON3} -u ${top_dir}/format_xml.py $x out/${y}
-  #
-  ## convert from hex to decimal
-  sed -i -e 's,\&#x2122,\&#8482,g'  out/$y
-  sed -i -e 's,\&#xAE,\&#174,g'     out/$y
-  sed -i -e 's,\&#xB1,\&#177,g'     out/$y
-  #
-  # fix issues # TODO
-  ####[[ $y = mtb-bsp-manifest-fv2.xml ]] && sed -i -e 's,\&lt;div class="category",\&lt;div class=\&quot;category\&quot;,g'  out/$y
-  ####[[ $y = mtb-ce-manifest-fv2.xml ]] && unix2dos out/$y
-  ## diff the original and the generated file
-  lines=$(diff $x out/$y | wc -l)
-  if [[ ${lines} -ne 0 ]]; then
-    echo ""
-    echo "xmllint returned: ${rc}"
-    echo "FATAL ERROR: formatting error:"
-    ####diff --ignore-space-change $x out/$y || : # TODO
-    diff $x out/$y || :
+  if [[ ${rc} -ne 0 ]]; then
     g_failed=1
     echo ""
     echo "Manifest: ${manifest_file}"
@@ -393,7 +288,6 @@ function test_format()
     echo "passed format validation"
     echo ""
   fi
-  [[ ${rc} -ne 0 ]] && g_failed=1
   echo -e "####################"
 }
 
@@ -527,18 +421,17 @@ function test_rules()
 
 ## main
 
+## discard the lookups cached by previous runs (see: validate_assets.py --cache-dir)
+[[ ${f_refresh} -ne 0 ]] && rm -rf out/cache
+
 if [[ ${#manifest_files[@]} -eq 0 ]]; then
   # Process the 'super-manifest' file and detect all manifest files (and json files)
   ## prepend "ordering characters" ([1234],) so that "manifest_files" can be sorted;
   ##   need to process 'dependency' manifests last
   echo "[INFO] processing 'mtb-super-manifest' at: ${uri_super_manifest}"
-  url_insteadof=${URL_INSTEADOF:-}
-  if [[ -n ${url_insteadof} ]]; then
-    _src="${url_insteadof##*\.insteadOf }"
-    _dst="${url_insteadof%%\.insteadOf *}"
-    uri_super_manifest=$(echo ${uri_super_manifest} | sed -e "s,${_src},${_dst},")
-    printf "URL TRACE: ${uri_super_manifest}\n"
-  fi
+  rewrite_urls ${uri_super_manifest}
+  uri_super_manifest=${g_urls[0]}
+  trace_url ${uri_super_manifest}
   manifest_files+=("1,"${uri_super_manifest})
   rm -rf ${uri_super_manifest#https://github.com/}
   while read_xml; do
@@ -644,21 +537,21 @@ fi
 # order the manifest files; need to process 'dependency' manifests last
 manifest_files=($(for x in ${manifest_files[@]}; do echo $x; done | sort))
 
+# rewrite the URLs of all the manifest files at once
+rewrite_urls $(for x in ${manifest_files[@]}; do echo ${x#?,}; done)
+manifest_urls=(${g_urls[@]})
+
 # process the manifest file(s)
-url_insteadof=${URL_INSTEADOF:-}
-for x in ${manifest_files[@]}; do
+for i in ${!manifest_files[@]}; do
+  x=${manifest_files[$i]}
   ((++num_found))
   y=${x#?,}  # strip the ordering characters
   echo -e "\n\n### Process: ${y}"
   z=${y#https://github.com/}
   if [[ ! -e ${z} ]]; then
     mkdir -p ${z%/*}
-    if [[ -n ${url_insteadof} ]]; then
-      _src="${url_insteadof##*\.insteadOf }"
-      _dst="${url_insteadof%%\.insteadOf *}"
-      y=$(echo ${y} | sed -e "s,${_src},${_dst},")
-      printf "URL TRACE: ${y}\n"
-    fi
+    y=${manifest_urls[$i]}
+    trace_url ${y}
     set -x
     curl -s -S -L ${y} -o ${z}
     { ${restore_xtrace}; } 2>/dev/null
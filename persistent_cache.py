@@ -0,0 +1,108 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Name of the database file in the cache directory
+CACHE_FILE_NAME = "cache.sqlite"
+
+
+class PersistentCache(object):
+    """On-disk key/value cache (SQLite), shared by all the processes of a validation run
+    Values are stored as JSON; an entry expires after its time-to-live (seconds),
+    entries without a time-to-live never expire.
+    """
+
+    def __init__(self, cache_dir, refresh_time=0):
+        """Open (or create) the cache
+        :param cache_dir: directory of the database file
+        :param refresh_time: ignore the entries stored before this time (see: time.time()), 0 if none
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.path = os.path.join(self.cache_dir, CACHE_FILE_NAME)
+        self.refresh_time = refresh_time
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS cache ("
+                             " namespace TEXT NOT NULL,"
+                             " key TEXT NOT NULL,"
+                             " value TEXT NOT NULL,"
+                             " created REAL NOT NULL,"
+                             " expires REAL,"
+                             " PRIMARY KEY (namespace, key))")
+
+    def get(self, namespace, key):
+        """Look up an entry
+        :param namespace: kind of entry (e.g. "ref", "http")
+        :param key: key of the entry
+        :return the value, or None if the entry is missing, expired or refreshed
+        """
+        try:
+            with self._lock:
+                row = self._db.execute("SELECT value, created, expires FROM cache WHERE namespace = ? AND key = ?",
+                                       (namespace, key)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        value, created, expires = row
+        if created < self.refresh_time:
+            return None
+        if expires is not None and expires <= time.time():
+            return None
+        return json.loads(value)
+
+    def put(self, namespace, key, value, ttl=None):
+        """Store an entry
+        :param namespace: kind of entry (e.g. "ref", "http")
+        :param key: key of the entry
+        :param value: value of the entry (JSON serializable)
+        :param ttl: time-to-live in seconds, None if the entry never expires
+        """
+        now = time.time()
+        expires = None if ttl is None else now + ttl
+        try:
+            with self._lock:
+                self._db.execute("INSERT OR REPLACE INTO cache (namespace, key, value, created, expires)"
+                                 " VALUES (?, ?, ?, ?, ?)", (namespace, key, json.dumps(value), now, expires))
+        except sqlite3.Error as e:
+            # the cache is an optimization; never fail the validation because of it
+            print("[INFO] cannot update the cache '{}': {}".format(self.path, e))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
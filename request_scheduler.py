@@ -0,0 +1,229 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+import email.utils
+import random
+import threading
+import time
+from contextlib import contextmanager
+from metrics import METRICS
+
+# Upper bound (seconds) of a single throttling delay, whatever the server requests
+MAX_RETRY_DELAY = 15 * 60
+
+
+def throttle_delay(headers):
+    """Compute the delay requested by the "Retry-After" or rate-limit headers of a throttled response
+    :param headers: headers of the HTTP response (case-insensitive mapping)
+    :return delay in seconds, None if the response has no such header
+    """
+    delay = None
+    retry_after = (headers.get("Retry-After") or "").strip()
+    if retry_after.isdigit():
+        delay = int(retry_after)
+    elif retry_after:
+        try:
+            delay = email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time()
+        except (TypeError, ValueError):
+            pass
+    if delay is None and headers.get("X-RateLimit-Remaining") == "0":
+        try:
+            # GitHub: epoch time of the reset of the quota
+            delay = int(headers.get("X-RateLimit-Reset")) - time.time()
+        except (TypeError, ValueError):
+            pass
+    if delay is None and headers.get("RateLimit-Reset"):
+        try:
+            # IETF draft: seconds until the reset of the quota
+            delay = int(headers.get("RateLimit-Reset"))
+        except ValueError:
+            pass
+    if delay is None:
+        return None
+    return min(max(delay, 1), MAX_RETRY_DELAY)
+
+
+def retry_delay(retry):
+    """Compute the delay before retrying a throttled request, when the server does not specify it
+    :param retry: number of the retry (1, 2, ...)
+    :return delay in seconds
+    """
+    return retry * random.randint(60, 90)
+
+
+class SingleFlight(object):
+    """Coalescing of identical concurrent requests: while a request is in flight, the callers
+    of the same request (same key, e.g. a repository URL) wait for its result instead of sending it again
+    """
+
+    class Call(object):
+        __slots__ = ('done', 'result', 'error')
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key => Call in flight
+
+    def do(self, key, function, *args):
+        """Run a request, or wait for the identical request in flight
+        :param key: key of the request
+        :param function: function which sends the request
+        :param args: arguments of the function
+        :return (result of the function, True if the result is the one of a request in flight)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = SingleFlight.Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = function(*args)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+class RequestScheduler(object):
+    """Schedule the network requests of the concurrent lookups
+    - a token bucket caps the overall request rate,
+    - a throttled key (e.g. a host or a repository) is blocked until its retry time,
+      while the lookups of the other keys keep progressing: a worker which waits for
+      its retry time gives its slot to another worker (see: slot(), wait()).
+    """
+
+    def __init__(self, rate=0, burst=1):
+        """Configure the scheduler
+        :param rate: maximum number of requests per second, 0 if unlimited
+        :param burst: number of requests which can be sent at once
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._refill_time = time.monotonic()
+        self._blocked = {}  # key => time.monotonic() until which the key is throttled
+        self._lock = threading.Lock()
+        self._slots = None
+        self._thread = threading.local()
+        self.reset_statistics()
+
+    def reset_statistics(self):
+        """Reset the statistics of the run (see: summary())"""
+        self.throttle_count = 0
+        self.throttled_time = 0.0
+        self.rate_limited_time = 0.0
+
+    def set_slots(self, count):
+        """Set the number of workers which send requests at the same time"""
+        self._slots = threading.BoundedSemaphore(count)
+
+    @contextmanager
+    def slot(self):
+        """Run the body as one of the concurrent workers"""
+        if self._slots is None:
+            yield
+            return
+        self._slots.acquire()
+        self._thread.has_slot = True
+        try:
+            yield
+        finally:
+            self._thread.has_slot = False
+            self._slots.release()
+
+    def acquire(self, key=None):
+        """Wait until a request can be sent
+        :param key: key of the request (e.g. host), blocked while it is throttled
+        """
+        if key is not None:
+            with self._lock:
+                delay = self._blocked.get(key, 0) - time.monotonic()
+            if delay > 0:
+                with METRICS.operation("throttled-wait"):
+                    self._sleep(delay)
+                with self._lock:
+                    self.throttled_time += delay
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._refill_time) * self.rate)
+                self._refill_time = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+                self.rate_limited_time += delay
+            with METRICS.operation("rate-limit-wait"):
+                time.sleep(delay)
+
+    def wait(self, key, delay):
+        """Throttle a key, and wait for its retry time
+        :param key: key of the throttled request (e.g. host)
+        :param delay: delay in seconds (see: retry_delay())
+        """
+        with self._lock:
+            self._blocked[key] = max(self._blocked.get(key, 0), time.monotonic() + delay)
+            self.throttle_count += 1
+            self.throttled_time += delay
+        with METRICS.operation("retry-sleep"):
+            self._sleep(delay)
+
+    def _sleep(self, delay):
+        """Sleep, while another worker uses the slot of this worker"""
+        if getattr(self._thread, 'has_slot', False):
+            self._slots.release()
+            try:
+                time.sleep(delay)
+            finally:
+                self._slots.acquire()
+        else:
+            time.sleep(delay)
+
+    def summary(self):
+        """:return a line which summarizes the time spent throttled, None if the requests were never delayed"""
+        if not self.throttle_count and self.rate_limited_time < 1:
+            return None
+        return "[INFO] throttled {} time(s), {:.0f} seconds spent throttled, {:.0f} seconds spent rate-limited".format(
+            self.throttle_count, self.throttled_time, self.rate_limited_time)
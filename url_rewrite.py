@@ -0,0 +1,144 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from urllib.parse import unquote, urlsplit
+
+# Environment variables of the rewrite rules:
+# - URL_INSTEADOF: one or more "<new>.insteadOf <old>" rules, separated by whitespace (or newlines)
+# - URL_REWRITE_FILE: git-config file of '[url "<new>"] insteadOf = <old>' rules
+URL_INSTEADOF_VARIABLE = "URL_INSTEADOF"
+URL_REWRITE_FILE_VARIABLE = "URL_REWRITE_FILE"
+
+INSTEADOF_SUFFIX = ".insteadOf"
+
+
+def parse_insteadof(text):
+    """Parse "<new>.insteadOf <old>" rules
+    :param text: rules, separated by whitespace
+    :return list of (old prefix, new prefix)
+    """
+    rules = []
+    tokens = text.split()
+    for i, token in enumerate(tokens):
+        if token.endswith(INSTEADOF_SUFFIX) and i + 1 < len(tokens):
+            rules.append((tokens[i + 1], token[:-len(INSTEADOF_SUFFIX)]))
+    return rules
+
+
+def load_rewrite_file(path):
+    """Load the '[url "<new>"] insteadOf = <old>' rules of a git-config file
+    :param path: path to the file (read with "git config", with the git semantics)
+    :return list of (old prefix, new prefix)
+    """
+    output = subprocess.run(['git', 'config', '--file', path, '--get-regexp', r'^url\..*\.insteadof$'],
+                            capture_output=True, text=True)
+    if output.returncode not in (0, 1):  # 1: no rule
+        raise ValueError("cannot read the URL rewrite rules of '{}': {}".format(path, output.stderr.strip()))
+    rules = []
+    for line in output.stdout.splitlines():
+        key, _, old = line.partition(' ')
+        rules.append((old, key[len('url.'):-len(INSTEADOF_SUFFIX)]))
+    return rules
+
+
+class UrlRewriter(object):
+    """Table of URL rewrite rules, with the semantics of git "url.<new>.insteadOf <old>":
+    a URL which starts with <old> is rewritten to start with <new>; when several rules match,
+    the longest <old> prefix wins. The prefixes are compared literally (not as regular expressions).
+    A <new> prefix can be a local directory (e.g. the root of a mirror of the repositories): it is
+    rewritten to a "file://" URL.
+    """
+
+    def __init__(self, rules=()):
+        """Compile the rules
+        :param rules: list of (old prefix, new prefix)
+        """
+        self.rules = {}
+        for old, new in rules:
+            if os.path.isabs(new):
+                new = "file://" + new
+            self.rules[old] = new
+        # longest prefixes first
+        self._prefixes = sorted(self.rules, key=len, reverse=True)
+        self._lengths = sorted(set(len(old) for old in self.rules), reverse=True)
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def rewrite(self, url):
+        """:return the rewritten URL (the URL itself if no rule matches)"""
+        for length in self._lengths:
+            new = self.rules.get(url[:length])
+            if new is not None:
+                return new + url[length:]
+        return url
+
+    @classmethod
+    def from_environment(cls, rewrite_file=None):
+        """Compile the rules of the URL_INSTEADOF and URL_REWRITE_FILE environment variables
+        :param rewrite_file: git-config file of rules, instead of the URL_REWRITE_FILE variable
+        """
+        rules = parse_insteadof(os.environ.get(URL_INSTEADOF_VARIABLE, ""))
+        rewrite_file = rewrite_file or os.environ.get(URL_REWRITE_FILE_VARIABLE, "")
+        if rewrite_file:
+            rules += load_rewrite_file(rewrite_file)
+        return cls(rules)
+
+
+def local_path(url):
+    """:return the local path of a "file://" URL, None for other URLs"""
+    if not url.startswith("file://"):
+        return None
+    return unquote(urlsplit(url).path)
+
+
+def main():
+    argParser = argparse.ArgumentParser(
+        description="Rewrite URLs with the rules of the {} and {} environment variables".format(
+            URL_INSTEADOF_VARIABLE, URL_REWRITE_FILE_VARIABLE))
+    argParser.add_argument("--rewrite-file", help="git-config file of '[url \"<new>\"] insteadOf = <old>' rules")
+    argParser.add_argument("urls", nargs="+", metavar="url", help="URL to rewrite")
+    args = argParser.parse_args()
+
+    try:
+        rewriter = UrlRewriter.from_environment(args.rewrite_file)
+    except ValueError as e:
+        print("FATAL ERROR: {}".format(e), file=sys.stderr)
+        sys.exit(1)
+    for url in args.urls:
+        print(rewriter.rewrite(url))
+
+
+if __name__ == '__main__':
+    main()
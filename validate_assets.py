@@ -29,17 +29,30 @@
 """
 
 import argparse
+import copy
+import hashlib
+import io
 import os
-import random
 import re
 import requests
-import shutil
-import stat
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from lxml import etree
+from manifest_file import ManifestFile
+from memory_cache import LruCache
+from metrics import METRICS
+from mirror_store import MirrorStore, remove_tree
+from persistent_cache import PersistentCache
+from request_scheduler import RequestScheduler, SingleFlight, retry_delay, throttle_delay
+from requests.adapters import HTTPAdapter
+from url_rewrite import URL_REWRITE_FILE_VARIABLE, UrlRewriter, local_path
+from urllib.parse import urlsplit
 
 # Compile regular expression for git repository URI
 # (https://github.com/Infineon)/(mtb-example-btsdk-empty)
@@ -62,78 +75,498 @@ RE_GIT_RAW_URI = re.compile(r'^((.*)/([^/]+)/([^/]+))/raw/([^/]+)/(.+)$')
 # Key: ID, value: URI
 ASSET_CACHE = {}
 
-# This database holds a cache of HTTP GET requests
-# Key: HTTP URL, value: server response
-HTTP_CACHE = {}
+# The ASSET_CACHE is saved in this file, for the processing of subsequent "dependency" manifests
+ASSET_CACHE_FILE = "out/asset_cache.txt"
+
+# The in-memory lookup caches share a memory budget (see: --cache-memory), split by these shares;
+# the least-recently-used entries are evicted (see: LruCache)
+DEFAULT_CACHE_MEMORY = 256  # MiB
+CACHE_MEMORY_SHARES = {"LS_REMOTE_CACHE": 0.75, "HTTP_CACHE": 0.1, "BARE_REPO_CACHE": 0.1, "NEGATIVE_CACHE": 0.05}
+
+# This database holds a cache of HTTP lookups
+# Key: HTTP URL, value: HttpStatus (final URL, status code, timestamp)
+HTTP_CACHE = LruCache(int(DEFAULT_CACHE_MEMORY * 1024 * 1024 * CACHE_MEMORY_SHARES["HTTP_CACHE"]))
+
+# This database holds the results of URLs checked ahead of time by prefetch_urls()
+# Key: HTTP URL, value: (result of http_check(), captured log output)
+HTTP_CHECK_RESULTS = {}
+
+# The HTTP session (connection pool) of the HTTP lookups, see: http_session()
+HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+# Timeout (seconds) of the HTTP requests: (connect, read)
+HTTP_TIMEOUT = (30, 60)
 
 # This database holds a cache of "git ls-remote" lookups
-# Key: git remote URL, value: output of "git ls-remote <URL>" command
-LS_REMOTE_CACHE = {}
+# Key: git remote URL, value: RefIndex of the output of "git ls-remote <URL>" command
+LS_REMOTE_CACHE = LruCache(int(DEFAULT_CACHE_MEMORY * 1024 * 1024 * CACHE_MEMORY_SHARES["LS_REMOTE_CACHE"]))
 
 # This database holds a cache of "bare repo" lookups
 # Key: git remote URL + "_" + git_ref, value: git_ref
-BARE_REPO_CACHE = {}
+BARE_REPO_CACHE = LruCache(int(DEFAULT_CACHE_MEMORY * 1024 * 1024 * CACHE_MEMORY_SHARES["BARE_REPO_CACHE"]))
+
+# This database holds a short-lived cache of the failed lookups, so that a broken repository or URL
+# is not looked up again for each of its references (see: negative_lookup())
+# Key: ("ls-remote", git URL): unreachable repository, value: (expiry time, error message)
+#      ("ref", git remote URL, git_ref): reference neither advertised nor in the bare repo, value: (expiry time, True)
+#      ("http", HTTP URL): inaccessible URL, value: (expiry time, HttpStatus)
+NEGATIVE_CACHE = LruCache(int(DEFAULT_CACHE_MEMORY * 1024 * 1024 * CACHE_MEMORY_SHARES["NEGATIVE_CACHE"]))
+TTL_NEGATIVE = 5 * 60
+
+# The identical lookups (same git or HTTP URL) which run at the same time are sent once (see: SingleFlight)
+IN_FLIGHT = SingleFlight()
+
+METRICS.register_cache("HTTP_CACHE", HTTP_CACHE)
+METRICS.register_cache("LS_REMOTE_CACHE", LS_REMOTE_CACHE)
+METRICS.register_cache("BARE_REPO_CACHE", BARE_REPO_CACHE)
+METRICS.register_cache("NEGATIVE_CACHE", NEGATIVE_CACHE)
+
+# This database persists the "git ls-remote", "bare repo" and HTTP lookups across
+# validate_assets.py invocations (see: --cache-dir, --refresh)
+# Namespace "ref": key: git remote URL + " " + git_ref, value: result of resolve_reference()
+# Namespace "http": key: HTTP URL, value: HTTP status code
+# Namespace "manifest": see: MEMO_VERSION
+PERSISTENT_CACHE = None
+DEFAULT_CACHE_DIR = "out/cache"
+
+# Time-to-live (seconds) of the PERSISTENT_CACHE entries;
+# commits (found in the bare repo) are immutable and never expire
+TTL_BRANCH = 60 * 60
+TTL_TAG = 7 * 24 * 60 * 60
+TTL_HTTP = 60 * 60
+# the unchanged manifests which reference branches or tags are revalidated periodically (see: --revalidate-after)
+DEFAULT_REVALIDATE_AFTER = 24  # hours
+TTL_MEMO = DEFAULT_REVALIDATE_AFTER * 60 * 60
+
+# The successful asset validations of the manifest files are memoized in the PERSISTENT_CACHE:
+# an unchanged manifest file skips the asset validation, and a changed one only looks up
+# the references which are not in the "ref" namespace (i.e. its new or modified <version> blocks)
+# Namespace "manifest": key: MEMO_VERSION + manifest type + content hash (see: manifest_memo_key()),
+# value: {"assets": ASSET_CACHE entries of the manifest, "verified": time of the validation}
+MEMO_VERSION = 1
+
+# This store keeps the bare mirrors of the repositories across validate_assets.py invocations,
+# and updates them incrementally (see: --mirror-dir, --mirror-max-size, --blobless);
+# None: each "bare repo" lookup clones the repository to a temporary directory
+MIRROR_STORE = None
+DEFAULT_MIRROR_DIR = "out/mirrors"
+DEFAULT_MIRROR_MAX_SIZE = 4096  # MiB
+
+# Table of the "insteadOf" rules applied to the HTTP URLs and to the git repository URLs,
+# e.g. to redirect a namespace to an on-premises mirror (see: url_rewrite.py, --url-rewrite)
+URL_REWRITER = UrlRewriter.from_environment()
+
+# Git revision of the diff-aware validation (see: --since): only the entries added or changed since
+# this revision are looked up; None: all the entries are looked up
+SINCE_REV = None
+
+# Shard of the lookups, when the validation is partitioned across nodes (see: --shard K/N of
+# mtb_manifest_checker.py): (K, N), only the entries of the repositories of shard K are looked up; None: all
+SHARD = None
+
+# Validate all the entries of a manifest, instead of stopping at the first failure (see: --keep-going)
+KEEP_GOING = False
+
+# Failures of the run, for the summary of the --keep-going mode (see: report_failure(), print_failures())
+# Each failure: {"manifest": path, "line": line number, "asset": asset id, "ref": git ref or URL, "error": message}
+FAILURES = []
+
+# Elements of the manifest entries: root element => (entry element, URI element)
+ENTRY_ELEMENTS = {
+    "boards": ('board', 'board_uri'),
+    "apps": ('app', 'uri'),
+    "middleware": ('middleware', 'uri'),
+}
+
+# Compile regular expression for a (full or abbreviated) commit hash
+RE_COMMIT_HASH = re.compile(r'^[0-9a-f]{7,40}$')
+
+# This database holds the results of references resolved ahead of time by prefetch_references()
+# Key: (git remote URL, git_ref), value: (result of git_reference_check(), captured log output)
+REF_CHECK_RESULTS = {}
+
+# Number of concurrent workers used to resolve git references (see: --jobs)
+DEFAULT_JOBS = 8
+JOBS = DEFAULT_JOBS
+
+# Scheduler of the network requests: overall request rate (see: --rate), and throttling
+# of the hosts/repositories which respond with 403/429, without stalling the other lookups
+SCHEDULER = RequestScheduler()
+DEFAULT_RATE = 20  # requests per second
+# Workers started per slot (see: --jobs), so that the throttled workers can be replaced
+WORKERS_PER_SLOT = 4
+
+# Per-thread log buffer; set while a worker thread resolves references
+_LOG = threading.local()
+
+
+def log(*args, **kwargs):
+    """print() which is captured per worker thread while references are prefetched,
+    so that the log output can be replayed in manifest order
+    """
+    buffer = getattr(_LOG, 'buffer', None)
+    if buffer is None:
+        print(*args, **kwargs)
+    else:
+        print(*args, file=buffer, **kwargs)
+
 
-def exec(*cmdline):
+def run_captured(function, *args):
+    """Run a function in a worker thread, capturing its log() output
+    :param function: function to run
+    :param args: arguments of the function
+    :return (result of the function, captured log output)
+    """
+    _LOG.buffer = io.StringIO()
+    try:
+        result = function(*args)
+    finally:
+        log_output = _LOG.buffer.getvalue()
+        _LOG.buffer = None
+    return result, log_output
+
+
+def exec(*cmdline, cwd=None):
     """Execute command line, parse stdout, suppress stderr
     :param cmdline: command line array (command + arguments)
+    :param cwd: working directory of the process (default: current directory)
     :return: the contents of the stdout of a process
     """
-    print(" ".join(cmdline))
-    return subprocess.check_output(list(cmdline)).decode('utf-8')
+    log(" ".join(cmdline))
+    return subprocess.check_output(list(cmdline), cwd=cwd).decode('utf-8')
+
+
+def rewrite_url(url):
+    """Apply the URL_REWRITER rules to a URL (see: url_rewrite.py)
+    :param url: URL
+    :return the rewritten URL
+    """
+    url = url.rstrip()
+    if URL_REWRITER:
+        url = URL_REWRITER.rewrite(url)
+        log("URL TRACE: {}".format(url))
+    return url
+
+
+def git_url(git_repo):
+    """:return the URL of the git commands on a repository (see: URL_REWRITER)"""
+    return URL_REWRITER.rewrite(git_repo)
+
+
+class HttpStatus(namedtuple('HttpStatus', ['url', 'status_code', 'timestamp', 'retry_after'], defaults=(None,))):
+    """Result of an HTTP lookup: final URL (after the redirects), status code, time of the lookup,
+    and delay requested by the server (throttled responses)"""
+    __slots__ = ()
+
+    def sizeof(self):
+        """:return the estimated memory footprint (bytes) of the status (see: LruCache)"""
+        return sys.getsizeof(self) + sys.getsizeof(self.url)
+
+    @property
+    def ok(self):
+        # Accept HTTP codes < 400: 200, 301 or 302 redirects
+        return self.status_code < 400
+
+
+def negative_lookup(key):
+    """Look up a failed lookup in the NEGATIVE_CACHE
+    :param key: key of the lookup
+    :return the value of the failure, or None if the lookup has not failed recently
+    """
+    entry = NEGATIVE_CACHE.get(key)
+    hit = entry is not None and entry[0] > time.monotonic()
+    METRICS.cache("NEGATIVE_CACHE", hit)
+    return entry[1] if hit else None
+
+
+def negative_store(key, value=True):
+    """Remember a failed lookup for TTL_NEGATIVE seconds
+    :param key: key of the lookup
+    :param value: value of the failure (e.g. error message)
+    """
+    NEGATIVE_CACHE[key] = (time.monotonic() + TTL_NEGATIVE, value)
+
+
+def http_session():
+    """:return the HTTP session (keep-alive connection pool) shared by the HTTP lookups"""
+    global HTTP_SESSION
+
+    with _HTTP_SESSION_LOCK:
+        if HTTP_SESSION is None:
+            adapter = HTTPAdapter(pool_connections=max(JOBS, 10), pool_maxsize=max(JOBS, 10))
+            HTTP_SESSION = requests.Session()
+            HTTP_SESSION.mount("http://", adapter)
+            HTTP_SESSION.mount("https://", adapter)
+    return HTTP_SESSION
+
+
+def http_request(url):
+    """Look up the status of a URL without downloading its contents
+    A HEAD request is sent first; if it is not successful (e.g. the server does not support it),
+    a streamed GET request is sent, and closed once the headers are received.
+    :param url: HTTP URL
+    :return HttpStatus
+    """
+    path = local_path(url)
+    if path is not None:
+        # a local mirror of the files
+        return HttpStatus(url, 200 if os.path.isfile(path) else 404, time.time())
+    session = http_session()
+    with METRICS.operation("http"):
+        response = session.head(url, allow_redirects=True, timeout=HTTP_TIMEOUT)
+    if not response.ok and response.status_code != 429:
+        with METRICS.operation("http"), \
+                session.get(url, allow_redirects=True, stream=True, timeout=HTTP_TIMEOUT) as response:
+            pass
+    retry_after = throttle_delay(response.headers) if response.status_code in (403, 429) else None
+    return HttpStatus(response.url, response.status_code, time.time(), retry_after)
+
+
+def scheduled_http_request(host, url):
+    """http_request(), once the SCHEDULER allows a request to the host"""
+    SCHEDULER.acquire(host)
+    return http_request(url)
 
 
 def http_check(url):
     """Check URL points to valid HTTP location
+         - use the result of prefetch_urls(), if available
+         - otherwise, look up the URL now
     :param url: HTTP URL
     :return True if the URL points to valid web resource, False otherwise
-    For optimization purposes, the HTTP requests are cached in HTTP_CACHE
+    """
+    global HTTP_CHECK_RESULTS
+
+    result = HTTP_CHECK_RESULTS.pop(url, None)
+    if result is not None:
+        ok, log_output = result
+        print(log_output, end='')
+        return ok
+
+    return resolve_url(url)
+
+
+def resolve_url(url):
+    """Check URL points to valid HTTP location
+    :param url: HTTP URL
+    :return True if the URL points to valid web resource, False otherwise
+    For optimization purposes, the HTTP lookups are cached in HTTP_CACHE
     """
     global HTTP_CACHE
 
-    url_insteadof = os.environ.get('URL_INSTEADOF', "")
-    if url_insteadof:
-        _src = re.sub(r'^.*\.insteadOf ', '', url_insteadof.rstrip())
-        _dst = re.sub(r'\.insteadOf .*$', '', url_insteadof.rstrip())
-        url = re.sub(_src, _dst, url.rstrip())
-        print("URL TRACE: {}".format(url))
+    url = rewrite_url(url)
+
+    # a single get(): an entry may be evicted between a membership test and a get()
+    status = HTTP_CACHE.get(url)
+    METRICS.cache("HTTP_CACHE", status is not None)
+    if status is not None:
+        log("[INFO] [{}]: '{}' is accessible [cached] ".format(status.status_code, url))
+        return status.ok
+
+    if PERSISTENT_CACHE is not None:
+        status = PERSISTENT_CACHE.get("http", url)
+        METRICS.cache("PERSISTENT_CACHE", status is not None)
+        if status is not None:
+            status = HttpStatus(*status)
+            log("[INFO] [{}]: '{}' is accessible [cached] ".format(status.status_code, url))
+            HTTP_CACHE[url] = status
+            return True
+
+    status = negative_lookup(("http", url))
+    if status is not None:
+        log("[INFO] [{}]: '{}' is not accessible [cached]".format(status.status_code, url))
+        return False
 
+    host = urlsplit(url).netloc
     retry_msg = ""
+    retry_after = None
     for retry in range(0,6):
         if retry_msg:
-            retry_time = retry * random.randint(60, 90)
-            print("{} R E T R Y  in {} seconds".format(retry_msg, retry_time))
-            time.sleep(retry_time)
+            retry_time = retry_after or retry_delay(retry)
+            log("{} R E T R Y  in {} seconds".format(retry_msg, retry_time))
+            SCHEDULER.wait(host, retry_time)
             retry_msg = ""
 
-        if not url in HTTP_CACHE:
-            try:
-                response = requests.get(url, allow_redirects=True)
-            except Exception as e:
-                print("FATAL ERROR: http-check() exception is: {}".format(e))
-                return False
-        else:
-            response = HTTP_CACHE.get(url)
-            print("[INFO] [{}]: '{}' is accessible [cached] ".format(response.status_code, url))
-            return response.ok
+        status = HTTP_CACHE.get(url)
+        if status is not None:
+            # looked up by another thread while this one was throttled
+            log("[INFO] [{}]: '{}' is accessible [cached] ".format(status.status_code, url))
+            return status.ok
+        try:
+            status, coalesced = IN_FLIGHT.do(("http", url), scheduled_http_request, host, url)
+            METRICS.cache("IN_FLIGHT", coalesced)
+        except Exception as e:
+            log("FATAL ERROR: http-check() exception is: {}".format(e))
+            return False
 
-        # Accept HTTP codes < 400: 200, 301 or 302 redirects
-        if not response.ok:
-            if response.status_code == 429 or response.status_code == 403:
-                retry_msg = "[INFO] http response status: {} - ".format(response.status_code)
+        if not status.ok:
+            if status.status_code == 429 or status.status_code == 403:
+                retry_msg = "[INFO] http response status: {} - ".format(status.status_code)
+                retry_after = status.retry_after
                 continue
             else:
-                print("[INFO] [{}]: '{}' is not accessible".format(response.status_code, url))
+                log("[INFO] [{}]: '{}' is not accessible".format(status.status_code, url))
+                negative_store(("http", url), status)
                 break
         else:
-            print("[INFO] [{}]: '{}' is accessible".format(response.status_code, url))
-            HTTP_CACHE[url] = response
+            log("[INFO] [{}]: '{}' is accessible".format(status.status_code, url))
+            HTTP_CACHE[url] = status
+            if PERSISTENT_CACHE is not None:
+                PERSISTENT_CACHE.put("http", url, list(status), ttl=TTL_HTTP)
             break
 
-    return response.ok
+    return status.ok
+
+
+def prefetch_urls(urls):
+    """Check URLs concurrently, ahead of the (serial) manifest checks
+    http_check() replays the results (and their log output) in manifest order.
+    :param urls: list of HTTP URLs, in manifest order
+    """
+
+    global HTTP_CHECK_RESULTS
+
+    if JOBS <= 1:
+        return
+
+    def prefetch_url(url):
+        with SCHEDULER.slot():
+            _LOG.buffer = io.StringIO()
+            try:
+                ok = resolve_url(url)
+            except Exception:
+                # leave it to the serial check to report the failure
+                return
+            finally:
+                log_output = _LOG.buffer.getvalue()
+                _LOG.buffer = None
+        HTTP_CHECK_RESULTS[url] = (ok, log_output)
+
+    # a URL is checked once; its later occurrences are "[cached]" lookups
+    pending = []
+    for url in urls:
+        if url not in pending and url not in HTTP_CHECK_RESULTS:
+            pending.append(url)
+
+    with ThreadPoolExecutor(max_workers=JOBS * WORKERS_PER_SLOT) as executor:
+        for url in pending:
+            executor.submit(prefetch_url, url)
+
+
+def sha_key(sha):
+    """:return the compact (binary) form of a full (SHA-1 or SHA-256) object hash, None if sha is not a full hash"""
+    if len(sha) not in (40, 64) or sha != sha.lower():
+        return None
+    try:
+        return bytes.fromhex(sha)
+    except ValueError:
+        return None
+
+
+class RefIndex(object):
+    """Index of the "git ls-remote" output of a repository
+    The output is parsed once; the references are then looked up in constant time,
+    and compared literally (not as regular expressions).
+    The entries are compact: the hashes are kept in binary form, each name is stored once (without
+    its "refs/heads/" or "refs/tags/" prefix), and the names are interned, so that the names shared
+    by many repositories (e.g. "master", "release-v1.0.0") are stored once per run.
+    """
+
+    __slots__ = ('heads', 'tags', 'peeled', 'refs', 'shas', 'size')
+
+    def __init__(self, ls_remote_stdout):
+        """Parse the "git ls-remote" output
+        :param ls_remote_stdout: lines of "<hash>\t<ref name>"
+        """
+        self.heads = {}   # branch name => commit hash
+        self.tags = {}    # tag name => object hash
+        self.peeled = {}  # annotated tag name => commit hash (the "^{}" entries)
+        self.refs = {}    # other ref names (e.g. HEAD, refs/pull/1/head) => object hash
+        self.shas = {}    # advertised object hash => first ref name, without its prefix (see: ref_name())
+        size = 0
+        for line in ls_remote_stdout.splitlines():
+            sha, _, name = line.partition('\t')
+            key = sha_key(sha)
+            if not name or key is None:
+                continue
+            if name.startswith('refs/heads/'):
+                names, short_name = self.heads, name[len('refs/heads/'):]
+            elif name.startswith('refs/tags/') and name.endswith('^{}'):
+                names, short_name = self.peeled, name[len('refs/tags/'):-len('^{}')]
+            elif name.startswith('refs/tags/'):
+                names, short_name = self.tags, name[len('refs/tags/'):]
+            else:
+                names, short_name = self.refs, name
+            short_name = sys.intern(short_name)
+            names[short_name] = key
+            size += sys.getsizeof(short_name)
+            if key not in self.shas:
+                self.shas[key] = short_name
+                size += sys.getsizeof(key)
+        self.size = size + sum(sys.getsizeof(names) for names in (self.heads, self.tags, self.peeled, self.refs, self.shas))
+
+    def sizeof(self):
+        """:return the estimated memory footprint (bytes) of the index (see: LruCache)"""
+        return self.size
+
+    def ref_name(self, key):
+        """:return the first ref name of an advertised object hash (in binary form), in the "git ls-remote" order"""
+        name = self.shas[key]
+        # e.g. HEAD < refs/heads/* < refs/pull/* < refs/tags/*
+        other_refs = ('', '', self.refs)
+        candidates = [('refs/heads/', '', self.heads), ('refs/tags/', '', self.tags), ('refs/tags/', '^{}', self.peeled)]
+        candidates.insert(1 if name.startswith('refs/') else 0, other_refs)
+        for prefix, suffix, names in candidates:
+            if names.get(name) == key:
+                return prefix + name + suffix
+        return name
+
+    def lookup(self, git_ref):
+        """Look up a reference
+        :param git_ref: git object reference (tag, branch, ref name, advertised commit)
+        :return the "git ls-remote" line of the reference, or None if it is not advertised
+        """
+        # as in the (sorted) "git ls-remote" output, a tag takes precedence over a branch
+        for prefix, names in (('refs/tags/', self.tags), ('refs/heads/', self.heads)):
+            for name in (git_ref, git_ref[len(prefix):] if git_ref.startswith(prefix) else None):
+                if name in names:
+                    return "{}\t{}{}".format(names[name].hex(), prefix, name)
+        if git_ref in self.refs:
+            return "{}\t{}".format(self.refs[git_ref].hex(), git_ref)
+        if git_ref.startswith('refs/tags/') and git_ref.endswith('^{}'):
+            name = git_ref[len('refs/tags/'):-len('^{}')]
+            if name in self.peeled:
+                return "{}\t{}".format(self.peeled[name].hex(), git_ref)
+        key = sha_key(git_ref)
+        if key in self.shas:
+            return "{}\t{}".format(git_ref, self.ref_name(key))
+        return None
 
 
 def git_reference_check(git_repo, git_ref):
+    """Check if git_ref exists in the git_repo
+         - use the result of prefetch_references(), if available
+         - otherwise, resolve the reference now
+    :param git_repo: git repository URL
+    :param git_ref: git object reference (tag, branch, commit)
+    :return lines from git ls-remote output that match the git_ref pattern, or
+       the line from 'git_bare_repo_check()'
+    """
+
+    global REF_CHECK_RESULTS
+
+    result = REF_CHECK_RESULTS.pop((git_repo, git_ref), None)
+    if result is None:
+        return resolve_reference(git_repo, git_ref)
+
+    # replay the log output of the worker thread
+    output, log_output = result
+    print(log_output, end='')
+    return output
+
+
+def resolve_reference(git_repo, git_ref):
     """Check if git_ref exists in the git_repo
          - first try "git ls-remote"
          - if not successful, try "git_bare_repo_check()"
@@ -146,82 +579,132 @@ def git_reference_check(git_repo, git_ref):
 
     global LS_REMOTE_CACHE
 
+    if PERSISTENT_CACHE is not None:
+        output = PERSISTENT_CACHE.get("ref", "{} {}".format(git_repo, git_ref))
+        METRICS.cache("PERSISTENT_CACHE", output is not None)
+        if output is not None:
+            log("++ git reference {} {} [cached]".format(git_repo, git_ref))
+            log(output.rstrip())
+            return output
+
+    if negative_lookup(("ref", git_repo, git_ref)) is not None:
+        log("++ git reference {} {} [cached]".format(git_repo, git_ref))
+        log("FATAL ERROR: cannot find '{}' in bare repo [cached]".format(git_ref))
+        return False
+
     retry_msg = ""
     for retry in range(0,6):
         if retry_msg:
-            retry_time = retry * random.randint(60, 90)
-            print("{} R E T R Y  in {} seconds".format(retry_msg, retry_time))
-            time.sleep(retry_time)
+            retry_time = retry_delay(retry)
+            log("{} R E T R Y  in {} seconds".format(retry_msg, retry_time))
+            SCHEDULER.wait(git_repo, retry_time)
             retry_msg = ""
 
-        # perform a "git ls-remote" command
-        git_ls_remote_output = None
-        if not git_repo in LS_REMOTE_CACHE:
-            print("++ git ls-remote {}".format(git_repo))
+        # perform a "git ls-remote" command; its output is indexed once per repository
+        ref_index = LS_REMOTE_CACHE.get(git_repo)
+        METRICS.cache("LS_REMOTE_CACHE", ref_index is not None)
+        if ref_index is not None:
+            log("++ git ls-remote {} [cached]".format(git_repo))
+        else:
+            url = git_url(git_repo)
+            error = negative_lookup(("ls-remote", url))
+            if error is not None:
+                log("++ git ls-remote {} [cached]".format(url))
+                log("FATAL ERROR: cannot access '{}' [cached]: {}".format(url, error))
+                return False
+            log("++ git ls-remote {}".format(url))
+            git_ls_remote_output = None
             try:
-                git_ls_remote_output = subprocess.run(['git', 'ls-remote', git_repo], capture_output=True, text=True)
+                git_ls_remote_output, coalesced = IN_FLIGHT.do(("ls-remote", url), list_remote, git_repo, url)
+                METRICS.cache("IN_FLIGHT", coalesced)
             except Exception as e:
-                print("FATAL ERROR: exception is: {}".format(e))
-        else:
-            print("++ git ls-remote {} [cached]".format(git_repo))
-            git_ls_remote_output = LS_REMOTE_CACHE.get(git_repo)
-
-        # retry on failure
-        if git_ls_remote_output is None:
-            retry_msg = "[INFO] unknown failure -"
-            continue  # attempt retry
+                log("FATAL ERROR: exception is: {}".format(e))
 
-        # process the stderr of the "git ls-remote" command
-        if git_ls_remote_output.returncode != 0:
-            if git_ls_remote_output.stderr:
-                print(git_ls_remote_output.stderr)
-            for line in git_ls_remote_output.stderr.splitlines():
-                m = re.match(r'^.*{}$'.format("The requested URL returned error: 403"), line)
-                if m:
-                    # matched 'fatal: unable to access 'https://XXXX': The requested URL returned error: 403'
-                    retry_msg = "[INFO] received '403' response -"
-            if retry_msg:
+            # retry on failure
+            if git_ls_remote_output is None:
+                retry_msg = "[INFO] unknown failure -"
                 continue  # attempt retry
 
-        # process the stdout of the "git ls-remote" command
-        output = None
-        if git_ls_remote_output.returncode == 0:
+            # process the stderr of the "git ls-remote" command
             if git_ls_remote_output.stderr:
-                print(git_ls_remote_output.stderr)
-            for line in git_ls_remote_output.stdout.splitlines():
-                m = re.match(r'^.*{}$'.format(git_ref), line) # match 'git_ref' at end of line
-                if m:
-                    m1 = re.match(r'^[0-9a-f]*\trefs/heads/{}$'.format(git_ref), line)
-                    if m1:
-                        # matched "refs/heads"
-                        output = line
-                    m2 = re.match(r'^[0-9a-f]*\trefs/tags/{}$'.format(git_ref), line)
-                    if m2:
-                        # matched "refs/tags"
-                        output = line
-                    m3 = re.match(r'^[0-9a-f]*\t{}$'.format(git_ref), line)
-                    if m3:
-                        # matched a commit hash
-                        output = line
-            if output is not None:
-                if not git_repo in LS_REMOTE_CACHE:
-                    LS_REMOTE_CACHE[git_repo] = git_ls_remote_output
-                # dump output to stdout
-                print(output)
-                return output
+                log(git_ls_remote_output.stderr)
+            if git_ls_remote_output.returncode != 0:
+                for line in git_ls_remote_output.stderr.splitlines():
+                    if line.endswith("The requested URL returned error: 403"):
+                        # matched 'fatal: unable to access 'https://XXXX': The requested URL returned error: 403'
+                        retry_msg = "[INFO] received '403' response -"
+                if retry_msg:
+                    continue  # attempt retry
+                lines = git_ls_remote_output.stderr.strip().splitlines()
+                negative_store(("ls-remote", url), lines[0] if lines else "exit status {}".format(
+                    git_ls_remote_output.returncode))
+                break  # do not retry
+
+            # index the stdout of the "git ls-remote" command
+            ref_index = LS_REMOTE_CACHE.get(git_repo) if coalesced else None
+            if ref_index is None:
+                ref_index = RefIndex(git_ls_remote_output.stdout)
+                LS_REMOTE_CACHE[git_repo] = ref_index
+
+        output = ref_index.lookup(git_ref)
+        if output is not None:
+            persist_reference(git_repo, git_ref, output, reference_ttl(git_ref, output))
+            # dump output to stdout
+            log(output)
+            return output
 
         break  # do not retry
 
     # if not found, perform a check in the bare repo
     output = git_bare_repo_check(git_repo, git_ref)
     if not output:
+        negative_store(("ref", git_repo, git_ref))
         return False
+    persist_reference(git_repo, git_ref, output, reference_ttl(git_ref, output))
 
     # dump output to stdout
-    print(output.rstrip())
+    log(output.rstrip())
     return output
 
 
+def list_remote(git_repo, url):
+    """Run "git ls-remote", once the SCHEDULER allows a request to the repository
+    :param git_repo: git repository URL
+    :param url: URL of the repository, after the rewrite rules (see: git_url())
+    :return CompletedProcess of the command
+    """
+    SCHEDULER.acquire(git_repo)
+    with METRICS.operation("ls-remote"):
+        return subprocess.run(['git', 'ls-remote', url], capture_output=True, text=True)
+
+
+def reference_ttl(git_ref, output):
+    """Time-to-live of a resolved reference in the PERSISTENT_CACHE
+    :param git_ref: git object reference (tag, branch, commit)
+    :param output: result of resolve_reference()
+    :return time-to-live in seconds, None if the reference is an (immutable) commit
+    """
+    if re.match(RE_COMMIT_HASH, git_ref) and not "\trefs/" in output:
+        return None
+    if output.startswith(git_ref + "\t"):
+        # an advertised commit
+        return None
+    if "\trefs/tags/" in output:
+        return TTL_TAG
+    return TTL_BRANCH
+
+
+def persist_reference(git_repo, git_ref, output, ttl):
+    """Save a resolved reference in the PERSISTENT_CACHE
+    :param git_repo: git repository URL
+    :param git_ref: git object reference (tag, branch, commit)
+    :param output: result of resolve_reference()
+    :param ttl: time-to-live in seconds, None if the reference is immutable
+    """
+    if PERSISTENT_CACHE is not None:
+        PERSISTENT_CACHE.put("ref", "{} {}".format(git_repo, git_ref), output.replace(" [cached]", ""), ttl=ttl)
+
+
 def git_bare_repo_check(git_repo, git_ref):
     """Check if git_ref exists in the git_repo
     :param git_repo: git repository URL
@@ -233,93 +716,424 @@ def git_bare_repo_check(git_repo, git_ref):
     global BARE_REPO_CACHE
 
     key="{}_{}".format(git_repo, git_ref)
-    if key in BARE_REPO_CACHE:
+    cached = BARE_REPO_CACHE.get(key) is not None
+    METRICS.cache("BARE_REPO_CACHE", cached)
+    if cached:
         return "found '{}' in the bare repo [cached]".format(git_ref)
 
     # Parse the repository data
     git_repo_match = re.match(RE_GIT_REPO_URI, git_repo)
     if not git_repo_match:
-        print("FATAL ERROR: unable to parse the Git repository URI: {}".format(git_repo))
+        log("FATAL ERROR: unable to parse the Git repository URI: {}".format(git_repo))
         return None
     git_baseuri = git_repo_match.group(1)
     git_reponame = git_repo_match.group(2)
+    __url = git_url(git_baseuri + "/" + git_reponame + ".git")
+
+    if MIRROR_STORE is not None:
+        ## look up git_ref in the (incrementally updated) mirror of the repo
+        try:
+            object_type = MIRROR_STORE.lookup(__url, git_ref)
+        except Exception as e:
+            log("FATAL ERROR: cannot find '{}' in the mirror of '{}', exception is: {}".format(git_ref, __url, e))
+            return None
+        if not object_type:
+            log("FATAL ERROR: cannot find '{}' in bare repo".format(git_ref))
+            return None
+        BARE_REPO_CACHE[key] = git_ref
+        return "found '{}' in the bare repo".format(git_ref)
+
+    ## prepare a unique temp directory, so that concurrent lookups do not collide
+    tmp_root = os.path.join(os.getcwd(), "tmp")
+    os.makedirs(tmp_root, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=git_reponame + ".", suffix=".git", dir=tmp_root)
+    bare_dir = os.path.join(tmp_dir, git_reponame + ".git")
 
-    ## prepare temp directory
-    cwd = os.getcwd()
-    tmp_dir = cwd + "/tmp/" + git_reponame + ".git"
-    if not os.path.exists(cwd + "/tmp"):
-        os.mkdir(cwd + "/tmp")
-    if os.path.isdir(tmp_dir):
-        # ensure "o+w" so that this can be deleted
-        for root, dirs, files in os.walk(tmp_dir):
-            for d in dirs:
-                mode=os.stat(os.path.join(root, d)).st_mode
-                os.chmod(os.path.join(root, d), (mode | stat.S_IWUSR))
-            for f in files:
-                mode=os.stat(os.path.join(root, f)).st_mode
-                os.chmod(os.path.join(root, f), (mode | stat.S_IWUSR))
-        shutil.rmtree(tmp_dir)
-    os.mkdir(tmp_dir)
-    os.chdir(tmp_dir)
-
-    ## clone the bare repo
     try:
-        __url = git_baseuri + "/" + git_reponame + ".git"
-        print("++ ", end='')
-        exec('git', 'clone', '--no-progress', '--mirror', __url)
-    except Exception as e:
-        print("FATAL ERROR: cannot clone '{}' exception is: {}".format(__url, e))
-        return None
+        ## clone the bare repo
+        try:
+            log("++ ", end='')
+            with METRICS.operation("clone"):
+                exec('git', 'clone', '--no-progress', '--mirror', __url, cwd=tmp_dir)
+        except Exception as e:
+            log("FATAL ERROR: cannot clone '{}' exception is: {}".format(__url, e))
+            return None
+
+        if not os.path.isdir(bare_dir):
+            log("FATAL ERROR: cannot clone '{}'".format(__url))
+            return None
+
+        ## test for git_ref in the bare repo
+        try:
+            log("++ ", end='')
+            output = exec('git', 'cat-file', '-t', git_ref, cwd=bare_dir)
+        except Exception as e:
+            log("FATAL ERROR: cannot find '{}' in bare repo, exception is: {}".format(git_ref, e))
+            return None
+
+        if not output:
+            log("FATAL ERROR: cannot find '{}' in bare repo".format(git_ref))
+            return None
+    finally:
+        remove_tree(tmp_dir)
 
-    if not os.path.isdir(git_reponame + ".git"):
-        print("FATAL ERROR: cannot clone '{}'".format(__url))
-        return None
+    BARE_REPO_CACHE[key] = git_ref
+    return "found '{}' in the bare repo".format(git_ref)
+
+
+def prefetch_references(references):
+    """Resolve (git_repo, git_ref) pairs concurrently, ahead of the (serial) manifest checks
+    Each repository is handled by a single worker, in manifest order, so that it is only
+    listed once and its log output stays in order; git_reference_check() replays the results.
+    :param references: list of (git_repo, git_ref) pairs, in manifest order
+    """
+
+    global REF_CHECK_RESULTS
+
+    # the commits which are not advertised by "git ls-remote" are looked up
+    # in the mirror of their repository all at once
+    if MIRROR_STORE is not None:
+        for git_repo, git_ref in references:
+            if re.match(RE_COMMIT_HASH, git_ref):
+                git_repo_match = re.match(RE_GIT_REPO_URI, git_repo)
+                if git_repo_match:
+                    MIRROR_STORE.expect(git_url(git_repo_match.group(1) + "/" + git_repo_match.group(2) + ".git"),
+                                        [git_ref])
+
+    if JOBS <= 1:
+        return
+
+    # group the references by repository, preserving the manifest order
+    repo_refs = {}
+    for git_repo, git_ref in references:
+        refs = repo_refs.setdefault(git_repo, [])
+        if git_ref not in refs and (git_repo, git_ref) not in REF_CHECK_RESULTS:
+            refs.append(git_ref)
+
+    def prefetch_repo(git_repo, git_refs):
+        with SCHEDULER.slot():
+            for git_ref in git_refs:
+                _LOG.buffer = io.StringIO()
+                try:
+                    output = resolve_reference(git_repo, git_ref)
+                except Exception:
+                    # leave it to the serial check to report the failure
+                    continue
+                finally:
+                    log_output = _LOG.buffer.getvalue()
+                    _LOG.buffer = None
+                REF_CHECK_RESULTS[(git_repo, git_ref)] = (output, log_output)
+
+    with ThreadPoolExecutor(max_workers=JOBS * WORKERS_PER_SLOT) as executor:
+        for git_repo, git_refs in repo_refs.items():
+            if git_refs:
+                executor.submit(prefetch_repo, git_repo, git_refs)
+
+
+def super_urls(manifest):
+    """List the URLs checked by process_super_manifest()
+    :param manifest: root element of the super manifest
+    :return list of HTTP URLs
+    """
 
-    ## test for git_ref in the bare repo
-    os.chdir(git_reponame + ".git")
+    urls = []
+    for super_element in manifest.iterfind('*/*'):
+        for git_raw in (super_element.findtext('uri'), super_element.get("dependency-url")):
+            if git_raw:
+                urls.append(git_raw)
+    return urls
+
+
+def super_references(manifest):
+    """List the (git_repo, git_ref) pairs checked by process_super_manifest()
+    :param manifest: root element of the super manifest
+    :return list of (git_repo, git_ref) pairs
+    """
+
+    references = []
+    for super_element in manifest.iterfind('*/*'):
+        for git_raw in (super_element.findtext('uri'), super_element.get("dependency-url")):
+            git_raw_match = re.match(RE_GIT_RAW_URI, git_raw or "")
+            if git_raw_match:
+                references.append((git_raw_match.group(1), git_raw_match.group(5)))
+    return references
+
+
+def element_references(xml_element, uri_element_name):
+    """List the (git_repo, git_ref) pairs checked by process_element()
+    :param xml_element: XML element in the BSP/application/middleware manifest
+    :param uri_element_name: name of the URI element
+    :return list of (git_repo, git_ref) pairs
+    """
+
+    git_repo = xml_element.findtext(uri_element_name)
+    if not git_repo or git_repo.startswith('techpack:'):
+        return []
+    return [(git_repo, commit) for commit in xml_element.xpath('versions/version/commit/text()')]
+
+
+def dependency_references(manifest):
+    """List the unique (git_repo, git_ref) pairs checked by process_dependency_manifest(),
+    and the locations which reference them
+    :param manifest: root element of the dependency manifest
+    :return dict: (git_repo, git_ref) => list of locations (line number and element), in manifest order
+    """
+
+    references = {}
+    for depender_element in manifest.findall('depender'):
+        depender_id = depender_element.findtext('id')
+        depender_repo = ASSET_CACHE.get(depender_id)
+        for version_element in depender_element.iterfind('versions/version'):
+            depender_commit = version_element.findtext('commit')
+            if depender_repo and depender_commit:
+                references.setdefault((depender_repo, depender_commit), []).append(
+                    "line {}: <depender> {} <version> {}".format(version_element.sourceline, depender_id, depender_commit))
+            for dependee_element in version_element.iterfind('dependees/dependee'):
+                dependee_id = dependee_element.findtext('id')
+                dependee_repo = ASSET_CACHE.get(dependee_id)
+                dependee_commit = dependee_element.findtext('commit')
+                if dependee_repo and dependee_commit:
+                    references.setdefault((dependee_repo, dependee_commit), []).append(
+                        "line {}: <dependee> {} {} of <depender> {} <version> {}".format(
+                            dependee_element.sourceline, dependee_id, dependee_commit, depender_id, depender_commit))
+    return references
+
+
+def dependency_ids(manifest):
+    """List the asset ids (depender and dependee) referenced by a dependency manifest
+    :param manifest: root element of the dependency manifest
+    :return set of asset ids; their git repos are looked up in the ASSET_CACHE
+    """
+
+    ids = set()
+    for depender_element in manifest.findall('depender'):
+        ids.add(depender_element.findtext('id'))
+        for dependee_element in depender_element.iterfind('versions/version/dependees/dependee'):
+            ids.add(dependee_element.findtext('id'))
+    ids.discard(None)
+    return ids
+
+
+def previous_manifest(path, git_rev):
+    """Read a manifest file at a git revision of its repository
+    :param path: path to the manifest file (in a git working tree)
+    :param git_rev: git revision
+    :return the root element of the manifest at that revision, None if it cannot be read
+    """
+    output = subprocess.run(['git', 'show', '{}:./{}'.format(git_rev, os.path.basename(path))],
+                            cwd=os.path.dirname(os.path.abspath(path)), capture_output=True)
+    if output.returncode != 0:
+        return None
     try:
-        print("++ ", end='')
-        output = exec('git', 'cat-file', '-t', git_ref)
-    except Exception as e:
-        print("FATAL ERROR: cannot find '{}' in bare repo, exception is: {}".format(git_ref, e))
+        return etree.fromstring(output.stdout, parser=etree.XMLParser(remove_comments=True))
+    except etree.XMLSyntaxError:
         return None
 
-    if not output:
-        print("FATAL ERROR: cannot find '{}' in bare repo".format(git_ref))
-        return None
 
-    os.chdir(cwd)
-    if os.path.isdir(tmp_dir):
-        # ensure "o+w" so that this can be deleted
-        for root, dirs, files in os.walk(tmp_dir):
-            for d in dirs:
-                mode=os.stat(os.path.join(root, d)).st_mode
-                os.chmod(os.path.join(root, d), (mode | stat.S_IWUSR))
-            for f in files:
-                mode=os.stat(os.path.join(root, f)).st_mode
-                os.chmod(os.path.join(root, f), (mode | stat.S_IWUSR))
-        shutil.rmtree(tmp_dir)
+def version_identity(version):
+    """Identity of a <version> block of a BSP/application/middleware manifest
+    :param version: <version> element
+    :return (<num>, <commit>) tuple
+    """
+    return version.findtext('num'), version.findtext('commit')
+
+
+def changed_entries(manifest, path, git_rev):
+    """Filter the entries of a manifest which are added or changed since a git revision
+    - <board>, <app>, <middleware> elements are matched by <id>; a new element (or a new URI) keeps all
+      its <version> blocks, otherwise only the new (<num>, <commit>) version blocks are kept (compared as
+      a multiset, so that a copy of an existing version block is new),
+    - <depender> elements are matched by <id>, and their <version> blocks by <commit>; a new <version>
+      keeps all its <dependee> elements, otherwise only the new (<id>, <commit>) dependees are kept.
+    The <version> blocks of a <commit> which is listed more than once in an element are all kept, for
+    the duplicate reference check.
+    The ASSET_CACHE entries of the unchanged elements are recorded (for the dependency manifests).
+    :param manifest: root element of the manifest
+    :param path: path to the manifest file
+    :param git_rev: git revision
+    :return root element of a copy of the manifest, with the added or changed entries only
+    """
+    previous = previous_manifest(path, git_rev)
+    if previous is None or previous.tag != manifest.tag:
+        print("[INFO] '{}' does not exist at {}: all its entries are checked".format(path, git_rev))
+        return manifest
+
+    filtered = etree.Element(manifest.tag, manifest.attrib)
+    kept = 0
+    total = 0
+    if manifest.tag in ENTRY_ELEMENTS:
+        element_name, uri_element_name = ENTRY_ELEMENTS[manifest.tag]
+        previous_elements = {x.findtext('id'): x for x in previous.iterfind(element_name)}
+        for xml_element in manifest.iterfind(element_name):
+            asset_id = xml_element.findtext('id')
+            git_repo = xml_element.findtext(uri_element_name)
+            if git_repo and not git_repo.startswith('techpack:'):
+                ASSET_CACHE[asset_id] = git_repo
+            entry = copy.deepcopy(xml_element)
+            versions = entry.xpath('versions/version')
+            total += len(versions)
+            previous_element = previous_elements.get(asset_id)
+            if previous_element is not None and previous_element.findtext(uri_element_name) == git_repo:
+                previous_versions = Counter(version_identity(x) for x in previous_element.xpath('versions/version'))
+                commits = Counter(x.findtext('commit') for x in versions)
+                for version in list(versions):
+                    identity = version_identity(version)
+                    if previous_versions[identity] > 0 and commits[identity[1]] == 1:
+                        previous_versions[identity] -= 1
+                        version.getparent().remove(version)
+                        versions.remove(version)
+                if not versions:
+                    continue
+            kept += len(versions)
+            filtered.append(entry)
+    elif manifest.tag == "dependencies":
+        previous_versions = {}  # (depender id, commit) => set of (dependee id, commit)
+        for version in previous.iterfind('depender/versions/version'):
+            previous_versions[(version.getparent().getparent().findtext('id'), version.findtext('commit'))] = set(
+                (x.findtext('id'), x.findtext('commit')) for x in version.iterfind('dependees/dependee'))
+        for depender_element in manifest.iterfind('depender'):
+            depender_id = depender_element.findtext('id')
+            entry = copy.deepcopy(depender_element)
+            commits = Counter(entry.xpath('versions/version/commit/text()'))
+            for version in entry.xpath('versions/version'):
+                dependees = version.xpath('dependees/dependee')
+                total += 1 + len(dependees)
+                previous_dependees = previous_versions.get((depender_id, version.findtext('commit')))
+                if previous_dependees is not None and commits[version.findtext('commit')] == 1:
+                    for dependee in [x for x in dependees
+                                     if (x.findtext('id'), x.findtext('commit')) in previous_dependees]:
+                        dependee.getparent().remove(dependee)
+                        dependees.remove(dependee)
+                    if not dependees:
+                        version.getparent().remove(version)
+                        continue
+                kept += 1 + len(dependees)
+            if entry.xpath('versions/version'):
+                filtered.append(entry)
+    else:
+        return manifest
 
-    BARE_REPO_CACHE[key] = git_ref
-    return "found '{}' in the bare repo".format(git_ref)
+    print("[INFO] {} of {} entries added or changed since {}".format(kept, total, git_rev))
+    return filtered
+
+
+def shard_index(git_repo, count):
+    """Assign a repository to a shard, by hashing its URL (its aliases, with a trailing ".git" or "/", hash alike)
+    :param git_repo: git repository URL
+    :param count: number of shards
+    :return index of the shard (0 .. count - 1)
+    """
+    name = git_repo.strip().rstrip('/')
+    if name.endswith('.git'):
+        name = name[:-len('.git')]
+    return int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], 'big') % count
+
+
+def shard_entries(manifest, shard):
+    """Filter the entries of a manifest whose repository belongs to a shard
+    - <board>, <app>, <middleware> elements are assigned by their URI,
+    - super manifest elements are assigned by the repository of their raw <uri>,
+    - the dependency manifests are not filtered (they are checked against the merged asset index).
+    The ASSET_CACHE entries of all the elements are recorded.
+    :param manifest: root element of the manifest
+    :param shard: (K, N)
+    :return root element of a copy of the manifest, with the entries of shard K only
+    """
+    shard_number, shard_count = shard
+    if manifest.tag in ENTRY_ELEMENTS:
+        element_name, uri_element_name = ENTRY_ELEMENTS[manifest.tag]
+        filtered = etree.Element(manifest.tag, manifest.attrib)
+        elements = manifest.findall(element_name)
+        for xml_element in elements:
+            git_repo = xml_element.findtext(uri_element_name) or ""
+            if git_repo and not git_repo.startswith('techpack:'):
+                ASSET_CACHE[xml_element.findtext('id')] = git_repo
+            if shard_index(git_repo, shard_count) == shard_number - 1:
+                filtered.append(copy.deepcopy(xml_element))
+        kept = len(filtered)
+    elif manifest.tag == "super-manifest":
+        filtered = copy.deepcopy(manifest)
+        elements = filtered.findall('*/*')
+        kept = 0
+        for super_element in elements:
+            git_raw_match = re.match(RE_GIT_RAW_URI, super_element.findtext('uri') or "")
+            # an unparsable URI is reported by the first shard
+            if (shard_index(git_raw_match.group(1), shard_count) if git_raw_match else 0) == shard_number - 1:
+                kept += 1
+            else:
+                super_element.getparent().remove(super_element)
+    else:
+        return manifest
+
+    print("[INFO] shard {}/{}: {} of {} entries".format(shard_number, shard_count, kept, len(elements)))
+    return filtered
 
 
 @contextmanager
 def process_manifest(input_manifest, output_manifest):
-    # Create ElementTree object https://docs.python.org/3/library/xml.etree.elementtree.html
-    manifest_tree = etree.ElementTree()
-    # Parse the XML tree
-    # remove_blank_text is needed to correctly indent sections
-    # strip_cdata is needed to preserve CDATA sections in the BSP manifest
-    manifest_element = manifest_tree.parse(input_manifest, parser=etree.XMLParser(
-        remove_blank_text=True, strip_cdata=False, remove_comments=True))
+    if isinstance(input_manifest, ManifestFile):
+        # use the tree parsed for the other checks
+        manifest_tree = input_manifest.tree
+        manifest_element = manifest_tree.getroot()
+    else:
+        # Create ElementTree object https://docs.python.org/3/library/xml.etree.elementtree.html
+        manifest_tree = etree.ElementTree()
+        # Parse the XML tree
+        # remove_blank_text is needed to correctly indent sections
+        # strip_cdata is needed to preserve CDATA sections in the BSP manifest
+        manifest_element = manifest_tree.parse(input_manifest, parser=etree.XMLParser(
+            remove_blank_text=True, strip_cdata=False, remove_comments=True))
     # Pass the manifest_element context to the caller
-    yield manifest_element
+    if SINCE_REV is not None:
+        # only the entries added or changed since SINCE_REV are checked
+        path = input_manifest.path if isinstance(input_manifest, ManifestFile) else input_manifest
+        manifest_element = changed_entries(manifest_element, path, SINCE_REV)
+    if SHARD is not None:
+        # only the entries of the repositories of this shard are checked
+        manifest_element = shard_entries(manifest_element, SHARD)
+    # the results prefetched for this manifest which are not replayed (e.g. after its first failure)
+    # are dropped with it: a later manifest must not replay the log of a lookup that it did not run
+    prefetched_urls = set(HTTP_CHECK_RESULTS)
+    prefetched_refs = set(REF_CHECK_RESULTS)
+    try:
+        yield manifest_element
+    finally:
+        for url in set(HTTP_CHECK_RESULTS) - prefetched_urls:
+            HTTP_CHECK_RESULTS.pop(url, None)
+        for reference in set(REF_CHECK_RESULTS) - prefetched_refs:
+            REF_CHECK_RESULTS.pop(reference, None)
     # Save the processed manifest to the output file
     if os.path.exists(output_manifest):
         manifest_tree.write(output_manifest, pretty_print=True)
 
 
+def report_failure(line, asset_id, git_ref, message):
+    """Print a failure, and record it for the summary (see: FAILURES)
+    :param line: line number of the element in the manifest file
+    :param asset_id: asset id, None if not applicable
+    :param git_ref: git reference (or URL), None if not applicable
+    :param message: error message
+    """
+    print("FATAL ERROR: {}".format(message))
+    FAILURES.append({"manifest": None, "line": line, "asset": asset_id, "ref": git_ref, "error": message})
+
+
+def print_failures(failures=None):
+    """Print the summary of the failures of the run
+    :param failures: list of failures (default: FAILURES)
+    """
+    failures = FAILURES if failures is None else failures
+    if not failures:
+        return
+    print("\n\n########## failures ##########")
+    for failure in failures:
+        subject = " ".join(str(x) for x in (failure["asset"], failure["ref"]) if x)
+        print("{}:{}: {}{}".format(failure["manifest"], failure["line"] or "-",
+                                   "[{}] ".format(subject) if subject else "", failure["error"]))
+    print("\n{} failure(s) in {} manifest file(s)".format(len(failures), len(set(f["manifest"] for f in failures))))
+    print("####################")
+
+
 def process_super_element(super_element):
     """Process single element of the super manifest
     1. Check that the <uri> exists
@@ -336,13 +1150,13 @@ def process_super_element(super_element):
 
     # Check the URI is valid
     if not http_check(git_raw):
-        print("FATAL ERROR: cannot access: {}".format(git_raw))
+        report_failure(super_element.sourceline, None, git_raw, "cannot access: {}".format(git_raw))
         return False
 
     # Parse the repository data from the raw URI
     git_raw_match = re.match(RE_GIT_RAW_URI, git_raw)
     if not git_raw_match:
-        print("FATAL ERROR: unable to parse the Git raw URI: {}".format(git_raw))
+        report_failure(super_element.sourceline, None, git_raw, "unable to parse the Git raw URI: {}".format(git_raw))
         return False
 
     git_repo = git_raw_match.group(1)
@@ -353,13 +1167,15 @@ def process_super_element(super_element):
     git_filename = git_raw_match.group(6)
 
     if "/" in git_filename:
-        print("FATAL ERROR: invalid 'ref' detected in the Git raw URI: {}".format(git_raw))
+        report_failure(super_element.sourceline, None, git_raw,
+                       "invalid 'ref' detected in the Git raw URI: {}".format(git_raw))
         return False # code_0229
 
     # check if the git_ref is valid (branch/tag/commit)
     response = git_reference_check(git_repo, git_ref)
     if not response:
-        print("FATAL ERROR: {} reference doesn't exist at {}".format(git_ref, git_repo))
+        report_failure(super_element.sourceline, None, git_ref,
+                       "{} reference doesn't exist at {}".format(git_ref, git_repo))
         return False
 
     # process (optional) dependency-url
@@ -369,12 +1185,12 @@ def process_super_element(super_element):
 
         # Check the URI is valid
         if not http_check(dep_url):
-            print("FATAL ERROR: cannot access: {}".format(dep_url))
+            report_failure(super_element.sourceline, None, dep_url, "cannot access: {}".format(dep_url))
             return False
 
         git_raw_dep_match = re.match(RE_GIT_RAW_URI, dep_url)
         if not git_raw_dep_match:
-            print("FATAL ERROR: unable to parse the Git raw URI: {}".format(dep_url))
+            report_failure(super_element.sourceline, None, dep_url, "unable to parse the Git raw URI: {}".format(dep_url))
             return False
 
         git_dep_repo = git_raw_dep_match.group(1)
@@ -385,13 +1201,15 @@ def process_super_element(super_element):
         git_dep_filename = git_raw_dep_match.group(6)
 
         if "/" in git_dep_filename:
-            print("FATAL ERROR: invalid 'ref' detected in the Git dep URI: {}".format(git_raw))
+            report_failure(super_element.sourceline, None, dep_url,
+                           "invalid 'ref' detected in the Git dep URI: {}".format(git_raw))
             return False # code_0228
 
         # check if the git_dep_ref is valid (branch/tag/commit)
         response = git_reference_check(git_dep_repo, git_dep_ref)
         if not response:
-            print("FATAL ERROR: {} reference doesn't exist at {}".format(git_dep_ref, git_dep_repo))
+            report_failure(super_element.sourceline, None, git_dep_ref,
+                           "{} reference doesn't exist at {}".format(git_dep_ref, git_dep_repo))
             return False
 
     return True
@@ -425,7 +1243,7 @@ def process_element(xml_element, uri_element_name):
     # parse the repository data
     git_repo_match = re.match(RE_GIT_REPO_URI, git_repo)
     if not git_repo_match:
-        print("FATAL ERROR: unable to parse the Git repository URI: {}".format(git_repo))
+        report_failure(uri_element.sourceline, asset_id, None, "unable to parse the Git repository URI: {}".format(git_repo))
         return False
     git_baseuri = git_repo_match.group(1)
     git_reponame = git_repo_match.group(2)
@@ -437,6 +1255,7 @@ def process_element(xml_element, uri_element_name):
 
         # iterate over <version> elements
         commit_list = []
+        failed = False
         for version_element in versions_element.findall('version'):
 
             # process the <commit> content
@@ -444,14 +1263,23 @@ def process_element(xml_element, uri_element_name):
             # check if the depender_commit is valid (branch/tag/commit)
             response = git_reference_check(git_repo, commit)
             if not response:
-                print("FATAL ERROR: {} reference doesn't exist at {}".format(commit, git_repo))
-                return False
+                report_failure(version_element.sourceline, asset_id, commit,
+                               "{} reference doesn't exist at {}".format(commit, git_repo))
+                if not KEEP_GOING:
+                    return False
+                failed = True
             if commit in commit_list:
-                print("FATAL ERROR: duplicate reference {} in {}".format(commit, git_repo))
-                return False
+                report_failure(version_element.sourceline, asset_id, commit,
+                               "duplicate reference {} in {}".format(commit, git_repo))
+                if not KEEP_GOING:
+                    return False
+                failed = True
             else:
                 commit_list.append( commit )
 
+        if failed:
+            return False
+
     return True
 
 
@@ -463,13 +1291,20 @@ def process_super_manifest(input_manifest, output_manifest):
     """
 
     with process_manifest(input_manifest, output_manifest) as manifest:
+        prefetch_urls(super_urls(manifest))
+        prefetch_references(super_references(manifest))
+
+        failed = False
+
         # get the <board-manifest-list> element
         board_manifest_list = manifest.find('board-manifest-list')
         if board_manifest_list is not None:
             # iterate over <board-manifest> elements
             for board_manifest in board_manifest_list.findall('board-manifest'):
                 if not process_super_element(board_manifest):
-                    return False
+                    if not KEEP_GOING:
+                        return False
+                    failed = True
 
         # get the <app-manifest-list> element
         app_manifest_list = manifest.find('app-manifest-list')
@@ -477,7 +1312,9 @@ def process_super_manifest(input_manifest, output_manifest):
             # iterate over <app-manifest> elements
             for app_manifest in app_manifest_list.findall('app-manifest'):
                 if not process_super_element(app_manifest):
-                    return False
+                    if not KEEP_GOING:
+                        return False
+                    failed = True
 
         # get the <middleware-manifest-list> element
         middleware_manifest_list = manifest.find('middleware-manifest-list')
@@ -485,9 +1322,11 @@ def process_super_manifest(input_manifest, output_manifest):
             # iterate over <middleware-manifest> elements
             for middleware_manifest in middleware_manifest_list.findall('middleware-manifest'):
                 if not process_super_element(middleware_manifest):
-                    return False
+                    if not KEEP_GOING:
+                        return False
+                    failed = True
 
-    return True
+    return not failed
 
 
 def process_board_manifest(input_manifest, output_manifest):
@@ -498,12 +1337,18 @@ def process_board_manifest(input_manifest, output_manifest):
     """
 
     with process_manifest(input_manifest, output_manifest) as manifest:
+        prefetch_references([ref for board_manifest in manifest.findall('board')
+                             for ref in element_references(board_manifest, 'board_uri')])
+
         # iterate over <board> elements
+        failed = False
         for board_manifest in manifest.findall('board'):
             if not process_element(board_manifest, 'board_uri'):
-                return False
+                if not KEEP_GOING:
+                    return False
+                failed = True
 
-    return True
+    return not failed
 
 
 def process_app_manifest(input_manifest, output_manifest):
@@ -514,12 +1359,18 @@ def process_app_manifest(input_manifest, output_manifest):
     """
 
     with process_manifest(input_manifest, output_manifest) as manifest:
+        prefetch_references([ref for app_manifest in manifest.findall('app')
+                             for ref in element_references(app_manifest, 'uri')])
+
         # iterate over <app> elements
+        failed = False
         for app_manifest in manifest.findall('app'):
             if not process_element(app_manifest, 'uri'):
-                return False
+                if not KEEP_GOING:
+                    return False
+                failed = True
 
-    return True
+    return not failed
 
 
 def process_middleware_manifest(input_manifest, output_manifest):
@@ -530,12 +1381,18 @@ def process_middleware_manifest(input_manifest, output_manifest):
     """
 
     with process_manifest(input_manifest, output_manifest) as manifest:
+        prefetch_references([ref for middleware_manifest in manifest.findall('middleware')
+                             for ref in element_references(middleware_manifest, 'uri')])
+
         # iterate over <middleware> elements
+        failed = False
         for middleware_manifest in manifest.findall('middleware'):
             if not process_element(middleware_manifest, 'uri'):
-                return False
+                if not KEEP_GOING:
+                    return False
+                failed = True
 
-    return True
+    return not failed
 
 
 def process_dependency_manifest(input_manifest, output_manifest):
@@ -548,6 +1405,32 @@ def process_dependency_manifest(input_manifest, output_manifest):
     global ASSET_CACHE
 
     with process_manifest(input_manifest, output_manifest) as manifest:
+        # the same (repo, commit) pairs are referenced by many versions of many dependers:
+        # each unique pair is resolved once (concurrently), and its result is reused
+        references = dependency_references(manifest)
+        prefetch_references(list(references))
+        resolved = {}
+        reported = set()
+
+        def check_reference(xml_element, asset_id, git_repo, git_ref):
+            if (git_repo, git_ref) not in resolved:
+                resolved[(git_repo, git_ref)] = git_reference_check(git_repo, git_ref)
+            if resolved[(git_repo, git_ref)]:
+                return True
+            message = "{} reference doesn't exist at {}".format(git_ref, git_repo)
+            if (git_repo, git_ref) in reported:
+                # printed (with all its locations) at its first occurrence
+                FAILURES.append({"manifest": None, "line": xml_element.sourceline, "asset": asset_id,
+                                 "ref": git_ref, "error": message})
+                return False
+            reported.add((git_repo, git_ref))
+            report_failure(xml_element.sourceline, asset_id, git_ref, message)
+            print("   ... referenced at:")
+            for location in references.get((git_repo, git_ref), []):
+                print("       {}".format(location))
+            return False
+
+        failed = False
 
         # iterate over <depender> elements
         for depender_element in manifest.findall('depender'):
@@ -555,10 +1438,14 @@ def process_dependency_manifest(input_manifest, output_manifest):
             depender_id = depender_element.find('id').text
             # get depender repo from the ASSET_CACHE created when processing the BSP/application/middleware manifests
             depender_repo = ASSET_CACHE.get(depender_id)
+            METRICS.cache("ASSET_CACHE", depender_repo is not None)
             print("\nValidate dependency manifest [<depender> <id>=(uri)]: {} {}".format(depender_id, depender_repo))
             if not depender_repo:
-                print("FATAL ERROR:   cannot process {}".format(depender_repo))
-                return False
+                report_failure(depender_element.sourceline, depender_id, None, "  cannot process {}".format(depender_repo))
+                if not KEEP_GOING:
+                    return False
+                failed = True
+                continue
 
             # get the <versions> element
             versions_element = depender_element.find('versions')
@@ -570,13 +1457,16 @@ def process_dependency_manifest(input_manifest, output_manifest):
                 # process the <commit> content
                 depender_commit = version_element.find('commit').text
                 # check if the depender_commit is valid (branch/tag/commit)
-                response = git_reference_check(depender_repo, depender_commit)
-                if not response:
-                    print("FATAL ERROR: {} reference doesn't exist at {}".format(depender_commit, depender_repo))
-                    return False
+                if not check_reference(version_element, depender_id, depender_repo, depender_commit):
+                    if not KEEP_GOING:
+                        return False
+                    failed = True
                 if depender_commit in depender_list:
-                    print("FATAL ERROR: duplicate reference {} in {}".format(depender_commit, depender_repo))
-                    return False
+                    report_failure(version_element.sourceline, depender_id, depender_commit,
+                                   "duplicate reference {} in {}".format(depender_commit, depender_repo))
+                    if not KEEP_GOING:
+                        return False
+                    failed = True
                 else:
                     depender_list.append( depender_commit )
 
@@ -589,81 +1479,389 @@ def process_dependency_manifest(input_manifest, output_manifest):
                     dependee_id = dependee_element.find('id').text
                     # get dependee repo from the ASSET_CACHE created when processing the BSP/application/middleware manifests
                     dependee_repo = ASSET_CACHE.get(dependee_id)
+                    METRICS.cache("ASSET_CACHE", dependee_repo is not None)
 
                     print("\nValidate dependency manifest [<dependee> <id>=(uri)]: {} {}".format(dependee_id, dependee_repo))
 
                     if not dependee_repo:
-                        print("FATAL ERROR: '{}' has not been processed yet; cannot determine its URL!".format(dependee_id))
+                        report_failure(dependee_element.sourceline, dependee_id, None,
+                                       "'{}' has not been processed yet; cannot determine its URL!".format(dependee_id))
                         print("   ... perhaps seed the 'out/asset_cache.txt' file ...")
-                        return False
+                        if not KEEP_GOING:
+                            return False
+                        failed = True
+                        continue
 
                     # process the <commit> content
                     dependee_commit = dependee_element.find('commit').text
                     # check if the dependee_commit is valid (branch/tag/commit)
-                    response = git_reference_check(dependee_repo, dependee_commit)
-                    if not response:
-                        print("FATAL ERROR: {} reference doesn't exist at {}".format(dependee_commit, dependee_repo))
-                        return False
+                    if not check_reference(dependee_element, dependee_id, dependee_repo, dependee_commit):
+                        if not KEEP_GOING:
+                            return False
+                        failed = True
 
-    return True
+    return not failed
 
 
-def main():
-    global ASSET_CACHE
+def load_asset_cache(path=ASSET_CACHE_FILE):
+    """Seed the ASSET_CACHE from a previous run (or a manually seeded file)
+    :param path: path to the asset cache file
+    """
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            lines = f.readlines()
+            for line in lines:
+                ASSET_CACHE[line.split()[0]] = line.split()[1]
 
-    argParser = argparse.ArgumentParser()
-    argParser.add_argument("manifest_type", help="Manifest type")
-    argParser.add_argument("input_manifest", help="Path to the input manifest")
-    argParser.add_argument("output_manifest", help="Path to the output manifest")
 
-    # parse command-line arguments
-    args = argParser.parse_args()
-    manifest_type = args.manifest_type
-    input_manifest = args.input_manifest
-    output_manifest = args.output_manifest
+def save_asset_cache(path=ASSET_CACHE_FILE):
+    """Save the ASSET_CACHE for the processing of subsequent "dependency" manifests
+    :param path: path to the asset cache file
+    """
+    with open(path, 'w', newline='') as f:
+        # override os.linesep; do not generate '\r'
+        for key, value in ASSET_CACHE.items():
+            f.write('%s %s\n' % (key, value))
 
-    # Create output directory
-    output_dir = os.path.dirname(output_manifest)
-    if not os.path.exists(output_dir):
-        os.mkdir(output_dir)
 
-    # seed the ASSET CACHE
-    if os.path.exists("out/asset_cache.txt"):
-        with open("out/asset_cache.txt", 'r') as f:
-            lines = f.readlines()
-            for line in lines:
-                ASSET_CACHE[line.split()[0]] = line.split()[1]
+def manifest_root(input_manifest):
+    """:return the root element of a manifest file (path, or a parsed ManifestFile)"""
+    if isinstance(input_manifest, ManifestFile):
+        return input_manifest.root
+    return etree.parse(input_manifest).getroot()
+
+
+def manifest_assets(manifest_type, manifest):
+    """List the ASSET_CACHE entries of a manifest (see: process_element())
+    :param manifest_type: type of the manifest
+    :param manifest: root element of the manifest
+    :return dict: asset id => git repo
+    """
+    element_name, uri_element_name = {
+        "board": ('board', 'board_uri'), "app": ('app', 'uri'), "middleware": ('middleware', 'uri'),
+    }.get(manifest_type, (None, None))
+    assets = {}
+    if element_name:
+        for xml_element in manifest.findall(element_name):
+            git_repo = xml_element.findtext(uri_element_name)
+            if git_repo and not git_repo.startswith('techpack:'):
+                assets[xml_element.findtext('id')] = git_repo
+    return assets
+
+
+def manifest_references(manifest_type, manifest):
+    """List the (git_repo, git_ref) pairs checked for a manifest
+    :param manifest_type: type of the manifest
+    :param manifest: root element of the manifest
+    :return list of (git_repo, git_ref) pairs
+    """
+    if manifest_type == "super":
+        return super_references(manifest)
+    if manifest_type == "dependency":
+        return list(dependency_references(manifest))
+    uri_element_name = 'board_uri' if manifest_type == "board" else 'uri'
+    return [ref for xml_element in manifest.iterfind('*')
+            for ref in element_references(xml_element, uri_element_name)]
+
+
+def manifest_memo_key(manifest_type, input_manifest, manifest):
+    """Key of the memoized validation of a manifest file
+    The key of a dependency manifest also covers the git repos of the assets that it references.
+    :param manifest_type: type of the manifest
+    :param input_manifest: path to the input XML manifest file, or a (parsed) ManifestFile
+    :param manifest: root element of the manifest
+    :return the key
+    """
+    if isinstance(input_manifest, ManifestFile):
+        digest = hashlib.sha256(input_manifest.data)
+    else:
+        with open(input_manifest, 'rb') as f:
+            digest = hashlib.sha256(f.read())
+    if manifest_type == "dependency":
+        for asset_id in sorted(dependency_ids(manifest)):
+            digest.update("\n{} {}".format(asset_id, ASSET_CACHE.get(asset_id)).encode('utf-8'))
+    return "{} {} {}".format(MEMO_VERSION, manifest_type, digest.hexdigest())
+
+
+def manifest_ttl(manifest_type, manifest):
+    """Time-to-live of the memoized validation of a manifest file
+    :return None if the manifest only references (immutable) commits, TTL_MEMO otherwise
+    """
+    if manifest_type == "super":
+        # also checks HTTP URLs
+        return TTL_MEMO
+    for git_repo, git_ref in manifest_references(manifest_type, manifest):
+        if not re.match(RE_COMMIT_HASH, git_ref):
+            return TTL_MEMO
+    return None
+
+
+def validate_manifest_assets(manifest_type, input_manifest, output_manifest):
+    """Validate the assets of a manifest file
+    The validation is skipped if the same manifest file has been validated by a previous run
+    (see: MEMO_VERSION, --revalidate-after).
+    :param manifest_type: type of the manifest (super, board, app, middleware, dependency)
+    :param input_manifest: path to the input XML manifest file, or a (parsed) ManifestFile
+    :param output_manifest: path to the output XML manifest file
+    :return True on success, False otherwise
+    """
+
+    memo_key = None
+    if PERSISTENT_CACHE is not None and manifest_type in ("super", "board", "app", "middleware", "dependency"):
+        try:
+            manifest = manifest_root(input_manifest)
+            memo_key = manifest_memo_key(manifest_type, input_manifest, manifest)
+        except (etree.XMLSyntaxError, OSError):
+            # reported by process_manifest()
+            memo_key = None
+        memo = PERSISTENT_CACHE.get("manifest", memo_key) if memo_key else None
+        METRICS.cache("MANIFEST_MEMO", memo is not None)
+        if memo is not None:
+            ASSET_CACHE.update(memo["assets"])
+            print("[INFO] unchanged manifest, validated at {} [memoized]".format(
+                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(memo["verified"]))))
+            return True
+
+    first_failure = len(FAILURES)
+    passed = check_manifest_assets(manifest_type, input_manifest, output_manifest)
+    for failure in FAILURES[first_failure:]:
+        failure["manifest"] = input_manifest.path if isinstance(input_manifest, ManifestFile) else input_manifest
+    if not passed:
+        return False
+
+    if memo_key is not None and SINCE_REV is None and SHARD is None:
+        PERSISTENT_CACHE.put("manifest", memo_key,
+                             {"assets": manifest_assets(manifest_type, manifest), "verified": time.time()},
+                             ttl=manifest_ttl(manifest_type, manifest))
+    return True
+
+
+def check_manifest_assets(manifest_type, input_manifest, output_manifest):
+    """Validate the assets of a manifest file (see: validate_manifest_assets())
+    :param manifest_type: type of the manifest (super, board, app, middleware, dependency)
+    :param input_manifest: path to the input XML manifest file, or a (parsed) ManifestFile
+    :param output_manifest: path to the output XML manifest file
+    :return True on success, False otherwise
+    """
 
-    # process the manifest
     if manifest_type == "super":
         if not process_super_manifest(input_manifest, output_manifest):
             print("FATAL ERROR: failed to process the super manifest {}".format(input_manifest))
-            sys.exit(1)
+            return False
     elif manifest_type == "board":
         if not process_board_manifest(input_manifest, output_manifest):
             print("FATAL ERROR: failed to process the board manifest {}".format(input_manifest))
-            sys.exit(1)
+            return False
     elif manifest_type == "app":
         if not process_app_manifest(input_manifest, output_manifest):
             print("FATAL ERROR: failed to process the app manifest {}".format(input_manifest))
-            sys.exit(1)
+            return False
     elif manifest_type == "middleware":
         if not process_middleware_manifest(input_manifest, output_manifest):
             print("FATAL ERROR: failed to process the middleware manifest {}".format(input_manifest))
-            sys.exit(1)
+            return False
     elif manifest_type == "dependency":
         if not process_dependency_manifest(input_manifest, output_manifest):
             print("FATAL ERROR: failed to process the dependency manifest {}".format(input_manifest))
-            sys.exit(1)
+            return False
     else:
         print("FATAL ERROR: unknown manifest type: {}".format(manifest_type))
+        return False
+
+    return True
+
+
+def configure(jobs=DEFAULT_JOBS, cache_dir=DEFAULT_CACHE_DIR, refresh_time=0,
+              mirror_dir=DEFAULT_MIRROR_DIR, mirror_max_size=DEFAULT_MIRROR_MAX_SIZE, blobless=False,
+              rate=DEFAULT_RATE, url_rewrite=None, revalidate_after=DEFAULT_REVALIDATE_AFTER, since=None,
+              keep_going=False, cache_memory=DEFAULT_CACHE_MEMORY, shard=None):
+    """Configure the lookups
+    :param jobs: number of git references resolved concurrently
+    :param rate: maximum number of network requests per second, 0 if unlimited
+    :param cache_dir: directory of the PERSISTENT_CACHE, or "" to disable it
+    :param refresh_time: ignore the PERSISTENT_CACHE entries stored before this time (see: time.time()), 0 if none
+    :param mirror_dir: directory of the MIRROR_STORE, or "" to disable it
+    :param mirror_max_size: size cap (MiB) of the MIRROR_STORE, 0 if unlimited
+    :param blobless: clone the mirrors without the file contents
+    :param url_rewrite: git-config file of URL rewrite rules, in addition to the URL_INSTEADOF variable
+    :param revalidate_after: hours after which the memoized manifests which reference branches or tags are validated again
+    :param since: git revision; only the entries added or changed since this revision are looked up
+    :param keep_going: validate all the entries, instead of stopping at the first failure
+    :param cache_memory: memory budget (MiB) of the in-memory lookup caches, 0 if unlimited
+    :param shard: (K, N): only look up the entries of the repositories of shard K of N, None: all the entries
+    """
+    global JOBS
+    global PERSISTENT_CACHE
+    global MIRROR_STORE
+    global SCHEDULER
+    global URL_REWRITER
+    global TTL_MEMO
+    global SINCE_REV
+    global KEEP_GOING
+    global SHARD
+
+    JOBS = jobs
+    SHARD = shard
+    KEEP_GOING = keep_going
+    for name, cache in (("HTTP_CACHE", HTTP_CACHE), ("LS_REMOTE_CACHE", LS_REMOTE_CACHE),
+                        ("BARE_REPO_CACHE", BARE_REPO_CACHE), ("NEGATIVE_CACHE", NEGATIVE_CACHE)):
+        cache.resize(int(cache_memory * 1024 * 1024 * CACHE_MEMORY_SHARES[name]) if cache_memory else None)
+    SINCE_REV = since
+    TTL_MEMO = revalidate_after * 60 * 60
+    if url_rewrite:
+        URL_REWRITER = UrlRewriter.from_environment(url_rewrite)
+    # a daemon configures each run: the scheduler and the stores of the previous run are kept if unchanged
+    if SCHEDULER.rate != rate or SCHEDULER.burst != max(jobs, 1):
+        SCHEDULER = RequestScheduler(rate=rate, burst=max(jobs, 1))
+    SCHEDULER.set_slots(max(jobs, 1))
+    if cache_dir and PERSISTENT_CACHE is not None and PERSISTENT_CACHE.cache_dir == os.path.abspath(cache_dir):
+        PERSISTENT_CACHE.refresh_time = refresh_time
+    else:
+        if PERSISTENT_CACHE is not None:
+            PERSISTENT_CACHE.close()
+        PERSISTENT_CACHE = PersistentCache(cache_dir, refresh_time=refresh_time) if cache_dir else None
+    max_size = mirror_max_size * 1024 * 1024 if mirror_max_size else None
+    if not mirror_dir:
+        MIRROR_STORE = None
+    elif MIRROR_STORE is None or (MIRROR_STORE.store_dir, MIRROR_STORE.max_size, MIRROR_STORE.blobless) != \
+            (os.path.abspath(mirror_dir), max_size, blobless):
+        MIRROR_STORE = MirrorStore(mirror_dir, max_size=max_size, blobless=blobless, log=log)
+
+
+def reset_run():
+    """Reset the state of the previous run (asset index, failures, prefetched results, URL rewrite rules),
+    keeping the lookup caches and the HTTP connections warm (see: checker_daemon.py)
+    """
+    global ASSET_CACHE
+    global FAILURES
+    global URL_REWRITER
+
+    ASSET_CACHE = {}
+    FAILURES = []
+    SCHEDULER.reset_statistics()
+    HTTP_CHECK_RESULTS.clear()
+    REF_CHECK_RESULTS.clear()
+    URL_REWRITER = UrlRewriter.from_environment()
+
+
+def clear_lookup_caches():
+    """Forget the HTTP, "git ls-remote" and "bare repo" lookups (and failed lookups) of the previous runs"""
+    HTTP_CACHE.clear()
+    LS_REMOTE_CACHE.clear()
+    BARE_REPO_CACHE.clear()
+    NEGATIVE_CACHE.clear()
+    if MIRROR_STORE is not None:
+        MIRROR_STORE.clear()
+
+
+def report_metrics(report=None, profile=False):
+    """Write the run report, and print its summary
+    :param report: path of the JSON run report, None if not requested
+    :param profile: print the summary of the run report
+    """
+    if report:
+        METRICS.write_report(report)
+        print("[INFO] run report: {}".format(report))
+    if profile:
+        METRICS.print_profile()
+
+
+def add_report_arguments(argParser):
+    """Add the command-line options of the run report
+    :param argParser: argparse.ArgumentParser
+    """
+    argParser.add_argument("--report", metavar="PATH",
+                           help="Write a JSON run report: time per stage and manifest, count and latency of "
+                                "the network operations, cache hits and misses, time spent throttled")
+    argParser.add_argument("--profile", action="store_true",
+                           help="Print a summary of the run report")
+
+
+def report_throttling():
+    """Print the summary of the time spent throttled, if any"""
+    summary = SCHEDULER.summary()
+    if summary:
+        print(summary)
+
+
+def add_lookup_arguments(argParser):
+    """Add the command-line options of the MIRROR_STORE and of the SCHEDULER
+    :param argParser: argparse.ArgumentParser
+    """
+    argParser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                           help="Maximum number of network requests per second (default: {}, 0: unlimited)"
+                           .format(DEFAULT_RATE))
+    argParser.add_argument("--mirror-dir", default=DEFAULT_MIRROR_DIR,
+                           help="Directory of the bare mirrors kept across runs (default: {}); "
+                                "an empty string clones a temporary bare repo for each lookup".format(DEFAULT_MIRROR_DIR))
+    argParser.add_argument("--mirror-max-size", type=int, default=DEFAULT_MIRROR_MAX_SIZE, metavar="MIB",
+                           help="Size cap of the mirror directory; the least-recently-used mirrors are evicted "
+                                "(default: {} MiB, 0: unlimited)".format(DEFAULT_MIRROR_MAX_SIZE))
+    argParser.add_argument("--blobless", action="store_true",
+                           help="Clone the mirrors without the file contents (partial clone)")
+    argParser.add_argument("--revalidate-after", type=float, default=DEFAULT_REVALIDATE_AFTER, metavar="HOURS",
+                           help="Validate the memoized manifests which reference branches or tags "
+                                "again after this delay (default: {} hours); --refresh validates everything"
+                           .format(DEFAULT_REVALIDATE_AFTER))
+    argParser.add_argument("--cache-memory", type=int, default=DEFAULT_CACHE_MEMORY, metavar="MIB",
+                           help="Memory budget of the in-memory lookup caches; the least-recently-used lookups "
+                                "are evicted (default: {} MiB, 0: unlimited)".format(DEFAULT_CACHE_MEMORY))
+    argParser.add_argument("-k", "--keep-going", action="store_true",
+                           help="Validate all the entries, instead of stopping at the first failure, "
+                                "and print a summary of all the failures")
+    argParser.add_argument("--since", metavar="GIT_REV", default=None,
+                           help="Only look up the <board>, <app>, <middleware>, <depender> and <dependee> entries "
+                                "added or changed since this revision of the git repository of the manifest files")
+    argParser.add_argument("--url-rewrite", metavar="FILE", default=None,
+                           help="git-config file of '[url \"<new>\"] insteadOf = <old>' rules, applied to the HTTP "
+                                "and git URLs (default: the {} variable)".format(URL_REWRITE_FILE_VARIABLE))
+
+
+def main():
+    argParser = argparse.ArgumentParser()
+    argParser.add_argument("manifest_type", help="Manifest type")
+    argParser.add_argument("input_manifest", help="Path to the input manifest")
+    argParser.add_argument("output_manifest", help="Path to the output manifest")
+    argParser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                           help="Number of git references resolved concurrently (default: {})".format(DEFAULT_JOBS))
+    argParser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                           help="Directory of the persistent lookup cache (default: {}); "
+                                "an empty string disables it".format(DEFAULT_CACHE_DIR))
+    argParser.add_argument("--refresh", action="store_true",
+                           help="Ignore the lookups cached before this invocation")
+    add_lookup_arguments(argParser)
+    add_report_arguments(argParser)
+
+    # parse command-line arguments
+    args = argParser.parse_args()
+    configure(jobs=args.jobs, cache_dir=args.cache_dir, refresh_time=time.time() if args.refresh else 0,
+              mirror_dir=args.mirror_dir, mirror_max_size=args.mirror_max_size, blobless=args.blobless,
+              rate=args.rate, url_rewrite=args.url_rewrite, revalidate_after=args.revalidate_after,
+              since=args.since, keep_going=args.keep_going, cache_memory=args.cache_memory)
+    manifest_type = args.manifest_type
+    input_manifest = args.input_manifest
+    output_manifest = args.output_manifest
+
+    # Create output directory
+    output_dir = os.path.dirname(output_manifest)
+    if not os.path.exists(output_dir):
+        os.mkdir(output_dir)
+
+    # seed the ASSET CACHE
+    load_asset_cache()
+
+    # process the manifest
+    with METRICS.stage(input_manifest, "assets"):
+        result = validate_manifest_assets(manifest_type, input_manifest, output_manifest)
+    report_throttling()
+    report_metrics(args.report, args.profile)
+    if KEEP_GOING:
+        print_failures()
+    if not result:
         sys.exit(1)
 
     # save the ASSET CACHE
-    with open("out/asset_cache.txt", 'w', newline='') as f:
-        # override os.linesep; do not generate '\r'
-        for key, value in ASSET_CACHE.items():
-            f.write('%s %s\n' % (key, value))
+    save_asset_cache()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,137 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+import json
+import os
+import re
+import sys
+
+from lxml import etree
+
+from manifest_file import ManifestFile
+
+# pre-defined categories, per manifest type (as written in the manifest files)
+CATEGORIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "categories.json")
+
+# manifest types without "category" element to process
+NO_CATEGORY_TYPES = ("dependency", "super")
+
+# Compile regular expression for the character references and the predefined entities
+RE_ENTITY = re.compile(r'&(#[0-9]+|#x[0-9a-fA-F]+|amp|lt|gt|quot|apos);')
+PREDEFINED_ENTITIES = {"amp": "&", "lt": "<", "gt": ">", "quot": '"', "apos": "'"}
+
+
+def normalize_category(value):
+    """Resolve the character references (e.g. "&#174;", "&#xAE;") and the predefined entities of a category
+    :param value: category, as written in a manifest file (or in the CATEGORIES_FILE)
+    :return the category, as parsed from a manifest file
+    """
+    def resolve(m):
+        entity = m.group(1)
+        if entity.startswith("#x"):
+            return chr(int(entity[2:], 16))
+        if entity.startswith("#"):
+            return chr(int(entity[1:]))
+        return PREDEFINED_ENTITIES[entity]
+    return RE_ENTITY.sub(resolve, value)
+
+
+def load_categories(path=CATEGORIES_FILE):
+    """Load the pre-defined categories
+    :param path: path to the JSON file: {manifest type: [category, ...]}
+    :return (dict: manifest type => list of categories, as written;
+             dict: manifest type => frozenset of the normalized categories)
+    """
+    with open(path, 'r') as f:
+        categories = json.load(f)
+    for manifest_type in NO_CATEGORY_TYPES:
+        categories.setdefault(manifest_type, [])
+    return categories, {k: frozenset(normalize_category(y) for y in v) for k, v in categories.items()}
+
+
+LEGAL_CATEGORY_NAMES, LEGAL_CATEGORIES = load_categories()
+
+
+def validate_category(manifest_type, manifest_file):
+    """Validate the <category> elements against the pre-defined categories of the manifest type
+    Unknown categories are errors in Infineon manifests ("Infineon/..." path), warnings otherwise.
+    :param manifest_type: type of the manifest (app, board, dependency, middleware, super)
+    :param manifest_file: path to the manifest file, or a (parsed) ManifestFile
+    :return True on success (or warnings only), False otherwise
+    """
+    if not isinstance(manifest_file, ManifestFile):
+        manifest_file = ManifestFile(manifest_file)
+
+    if manifest_type not in LEGAL_CATEGORIES:
+        print("\nFATAL ERROR: unknown manifest type: {}\n".format(manifest_type))
+        return False
+    legal_values = LEGAL_CATEGORIES[manifest_type]
+
+    is_partner = not manifest_file.path.lower().startswith("infineon/")
+    msg_prefix = "Warning" if is_partner else "FATAL ERROR"
+
+    try:
+        root = manifest_file.root
+    except etree.XMLSyntaxError as e:
+        print("FATAL ERROR: cannot parse '{}': {}".format(manifest_file.path, e))
+        return False
+
+    failed = False
+    if manifest_type not in NO_CATEGORY_TYPES:
+        for category_element in root.iter('category'):
+            if (category_element.text or "") not in legal_values:
+                x = etree.tostring(category_element, with_tail=False).decode('ascii')
+                print("{}: unknown category: {}".format(msg_prefix, x))
+                failed = True
+
+    passed = True
+    if not failed:
+        print("passed 'validate_category' check")
+    else:
+        print("\nnote: pre-defined categories (for \"{}\" type manifest files) are:".format(manifest_type))
+        for y in LEGAL_CATEGORY_NAMES[manifest_type]:
+            print("    {}".format(y))
+        if not is_partner:
+            print("FATAL ERROR: invalid catagories")
+            passed = False
+    print("")
+    return passed
+
+
+def main():
+    if len(sys.argv) != 3:
+        print('FATAL ERROR: must have 2 args (manifest_type manifest_file)!', file=sys.stderr)
+        sys.exit(1)
+    if not validate_category(sys.argv[1], sys.argv[2]):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
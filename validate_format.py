@@ -0,0 +1,162 @@
+"""
+# (c) 2026, Infineon Technologies AG, or an affiliate of Infineon
+# Technologies AG. All rights reserved.
+# This software, associated documentation and materials ("Software") is
+# owned by Infineon Technologies AG or one of its affiliates ("Infineon")
+# and is protected by and subject to worldwide patent protection, worldwide
+# copyright laws, and international treaty provisions. Therefore, you may use
+# this Software only as provided in the license agreement accompanying the
+# software package from which you obtained this Software. If no license
+# agreement applies, then any use, reproduction, modification, translation, or
+# compilation of this Software is prohibited without the express written
+# permission of Infineon.
+# 
+# Disclaimer: UNLESS OTHERWISE EXPRESSLY AGREED WITH INFINEON, THIS SOFTWARE
+# IS PROVIDED AS-IS, WITH NO WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING, BUT NOT LIMITED TO, ALL WARRANTIES OF NON-INFRINGEMENT OF
+# THIRD-PARTY RIGHTS AND IMPLIED WARRANTIES SUCH AS WARRANTIES OF FITNESS FOR A
+# SPECIFIC USE/PURPOSE OR MERCHANTABILITY.
+# Infineon reserves the right to make changes to the Software without notice.
+# You are responsible for properly designing, programming, and testing the
+# functionality and safety of your intended application of the Software, as
+# well as complying with any legal requirements related to its use. Infineon
+# does not guarantee that the Software will be free from intrusion, data theft
+# or loss, or other breaches ("Security Breaches"), and Infineon shall have
+# no liability arising out of any Security Breaches. Unless otherwise
+# explicitly approved by Infineon, the Software may not be used in any
+# application where a failure of the Product or any consequences of the use
+# thereof can reasonably be expected to result in personal injury.
+"""
+
+import difflib
+import io
+import re
+import sys
+from itertools import zip_longest
+
+from lxml import etree
+
+from format_xml import merge_lines
+from manifest_file import ManifestFile, RE_XML_DECLARATION
+
+# special characters specified in decimal, rather than hex, in the manifest files
+DECIMAL_ENTITIES = [
+    (b"&#x2122", b"&#8482"),
+    (b"&#xAE", b"&#174"),
+    (b"&#xB1", b"&#177"),
+]
+
+# Compile regular expressions for the "standalone" pseudo-attribute of the XML declaration,
+# the sections which are not escaped ("xmllint --format" keeps their non-ASCII characters),
+# and the non-ASCII characters
+RE_XML_STANDALONE = re.compile(r'\sstandalone\s*=\s*["\']([^"\']*)["\']')
+RE_RAW_SECTION = re.compile(r'(<!\[CDATA\[.*?\]\]>|<!--.*?-->|<\?.*?\?>)', re.DOTALL)
+RE_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+
+def escape_non_ascii(text):
+    """Replace the non-ASCII characters of the text and attribute values with hex character references
+    :param text: serialized XML
+    :return the escaped XML
+    """
+    sections = RE_RAW_SECTION.split(text)
+    # the odd sections are CDATA sections, comments and processing instructions
+    for i in range(0, len(sections), 2):
+        sections[i] = RE_NON_ASCII.sub(lambda m: "&#x{:X};".format(ord(m.group(0))), sections[i])
+    return "".join(sections)
+
+
+def canonical_xml(manifest):
+    """Serialize a manifest file in the canonical layout, as "xmllint --format"
+    :param manifest: ManifestFile
+    :return (the serialized XML, including the XML declaration; its encoding)
+    :raise etree.XMLSyntaxError: the manifest file is not well-formed
+    """
+    tree = manifest.tree
+    encoding = manifest.xml_encoding
+    declaration = '<?xml version="{}"'.format(tree.docinfo.xml_version)
+    if encoding:
+        declaration += ' encoding="{}"'.format(encoding)
+    declaration_match = RE_XML_DECLARATION.match(manifest.text)
+    standalone = RE_XML_STANDALONE.search(declaration_match.group(0)) if declaration_match else None
+    if standalone:
+        declaration += ' standalone="{}"'.format(standalone.group(1))
+    declaration += '?>\n'
+
+    if encoding:
+        body = etree.tostring(tree, pretty_print=True, encoding=encoding, xml_declaration=False).decode(encoding)
+    else:
+        # without an encoding, the non-ASCII characters are written as character references
+        body = escape_non_ascii(etree.tostring(tree, pretty_print=True, encoding="utf-8",
+                                               xml_declaration=False).decode("utf-8"))
+    return declaration + body, encoding or "utf-8"
+
+
+def formatted_lines(manifest):
+    """Format a manifest file, with the exceptions of the ModusToolbox manifest files:
+    - the XML declaration line is removed, if the manifest file does not have one
+    - the blank lines of the manifest file are kept
+    - some special characters are specified in decimal, rather than hex
+    :param manifest: ManifestFile
+    :return (generator) lines (bytes) of the formatted manifest file
+    :raise etree.XMLSyntaxError: the manifest file is not well-formed
+    """
+    formatted, encoding = canonical_xml(manifest)
+
+    ## handle optional XML Declaration
+    ## - delete the line in generated file, if XML declaration does not exist in original file
+    formatted = formatted.splitlines(True)
+    if not manifest.data.startswith(b'<?xml version='):
+        formatted = formatted[1:]
+
+    ## handle blank lines
+    original = io.StringIO(manifest.data.decode(encoding, 'surrogateescape'), newline=None)
+    for line in merge_lines(original, formatted):
+        line = line.encode(encoding, 'surrogateescape')
+        ## convert from hex to decimal
+        for hex_entity, dec_entity in DECIMAL_ENTITIES:
+            line = line.replace(hex_entity, dec_entity)
+        yield line
+
+
+def validate_format(manifest, output_path=None):
+    """Compare a manifest file with its formatted version (see: formatted_lines())
+    The comparison stops at the first difference; the formatted version is then printed as a
+    unified diff, and saved to the output file.
+    :param manifest: path to the manifest file, or a (parsed) ManifestFile
+    :param output_path: path to the formatted manifest file, written on failure (optional)
+    :return True if the manifest file is formatted, False otherwise
+    """
+    if not isinstance(manifest, ManifestFile):
+        manifest = ManifestFile(manifest)
+
+    try:
+        formatted = formatted_lines(manifest)
+        mismatch = any(line1 != line2 for line1, line2 in zip_longest(io.BytesIO(manifest.data), formatted))
+    except etree.XMLSyntaxError as e:
+        print("FATAL ERROR: cannot format '{}': {}".format(manifest.path, e))
+        return False
+    if not mismatch:
+        return True
+
+    formatted = b"".join(formatted_lines(manifest))
+    if output_path:
+        with open(output_path, 'wb') as f:
+            f.write(formatted)
+    print("FATAL ERROR: formatting error:")
+    sys.stdout.writelines(difflib.unified_diff(
+        manifest.data.decode('utf-8', 'replace').splitlines(True),
+        formatted.decode('utf-8', 'replace').splitlines(True), manifest.path, output_path or "formatted"))
+    return False
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print('FATAL ERROR: must have 1 or 2 args (manifest_file [formatted_file])!', file=sys.stderr)
+        sys.exit(1)
+    if not validate_format(*sys.argv[1:]):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -32,13 +32,6 @@ import filecmp
 import json
 import sys
 
-if len(sys.argv) < 3:
-    print('FATAL ERROR: must have at least 2 args!', file=sys.stderr)
-    exit(1)
-
-arg1 = sys.argv[1]
-file_name = sys.argv[2]
-
 def syntax_json(file_obj):
     try:
         json.load(file_obj)
@@ -54,23 +47,34 @@ def format_json(file_obj, tmp_file):
         file.write(json_obj)
         file.write('\n')
 
-if arg1 == "--syntax":
-    with open(file_name, 'r') as file:
-        if not syntax_json(file):
-            exit(2)
-
-elif arg1 == "--format":
-    if len(sys.argv) != 4:
-        print('FATAL ERROR: "--format" must have 3 args!', file=sys.stderr)
+def main():
+    if len(sys.argv) < 3:
+        print('FATAL ERROR: must have at least 2 args!', file=sys.stderr)
         exit(1)
-    out_file=sys.argv[3]
-    with open(file_name, 'r') as file:
-        format_json(file, out_file)
-    if not filecmp.cmp(file_name, out_file):
-        exit(3)
 
-else:
-    print('FATAL ERROR: invalid argument [{}]'.format( arg1 ), file=sys.stderr)
-    exit(4)
+    arg1 = sys.argv[1]
+    file_name = sys.argv[2]
+
+    if arg1 == "--syntax":
+        with open(file_name, 'r') as file:
+            if not syntax_json(file):
+                exit(2)
+
+    elif arg1 == "--format":
+        if len(sys.argv) != 4:
+            print('FATAL ERROR: "--format" must have 3 args!', file=sys.stderr)
+            exit(1)
+        out_file=sys.argv[3]
+        with open(file_name, 'r') as file:
+            format_json(file, out_file)
+        if not filecmp.cmp(file_name, out_file):
+            exit(3)
+
+    else:
+        print('FATAL ERROR: invalid argument [{}]'.format( arg1 ), file=sys.stderr)
+        exit(4)
+
+    exit(0)
 
-exit(0)
+if __name__ == '__main__':
+    main()
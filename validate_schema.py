@@ -30,8 +30,10 @@
 import sys
 import os
 import operator
+import threading
 import urllib.request, urllib.error, urllib.parse
 import errno
+from concurrent.futures import ThreadPoolExecutor
 from xml.parsers import expat
 
 try:
@@ -47,20 +49,24 @@ except ImportError as ex:
 """
 )
 
+from manifest_file import ManifestFile, detect_manifest_type
+
 xml_validation_result = {"valid": "Valid manifest",
                          "invalid": "Invalid manifest"}
 
 SCHEMA_NAME_TEMPLATE = "schema_{}.xsd"
 
+# number of manifest files validated concurrently
+DEFAULT_JOBS = os.cpu_count() or 1
 
 class Args(object):
     # class which handle inputs
 
     # parameters
     expected_manifest = ["app", "board", "middleware", "dependency", "super"]
-    expected_args_quantity = 2
+    usage = "validate_schema.py [-j N] [manifest_type] xml_path [xml_path ...]"
     manifest_type = property(operator.attrgetter('_manifest_type'))
-    xml_path = property(operator.attrgetter('_xml_path'))
+    xml_paths = property(operator.attrgetter('_xml_paths'))
 
     @manifest_type.setter
     def manifest_type(self, value):
@@ -77,43 +83,52 @@ class Args(object):
         # assign value
         self._manifest_type = value
 
-    @xml_path.setter
-    def xml_path(self, value):
+    @xml_paths.setter
+    def xml_paths(self, value):
         if not value:
             raise Exception("xml_path cannot be empty.")
-        self._xml_path = value
+        self._xml_paths = value
 
     def __init__(self):
         # skip first arg which is this file name
         args = sys.argv[1:]
 
-        # check expected quantity of inputs
-        if len(args) != self.expected_args_quantity:
-            raise Exception("Expected: {} args. Provided({}): {} "
-                            .format(self.expected_args_quantity, len(args), ', '.join(args)))
+        # optional number of concurrent validations
+        self.jobs = DEFAULT_JOBS
+        if args and args[0] in ("-j", "--jobs"):
+            if len(args) < 2 or not args[1].isdigit():
+                raise Exception("Expected: {}".format(self.usage))
+            self.jobs = int(args[1])
+            args = args[2:]
+
+        # optional manifest type; detected per file otherwise
+        self._manifest_type = None
+        if args and args[0] in self.expected_manifest:
+            self.manifest_type = args[0]
+            args = args[1:]
 
         # set parameters
-        self.manifest_type = args[0]
-        self.xml_path = args[1]
+        self.xml_paths = args
 
 
-class XmlValidator(object):
-    # class which handles validation
+class SchemaPool(object):
+    # class which compiles each schema at most once per process
 
-    # properties
-    xml_schema = property(operator.attrgetter('_xml_schema'))
-    # temp var to store encoding
-    encoding = ""
-    # lowercase expected
-    allowed_xml_encoding = ["utf-8"]
-
-    def __init__(self, manifest_type):
-        self.xml_schema = manifest_type
+    # lxml releases the GIL while validating, so that a compiled schema can validate
+    # documents concurrently; however, the error log of a schema is shared by all
+    # its users, so the messages of invalid documents are collected (under a lock)
+    # with a second instance, which is compiled on the first failure
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas = {}
+        self._diagnostic_lock = threading.Lock()
+        self._diagnostic_schemas = {}
 
-    @xml_schema.setter
-    def xml_schema(self, manifest_type):
+    @staticmethod
+    def compile(manifest_type):
         # read the schema file
-        schema_file = "{}/schema_{}.xsd".format(os.path.dirname(__file__), manifest_type)
+        schema_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   SCHEMA_NAME_TEMPLATE.format(manifest_type))
         try:
             with open(schema_file, 'rb') as schema:
                 schema = schema.read()
@@ -122,74 +137,177 @@ class XmlValidator(object):
             raise Exception(str(ex))
 
         # check encoding
-        self.check_encoding(schema)
+        XmlValidator.check_encoding(schema)
+
+        return etree.XMLSchema(etree.fromstring(schema))
+
+    def __len__(self):
+        return len(self._schemas)
+
+    def get(self, manifest_type):
+        with self._lock:
+            if manifest_type not in self._schemas:
+                self._schemas[manifest_type] = self.compile(manifest_type)
+            return self._schemas[manifest_type]
+
+    def diagnose(self, manifest_type, xml_tree):
+        # return the message of the first error of an invalid document
+        with self._diagnostic_lock:
+            if manifest_type not in self._diagnostic_schemas:
+                self._diagnostic_schemas[manifest_type] = self.compile(manifest_type)
+            try:
+                self._diagnostic_schemas[manifest_type].assertValid(xml_tree)
+            except etree.DocumentInvalid as ex:
+                return ex.args[0]
+        return ""
+
+
+SCHEMA_POOL = SchemaPool()
+
+
+class XmlValidator(object):
+    # class which handles validation
+
+    # properties
+    xml_schema = property(operator.attrgetter('_xml_schema'))
+    # lowercase expected
+    allowed_xml_encoding = ["utf-8"]
+    # encoding of an XML document without an XML declaration
+    default_xml_encoding = "utf-8"
 
-        # assign schema
-        self._xml_schema = etree.XMLSchema(etree.fromstring(schema))
+    def __init__(self, manifest_type):
+        self.manifest_type = manifest_type
+        self.xml_schema = manifest_type
 
+    @xml_schema.setter
+    def xml_schema(self, manifest_type):
+        # the schema is compiled once per process
+        self._xml_schema = SCHEMA_POOL.get(manifest_type)
 
-    def check_encoding(self, path_to_file):
-        current_encoding = self.get_xml_encoding(path_to_file).lower()
+    @classmethod
+    def check_encoding(cls, xml, current_encoding=None):
+        if current_encoding is None:
+            current_encoding = cls.get_xml_encoding(xml)
         if not current_encoding:
             raise Exception("File '{}' has no encoding info"
-                            .format(path_to_file, current_encoding))
-        elif not current_encoding in self.allowed_xml_encoding:
+                            .format(xml, current_encoding))
+        elif not current_encoding.lower() in cls.allowed_xml_encoding:
             raise Exception("File '{}' has '{}' encoding. Allowed {}"
-                            .format(path_to_file, current_encoding, ", ".join(self.allowed_xml_encoding)))
+                            .format(xml, current_encoding, ", ".join(cls.allowed_xml_encoding)))
 
-    def get_xml_encoding(self, xml):
-        self.parse_xml_header(xml)
-        return self.encoding
-
-    def xml_decl_handler(self, version, encoding, standalone):
-        self.encoding = encoding
-
-    def parse_xml_header(self, xml):
+    @classmethod
+    def get_xml_encoding(cls, xml):
+        # encoding of the XML declaration; None if the declaration has no encoding
+        declarations = []
         parser = expat.ParserCreate()
-        parser.XmlDeclHandler = self.xml_decl_handler
+        parser.XmlDeclHandler = lambda version, encoding, standalone: declarations.append(encoding)
         parser.Parse(xml)
+        if not declarations:
+            return cls.default_xml_encoding
+        return declarations[0]
 
-    def validate_manifest(self, xml_path, verbose=1):
-
-        print("")
+    def check_manifest(self, xml_path, verbose=1):
+        # validate a manifest file; return the result and the messages
         if os.path.isfile(xml_path):
             xml_manifest_file = xml_path
-        elif os.path.isdir(xml_path):
-            """ TODO: implement logic for folder """
-            raise NotImplementedError
         else:
             raise Exception("File \"{}\" does not exist".format(xml_path))
 
-        # read xml manifest
-        with open(xml_manifest_file, 'r') as xml_manifest:
-            xml_manifest = xml_manifest.read()
+        return self.check_tree(ManifestFile(xml_manifest_file), verbose)
+
+    def check_tree(self, manifest, verbose=1):
+        # validate a (parsed) ManifestFile; return the result and the messages
+        messages = [""]
         try:
-            # check encoding
-            self.check_encoding(xml_manifest)
+            # check encoding (of the XML declaration, if any)
+            xml_encoding = manifest.xml_encoding
+            if xml_encoding == "":
+                xml_encoding = self.default_xml_encoding
+            self.check_encoding(manifest.text, xml_encoding or "")
 
             # verify xml schema
-            validation_result = self.xml_schema.validate(etree.fromstring(xml_manifest.encode("UTF-8")))
+            xml_tree = manifest.tree
+            validation_result = self.xml_schema.validate(xml_tree)
             if validation_result:
                 if verbose >= 1:
-                    print((xml_validation_result["valid"]))
-                    print(("Manifest: {}".format(xml_manifest_file)))
-                    print("passed schema and data integrity validation")
+                    messages.append(xml_validation_result["valid"])
+                    messages.append("Manifest: {}".format(manifest.path))
+                    messages.append("passed schema and data integrity validation")
             else:
-                self.xml_schema.assertValid(etree.fromstring(xml_manifest.encode("UTF-8")))
-            return validation_result
+                raise etree.DocumentInvalid(SCHEMA_POOL.diagnose(self.manifest_type, xml_tree))
+            return validation_result, messages
+
+        except (etree.DocumentInvalid, etree.XMLSyntaxError) as ex:
+            messages.append(xml_validation_result["invalid"])
+            messages.append("Manifest: {}".format(manifest.path))
+            messages.append("Message: {}".format(ex.args[0]))
+            return False, messages
 
-        except (etree.DocumentInvalid, etree.XMLSyntaxError, expat.ExpatError) as ex:
-            print((xml_validation_result["invalid"]))
-            print(("Manifest: {}".format(xml_manifest_file)))
-            print(("Message: {}".format(ex.args[0])))
+    def validate_manifest(self, xml_path, verbose=1):
+        # xml_path: path to a manifest file (or folder), or a ManifestFile
+
+        if not isinstance(xml_path, ManifestFile) and os.path.isdir(xml_path):
+            if not validate_manifests([xml_path], self.manifest_type, verbose=verbose):
+                raise SystemExit(1)
+            return True
+
+        if isinstance(xml_path, ManifestFile):
+            validation_result, messages = self.check_tree(xml_path, verbose)
+        else:
+            validation_result, messages = self.check_manifest(xml_path, verbose)
+        for message in messages:
+            print(message)
+        if not validation_result:
             raise SystemExit(1)
+        return validation_result
+
+
+def expand_paths(xml_paths):
+    # list the files and the "*.xml" files of the folders (recursively)
+    files = []
+    for xml_path in xml_paths:
+        if os.path.isdir(xml_path):
+            for root, dirs, names in os.walk(xml_path):
+                dirs.sort()
+                files += [(os.path.join(root, name), True) for name in sorted(names) if name.endswith(".xml")]
+        else:
+            files.append((xml_path, False))
+    return files
+
+
+def validate_manifests(xml_paths, manifest_type=None, jobs=DEFAULT_JOBS, verbose=1):
+    # validate many manifest files (and folders) concurrently; each file is validated
+    # against the schema of the given manifest_type, or of its detected type
+    # the messages are printed in the order of the files
+    # return True if all files are valid, False otherwise
+
+    def check(xml_path, in_folder):
+        try:
+            file_type = manifest_type or detect_manifest_type(xml_path)
+            if not file_type:
+                if in_folder:
+                    return True, ["", "[INFO] skip '{}': not a manifest file".format(xml_path)]
+                return False, ["", "FATAL ERROR: cannot determine 'manifest type' of '{}'".format(xml_path)]
+            return XmlValidator(file_type).check_manifest(xml_path, verbose)
+        except Exception as ex:
+            return False, ["", "FATAL ERROR: {}".format(ex)]
+
+    files = expand_paths(xml_paths)
+    all_valid = True
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for validation_result, messages in executor.map(lambda f: check(*f), files):
+            for message in messages:
+                print(message)
+            all_valid = all_valid and validation_result
+    return all_valid
 
 
 def main():
     # main method
     args = Args()
-    xml_validator = XmlValidator(args.manifest_type)
-    return xml_validator.validate_manifest(args.xml_path)
+    if not validate_manifests(args.xml_paths, args.manifest_type, args.jobs):
+        raise SystemExit(1)
+    return True
 
 
 if __name__ == '__main__':